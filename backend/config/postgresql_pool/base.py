@@ -0,0 +1,169 @@
+"""
+PostgreSQL backend with a bounded per-process connection pool
+
+Django 4.2 has no built-in pooling, and its persistent connections belong to
+one thread: under ASGI every request runs in a fresh thread, and the
+workspace workers run several threads per process. This backend keeps Django's
+postgresql engine but hands out connections from a pool. ``close()`` (end of a
+request, ``close_old_connections()``) returns the connection instead of
+disconnecting, and no more than ``POOL_SIZE`` connections per process and
+database exist at once. Further callers wait up to ``POOL_TIMEOUT`` seconds,
+then get an ``OperationalError``.
+
+Selected with ``DB_POOL_SIZE`` (see config.settings); tuned through
+``DATABASES['default']['OPTIONS']``:
+
+    POOL_SIZE         connections per process
+    POOL_TIMEOUT      seconds to wait for a free connection
+    POOL_MAX_IDLE     seconds an unused connection is kept open
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from django.db.backends.postgresql import base
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+
+POOL_OPTIONS = ('POOL_SIZE', 'POOL_TIMEOUT', 'POOL_MAX_IDLE')
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class ConnectionPool:
+    """At most ``size`` connections to one database, reused most recently released first"""
+
+    def __init__(self, size: int, timeout: float, max_idle: float):
+        self.size = size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle = deque()
+        self._lock = threading.Lock()
+        self._stats = {'connects': 0, 'reuses': 0, 'waits': 0, 'timeouts': 0, 'discarded': 0}
+
+    def acquire(self, connect, health_check: bool):
+        """Return an idle connection or a new one from ``connect()``, waiting for a free slot"""
+        if not self._slots.acquire(blocking=False):
+            self._count('waits')
+            if not self._slots.acquire(timeout=self.timeout):
+                self._count('timeouts')
+                raise base.Database.OperationalError(
+                    f"No database connection available within {self.timeout}s "
+                    f"(pool of {self.size} per process is in use)"
+                )
+        try:
+            while True:
+                connection = self._pop_idle()
+                if connection is None:
+                    self._count('connects')
+                    return connect()
+                if not health_check or self._is_usable(connection):
+                    self._count('reuses')
+                    return connection
+                self._discard(connection)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, connection) -> None:
+        """Take a connection back; one left in a transaction is rolled back first"""
+        try:
+            if not connection.closed and connection.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+                connection.rollback()
+            if connection.closed or connection.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+                self._discard(connection)
+            else:
+                with self._lock:
+                    self._idle.append((connection, time.monotonic()))
+        except base.Database.Error:
+            self._discard(connection)
+        finally:
+            self._slots.release()
+
+    def _pop_idle(self):
+        now = time.monotonic()
+        with self._lock:
+            # Oldest first: close connections unused for longer than max_idle
+            stale = []
+            while self._idle and now - self._idle[0][1] > self.max_idle:
+                stale.append(self._idle.popleft()[0])
+            connection = self._idle.pop()[0] if self._idle else None
+        for idle_connection in stale:
+            self._discard(idle_connection)
+        return connection
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def _discard(self, connection) -> None:
+        self._count('discarded')
+        try:
+            connection.close()
+        except base.Database.Error:
+            pass
+
+    @staticmethod
+    def _is_usable(connection) -> bool:
+        if connection.closed:
+            return False
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            # Without autocommit the ping opened a transaction, which would block set_autocommit()
+            if connection.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+                connection.rollback()
+        except base.Database.Error:
+            return False
+        return True
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            idle = len(self._idle)
+        return {**self._stats, 'size': self.size, 'idle': idle}
+
+
+def get_pool(conn_params: dict, options: dict) -> ConnectionPool:
+    """Pool of this process for the database ``conn_params`` point at"""
+    # Keyed by the connection parameters, so e.g. the test runner's connection to
+    # the 'postgres' maintenance database never receives an application connection
+    key = (os.getpid(), tuple(sorted((name, str(value)) for name, value in conn_params.items())))
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ConnectionPool(
+                size=int(options.get('POOL_SIZE', 10)),
+                timeout=float(options.get('POOL_TIMEOUT', 30)),
+                max_idle=float(options.get('POOL_MAX_IDLE', 300)),
+            )
+        return pool
+
+
+def get_stats() -> list:
+    """Counters of every pool in this process"""
+    with _pools_lock:
+        pools = [pool for (pid, _), pool in _pools.items() if pid == os.getpid()]
+    return [pool.snapshot() for pool in pools]
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        # Pool settings share OPTIONS with the driver options; psycopg must not see them
+        for name in POOL_OPTIONS:
+            params.pop(name, None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        self._pool = get_pool(conn_params, self.settings_dict['OPTIONS'])
+        return self._pool.acquire(
+            lambda: super(DatabaseWrapper, self).get_new_connection(conn_params),
+            health_check=self.settings_dict['CONN_HEALTH_CHECKS'],
+        )
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                self._pool.release(self.connection)
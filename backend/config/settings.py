@@ -90,6 +90,27 @@ DB_USER = os.getenv('DB_USER', 'bugbear')
 DB_PASSWORD = os.getenv('DB_PASSWORD', 'bugbear')
 DB_HOST = os.getenv('DB_HOST', 'localhost')
 DB_PORT = os.getenv('DB_PORT', '5432')
+
+# Server the process runs under: "asgi" or "wsgi" (Dockerfile.backend sets it; runserver is WSGI)
+SERVER_MODE = os.getenv('SERVER_MODE', 'wsgi')
+
+# Connection management, set per process type:
+# - DB_CONN_MAX_AGE: seconds a thread keeps its connection open between requests
+#   (0 reconnects for every request); DB_CONN_HEALTH_CHECKS pings a reused connection first.
+#   Defaults to 0 under ASGI: every request runs in a new thread there, so persistent
+#   connections would pile up until max_connections is reached. Use DB_POOL_SIZE instead.
+# - DB_POOL_SIZE > 0: bounded pool of that many connections per process instead
+#   (config.postgresql_pool), for ASGI servers and the workspace workers whose threads
+#   do not live as long as a persistent connection; waits DB_POOL_TIMEOUT seconds for a
+#   free connection and closes connections idle for DB_POOL_MAX_IDLE seconds
+# - DB_PGBOUNCER: DB_HOST is PgBouncer in transaction pooling mode
+DB_CONN_MAX_AGE = int(os.getenv('DB_CONN_MAX_AGE', '0' if SERVER_MODE == 'asgi' else '60'))
+DB_CONN_HEALTH_CHECKS = os.getenv('DB_CONN_HEALTH_CHECKS', 'True') == 'True'
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '0'))
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '30'))
+DB_POOL_MAX_IDLE = float(os.getenv('DB_POOL_MAX_IDLE', '300'))
+DB_PGBOUNCER = os.getenv('DB_PGBOUNCER', 'False') == 'True'
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -98,8 +119,53 @@ DATABASES = {
         'PASSWORD': DB_PASSWORD,
         'HOST': DB_HOST,
         'PORT': DB_PORT,
+        'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+        'CONN_HEALTH_CHECKS': DB_CONN_HEALTH_CHECKS,
+        # Server-side cursors do not survive PgBouncer moving a session between server connections
+        'DISABLE_SERVER_SIDE_CURSORS': DB_PGBOUNCER,
     }
 }
+if DB_POOL_SIZE > 0:
+    DATABASES['default'].update({
+        'ENGINE': 'config.postgresql_pool',
+        # Closing a connection hands it back to the pool
+        'CONN_MAX_AGE': 0,
+        'OPTIONS': {
+            'POOL_SIZE': DB_POOL_SIZE,
+            'POOL_TIMEOUT': DB_POOL_TIMEOUT,
+            'POOL_MAX_IDLE': DB_POOL_MAX_IDLE,
+        },
+    })
+
+# Cache
+# Local memory by default; set REDIS_URL to share the cache across workers
+# (Django's built-in Redis backend, requires the redis package)
+REDIS_URL = os.getenv('REDIS_URL', '')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'bugbear-default',
+        }
+    }
+
+# Seconds an anonymous /api/jobs/ page is served from cache (0 disables caching).
+# Only cached with a shared cache (REDIS_URL), since a version bump in one
+# worker's LocMem cache would leave the other workers serving stale pages.
+JOB_LIST_CACHE_TIMEOUT = int(os.getenv('JOB_LIST_CACHE_TIMEOUT', '60'))
+
+# Seconds a provider's dashboard stats stay cached (invalidated on application changes).
+# Only cached with a shared cache (REDIS_URL); with per-process LocMem another
+# worker would keep serving stats its own cache was never told were stale.
+PROVIDER_STATS_CACHE_TIMEOUT = int(os.getenv('PROVIDER_STATS_CACHE_TIMEOUT', '300'))
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -208,3 +274,41 @@ EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 # Cryptography key for encrypting cloud credentials
 CRYPTOGRAPHY_KEY = os.getenv('CRYPTOGRAPHY_KEY', 'dev-key-please-change-in-production')
 
+# Keyring for key rotation: comma-separated, newest first. New values are encrypted
+# with the first key; older keys stay valid for decryption until data is re-encrypted
+# with `python manage.py rotate_encryption_keys`.
+CRYPTOGRAPHY_KEYS = [key for key in os.getenv('CRYPTOGRAPHY_KEYS', '').split(',') if key] or [CRYPTOGRAPHY_KEY]
+
+# Decrypted credentials/passwords are kept in process memory for a short time
+WORKSPACE_SECRET_CACHE_SIZE = int(os.getenv('WORKSPACE_SECRET_CACHE_SIZE', '256'))
+WORKSPACE_SECRET_CACHE_TTL = int(os.getenv('WORKSPACE_SECRET_CACHE_TTL', '300'))
+
+# Cloud SDK clients are reused per credential: LRU size and seconds before a client is rebuilt
+WORKSPACE_CLIENT_CACHE_SIZE = int(os.getenv('WORKSPACE_CLIENT_CACHE_SIZE', '128'))
+WORKSPACE_CLIENT_CACHE_TTL = int(os.getenv('WORKSPACE_CLIENT_CACHE_TTL', '3600'))
+
+# Client-side rate limit per credential and API operation (requests/second per process).
+# The rate halves on throttling, recovers on success and never drops below the minimum;
+# a call that would wait longer than WORKSPACE_API_MAX_WAIT seconds fails as retryable.
+WORKSPACE_API_RATE = float(os.getenv('WORKSPACE_API_RATE', '5'))
+WORKSPACE_API_BURST = float(os.getenv('WORKSPACE_API_BURST', '10'))
+WORKSPACE_API_MIN_RATE = float(os.getenv('WORKSPACE_API_MIN_RATE', '0.2'))
+WORKSPACE_API_MAX_WAIT = float(os.getenv('WORKSPACE_API_MAX_WAIT', '30'))
+
+# Threads per process running the SDK calls of the async workspace views (see workspaces.async_api)
+WORKSPACE_CLOUD_EXECUTOR_WORKERS = int(os.getenv('WORKSPACE_CLOUD_EXECUTOR_WORKERS', '16'))
+
+# Workspace state event stream (SSE): seconds between reads, seconds before a stream
+# is closed (the browser reconnects and resumes), seconds events are kept and
+# seconds a single-use stream ticket is valid
+WORKSPACE_EVENT_POLL_INTERVAL = float(os.getenv('WORKSPACE_EVENT_POLL_INTERVAL', '2'))
+WORKSPACE_EVENT_STREAM_TIMEOUT = int(os.getenv('WORKSPACE_EVENT_STREAM_TIMEOUT', '300'))
+WORKSPACE_EVENT_RETENTION = int(os.getenv('WORKSPACE_EVENT_RETENTION', '86400'))
+WORKSPACE_EVENT_TICKET_TTL = int(os.getenv('WORKSPACE_EVENT_TICKET_TTL', '30'))
+
+# A workspace status polled less than this many seconds ago is served from the
+# database by the refresh endpoint instead of calling the cloud API again
+WORKSPACE_STATUS_MAX_AGE = int(os.getenv('WORKSPACE_STATUS_MAX_AGE', '15'))
+
+# Seconds before the cached bundle catalog of a provider/region is refreshed in the background
+BUNDLE_CATALOG_TTL = int(os.getenv('BUNDLE_CATALOG_TTL', '21600'))
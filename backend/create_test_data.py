@@ -173,6 +173,8 @@ def create_test_data():
             'status': 'submitted'
         }
     )
+    if created:
+        Job.adjust_applications_count(job1.id, 1)
     print(f"{'✅ Created' if created else '⏭️  Already exists'}: Application from {seeker1.email} for {job1.title}")
     
     app2, created = Application.objects.get_or_create(
@@ -183,6 +185,8 @@ def create_test_data():
             'status': 'under_review'
         }
     )
+    if created:
+        Job.adjust_applications_count(job4.id, 1)
     print(f"{'✅ Created' if created else '⏭️  Already exists'}: Application from {seeker2.email} for {job4.title}")
     
     print("\n✅ Test data creation complete!")
@@ -4,7 +4,7 @@ from .models import Job, Application, SavedJob
 
 @admin.register(Job)
 class JobAdmin(admin.ModelAdmin):
-    list_display = ['title', 'created_by', 'location', 'job_type', 'is_active', 'created_at']
+    list_display = ['title', 'created_by', 'location', 'job_type', 'is_active', 'applications_count', 'created_at']
     list_filter = ['job_type', 'experience_level', 'is_active', 'created_at']
     search_fields = ['title', 'description', 'location', 'created_by__email']
     readonly_fields = ['created_at', 'updated_at']
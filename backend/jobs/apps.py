@@ -5,3 +5,6 @@ class JobsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'jobs'
 
+    def ready(self):
+        # Keeps job search vectors in step with the poster's profile
+        from . import signals
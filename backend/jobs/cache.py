@@ -0,0 +1,135 @@
+"""
+Caches for job list pages and provider dashboard stats
+
+Serialized ``/api/jobs/`` pages are cached per normalized query string under a
+version number. Creating, updating or deleting a job bumps the version, which
+orphans every cached page at once. Applicant counts may lag by up to
+``JOB_LIST_CACHE_TIMEOUT`` seconds since applications do not invalidate. Hit
+and miss counters are served by ``JobListCacheStatsView``.
+
+Provider stats are versioned per provider and invalidated whenever one of
+their jobs or applications changes.
+
+Invalidation only reaches the process that ran it when the cache lives in each
+process (the default LocMem backend), so both caches are only used with a
+shared cache (REDIS_URL).
+"""
+
+import hashlib
+import json
+import time
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.renderers import JSONRenderer
+
+VERSION_KEY = 'jobs:list:version'
+HITS_KEY = 'jobs:list:hits'
+MISSES_KEY = 'jobs:list:misses'
+PROVIDER_STATS_VERSION_KEY = 'jobs:provider_stats:version:{provider_id}'
+
+# Backends that keep entries in the process that wrote them
+PROCESS_LOCAL_BACKENDS = {
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+}
+
+
+def is_shared():
+    """True if every server process sees the same default cache, and so the same invalidations"""
+    return settings.CACHES['default']['BACKEND'] not in PROCESS_LOCAL_BACKENDS
+
+
+def is_enabled():
+    return settings.JOB_LIST_CACHE_TIMEOUT > 0 and is_shared()
+
+
+def provider_stats_enabled():
+    return settings.PROVIDER_STATS_CACHE_TIMEOUT > 0 and is_shared()
+
+
+def _get_version(version_key=VERSION_KEY):
+    # Seed from the clock so an evicted version key never resurrects old entries
+    return cache.get_or_set(version_key, time.time_ns(), None)
+
+
+def _bump_version(version_key):
+    try:
+        cache.incr(version_key)
+    except ValueError:
+        cache.set(version_key, time.time_ns(), None)
+
+
+def _bump(key):
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Key evicted between add() and incr()
+        cache.set(key, 1, None)
+
+
+def get_cache_key(request):
+    """Build the cache key for a job list request from its normalized query params"""
+    params = sorted(
+        (key, value)
+        for key in request.query_params
+        for value in request.query_params.getlist(key)
+        if value != ''
+    )
+    digest = hashlib.md5(
+        json.dumps([request.get_host(), params]).encode()
+    ).hexdigest()
+    return f'jobs:list:v{_get_version()}:{digest}'
+
+
+def get_page(key):
+    """Return a cached page and count the hit or miss"""
+    data = cache.get(key)
+    _bump(HITS_KEY if data is not None else MISSES_KEY)
+    return data
+
+
+def set_page(key, data):
+    # Store plain JSON types rather than ReturnDict/ReturnList, which reference their serializer
+    cache.set(key, json.loads(JSONRenderer().render(data)), settings.JOB_LIST_CACHE_TIMEOUT)
+
+
+def invalidate():
+    """Invalidate every cached job list page"""
+    _bump_version(VERSION_KEY)
+
+
+def get_stats():
+    hits = cache.get(HITS_KEY, 0)
+    misses = cache.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        'enabled': is_enabled(),
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': round(hits / total, 4) if total else 0.0,
+    }
+
+
+def reset_stats():
+    cache.delete_many([HITS_KEY, MISSES_KEY])
+
+
+def get_provider_stats(provider_id, days):
+    key = _provider_stats_key(provider_id, days)
+    return cache.get(key)
+
+
+def set_provider_stats(provider_id, days, data):
+    key = _provider_stats_key(provider_id, days)
+    cache.set(key, data, settings.PROVIDER_STATS_CACHE_TIMEOUT)
+
+
+def invalidate_provider_stats(provider_id):
+    """Invalidate every cached stats report of one provider"""
+    _bump_version(PROVIDER_STATS_VERSION_KEY.format(provider_id=provider_id))
+
+
+def _provider_stats_key(provider_id, days):
+    version = _get_version(PROVIDER_STATS_VERSION_KEY.format(provider_id=provider_id))
+    return f'jobs:provider_stats:{provider_id}:v{version}:{days}'
@@ -0,0 +1,144 @@
+import statistics
+import threading
+import time
+from django.contrib.auth import get_user_model
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.db.backends.signals import connection_created
+from django.test import RequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
+from config.postgresql_pool.base import get_stats as get_pool_stats
+
+User = get_user_model()
+
+POSTGRESQL = 'django.db.backends.postgresql'
+POOL = 'config.postgresql_pool'
+
+
+class Command(BaseCommand):
+    help = (
+        'Time authenticated requests to an endpoint with each database connection mode '
+        '(reconnect per request, persistent connections, pool) and compare latencies'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default='/api/jobs/', help='Endpoint to request (default: /api/jobs/)')
+        parser.add_argument('--requests', type=int, default=200, help='Requests per thread and mode (default: 200)')
+        parser.add_argument('--concurrency', type=int, default=1, help='Threads sending requests (default: 1)')
+        parser.add_argument('--pool-size', type=int, default=4, help='Pool size of the pool mode (default: 4)')
+        parser.add_argument('--warmup', type=int, default=10, help='Untimed requests per thread first (default: 10)')
+
+    def handle(self, *args, **options):
+        modes = [
+            ('reconnect per request', POSTGRESQL, {'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': False}),
+            ('persistent + health checks', POSTGRESQL, {'CONN_MAX_AGE': 60, 'CONN_HEALTH_CHECKS': True}),
+            (f"pool ({options['pool_size']} per process)", POOL, {
+                'CONN_MAX_AGE': 0,
+                'CONN_HEALTH_CHECKS': True,
+                'OPTIONS': {'POOL_SIZE': options['pool_size'], 'POOL_TIMEOUT': 30, 'POOL_MAX_IDLE': 300},
+            }),
+        ]
+        db_settings = connections.settings['default']
+        original = dict(db_settings)
+        user = User.objects.create_user(
+            username='db-connection-benchmark',
+            email='db-connection-benchmark@example.invalid',
+            password=None,
+            user_type='job_seeker',
+        )
+        token = str(AccessToken.for_user(user))
+        connection.close()
+
+        rows = []
+        try:
+            for label, engine, overrides in modes:
+                db_settings.clear()
+                db_settings.update({**original, 'ENGINE': engine, **overrides})
+                if engine != POOL:
+                    db_settings['OPTIONS'] = {
+                        name: value for name, value in original.get('OPTIONS', {}).items()
+                        if not name.startswith('POOL_')
+                    }
+                rows.append((label, *self._run_mode(engine, token, options)))
+        finally:
+            db_settings.clear()
+            db_settings.update(original)
+            User.objects.filter(pk=user.pk).delete()
+
+        self.stdout.write(
+            f"{'mode':<30}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'req/s':>10}{'connects':>10}"
+        )
+        baseline = rows[0][1]
+        for label, mean, p50, p95, throughput, connects in rows:
+            self.stdout.write(
+                f"{label:<30}{mean:>10.2f}{p50:>10.2f}{p95:>10.2f}{throughput:>10.1f}{connects:>10}"
+                + (f"   ({(1 - mean / baseline) * 100:.0f}% lower mean latency)" if mean != baseline else '')
+            )
+        self.stdout.write(
+            f"({options['concurrency']} thread(s) x {options['requests']} GET {options['path']} per mode; "
+            "connects = new PostgreSQL connections opened, warm-up included)"
+        )
+
+    def _run_mode(self, engine, token, options):
+        timings, errors, connects = [], [], [0]
+        lock = threading.Lock()
+        pool_connects = self._pool_connects()
+
+        def count_connect(sender, **kwargs):
+            with lock:
+                connects[0] += 1
+
+        def worker():
+            # The real WSGI handler, since the test client keeps connections open between requests
+            handler = WSGIHandler()
+            factory = RequestFactory()
+            local = []
+            try:
+                for i in range(options['warmup'] + options['requests']):
+                    environ = factory.get(options['path'], HTTP_AUTHORIZATION=f'Bearer {token}').environ
+                    started = time.perf_counter()
+                    response = handler(environ, lambda status, headers, exc_info=None: None)
+                    response.close()
+                    elapsed = time.perf_counter() - started
+                    if response.status_code != 200:
+                        raise CommandError(f"GET {options['path']} returned {response.status_code}")
+                    if i >= options['warmup']:
+                        local.append(elapsed)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                # Persistent connections are per thread; close them before the thread ends
+                connection.close()
+            with lock:
+                timings.extend(local)
+
+        connection_created.connect(count_connect)
+        started = time.perf_counter()
+        try:
+            threads = [threading.Thread(target=worker) for _ in range(options['concurrency'])]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            connection_created.disconnect(count_connect)
+        wall = time.perf_counter() - started
+        if errors:
+            raise CommandError(str(errors[0]))
+
+        if engine == POOL:
+            # connection_created also fires when a pooled connection is handed out
+            connects[0] = self._pool_connects() - pool_connects
+        ms = sorted(t * 1000 for t in timings)
+        return (
+            statistics.mean(ms),
+            statistics.median(ms),
+            ms[int(len(ms) * 0.95) - 1],
+            len(ms) / wall,
+            connects[0],
+        )
+
+    @staticmethod
+    def _pool_connects():
+        return sum(stats['connects'] for stats in get_pool_stats())
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from jobs.models import Job
+from jobs.search import update_search_vector
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search vector for all jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of jobs updated per UPDATE statement (default: 1000)'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        job_ids = list(Job.objects.order_by('pk').values_list('pk', flat=True))
+        updated = 0
+
+        # Update in primary-key ranges to keep each statement's lock footprint small
+        for start in range(0, len(job_ids), batch_size):
+            batch = job_ids[start:start + batch_size]
+            updated += update_search_vector(
+                Job.objects.filter(pk__gte=batch[0], pk__lte=batch[-1])
+            )
+            self.stdout.write(f"Indexed {updated}/{len(job_ids)} jobs")
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt search index for {updated} jobs"))
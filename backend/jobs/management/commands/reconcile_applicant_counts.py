@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from jobs.models import Job, Application
+
+
+class Command(BaseCommand):
+    help = 'Recompute the stored applicant count of every job and report drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report jobs whose stored count has drifted'
+        )
+
+    def handle(self, *args, **options):
+        counts = (
+            Application.objects.filter(job=OuterRef('pk'))
+            .order_by().values('job').annotate(total=Count('pk')).values('total')
+        )
+        actual_count = Coalesce(Subquery(counts), 0)
+
+        drifted = list(
+            Job.objects.annotate(actual_count=actual_count)
+            .exclude(applications_count=F('actual_count'))
+            .values_list('pk', 'applications_count', 'actual_count')
+        )
+
+        for job_id, stored, actual in drifted:
+            self.stdout.write(f"Job {job_id}: stored {stored}, actual {actual}")
+
+        if not drifted:
+            self.stdout.write(self.style.SUCCESS("All applicant counts are in sync"))
+            return
+
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(f"{len(drifted)} jobs have drifted (dry run, nothing updated)"))
+            return
+
+        updated = Job.objects.filter(pk__in=[job_id for job_id, _, _ in drifted]).update(
+            applications_count=actual_count
+        )
+        self.stdout.write(self.style.SUCCESS(f"Reconciled applicant counts for {updated} jobs"))
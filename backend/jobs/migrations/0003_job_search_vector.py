@@ -0,0 +1,46 @@
+# Generated by Django 4.2.25 on 2026-10-16 23:02
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import OuterRef, Subquery, TextField
+from django.db.models.functions import Cast
+
+
+def populate_search_vector(apps, schema_editor):
+    # The vector as defined when this migration was written, against the historical models
+    Job = apps.get_model('jobs', 'Job')
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    company_name = Subquery(
+        User.objects.filter(pk=OuterRef('created_by_id')).order_by().values('company_name')[:1]
+    )
+    Job.objects.update(search_vector=(
+        SearchVector('title', weight='A', config='english')
+        + SearchVector(Cast('skills_required', TextField()), weight='B', config='english')
+        + SearchVector('description', weight='C', config='english')
+        + SearchVector('location', weight='D', config='english')
+        + SearchVector(company_name, weight='D', config='english')
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='jobs_job_search_gin'),
+        ),
+        migrations.RunPython(populate_search_vector, migrations.RunPython.noop),
+    ]
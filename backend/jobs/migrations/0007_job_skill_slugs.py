@@ -0,0 +1,42 @@
+# Generated by Django 4.2.25 on 2026-10-16 23:07
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+# Frozen copy of jobs.skills.normalize_skills as of this migration
+def normalize_skills(skills):
+    slugs = []
+    for skill in skills or []:
+        slug = '-'.join(str(skill).split()).casefold()
+        if slug and slug not in slugs:
+            slugs.append(slug)
+    return slugs
+
+
+def populate_skill_slugs(apps, schema_editor):
+    Job = apps.get_model('jobs', 'Job')
+    jobs = list(Job.objects.only('pk', 'skills_required'))
+    for job in jobs:
+        job.skill_slugs = normalize_skills(job.skills_required)
+    Job.objects.bulk_update(jobs, ['skill_slugs'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0006_job_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='skill_slugs',
+            field=models.JSONField(default=list, editable=False),
+        ),
+        migrations.RunPython(populate_skill_slugs, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='job',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['skill_slugs'], name='jobs_job_skill_slugs_gin'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.25 on 2026-10-16 23:37
+
+from django.db import migrations, models
+
+
+# Frozen copy of jobs.models.summarize as of this migration
+def summarize(text, length=300):
+    text = ' '.join(text.split())
+    if len(text) <= length:
+        return text
+    cut = text[:length - 1]
+    if ' ' in cut:
+        cut = cut.rsplit(' ', 1)[0]
+    return cut.rstrip(' ,.;:') + '…'
+
+
+def populate_summary(apps, schema_editor):
+    Job = apps.get_model('jobs', 'Job')
+    jobs = list(Job.objects.only('pk', 'description'))
+    for job in jobs:
+        job.summary = summarize(job.description)
+    Job.objects.bulk_update(jobs, ['summary'], batch_size=1000)
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0007_job_skill_slugs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='summary',
+            field=models.CharField(blank=True, editable=False, max_length=300),
+        ),
+        migrations.RunPython(populate_summary, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.25 on 2026-10-17 00:40
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import OuterRef, Subquery, TextField
+from django.db.models.functions import Cast
+
+
+def populate_search_vector(apps, schema_editor):
+    # The vector as defined when this migration was written, against the historical models
+    Job = apps.get_model('jobs', 'Job')
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    poster = User.objects.filter(pk=OuterRef('created_by_id')).order_by()
+    Job.objects.update(search_vector=(
+        SearchVector('title', weight='A', config='english')
+        + SearchVector(Cast('skills_required', TextField()), weight='B', config='english')
+        + SearchVector('description', weight='C', config='english')
+        + SearchVector('location', weight='D', config='english')
+        + SearchVector(Subquery(poster.values('company_name')[:1]), weight='D', config='english')
+        + SearchVector(Subquery(poster.values('email')[:1]), weight='D', config='english')
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0008_job_summary'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_search_vector, migrations.RunPython.noop),
+    ]
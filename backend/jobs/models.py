@@ -1,8 +1,28 @@
 from django.db import models
+from django.db.models import F
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db.models.functions import Upper
+from django.contrib.postgres.search import SearchVectorField
+from .search import JOB_SEARCH_FIELDS, update_search_vector
+from .skills import normalize_skills
 
 User = get_user_model()
 
+# Length of Job.summary, the description excerpt rendered by job lists
+SUMMARY_LENGTH = 300
+
+
+def summarize(text, length=SUMMARY_LENGTH):
+    """First ``length`` characters of ``text`` with whitespace collapsed, cut at a word boundary"""
+    text = ' '.join(text.split())
+    if len(text) <= length:
+        return text
+    cut = text[:length - 1]
+    if ' ' in cut:
+        cut = cut.rsplit(' ', 1)[0]
+    return cut.rstrip(' ,.;:') + '…'
+
 
 class Job(models.Model):
     """Job posting model"""
@@ -23,6 +43,7 @@ class Job(models.Model):
     
     title = models.CharField(max_length=255)
     description = models.TextField()
+    summary = models.CharField(max_length=SUMMARY_LENGTH, blank=True, editable=False)  # Excerpt of description, set on save
     requirements = models.TextField()
     responsibilities = models.TextField(blank=True)
     location = models.CharField(max_length=255)
@@ -31,21 +52,97 @@ class Job(models.Model):
     salary_min = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     salary_max = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     skills_required = models.JSONField(default=list)
+    skill_slugs = models.JSONField(default=list, editable=False)  # Canonical form of skills_required, set on save
     application_deadline = models.DateField(null=True, blank=True)
     created_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='jobs_posted')
     is_active = models.BooleanField(default=True)
+    applications_count = models.PositiveIntegerField(default=0, editable=False)  # Maintained atomically, see adjust_applications_count
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    search_vector = SearchVectorField(null=True, editable=False)  # Maintained on save, see jobs.search
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            GinIndex(fields=['search_vector'], name='jobs_job_search_gin'),
+            GinIndex(fields=['skill_slugs'], name='jobs_job_skill_slugs_gin'),
+            # Keyset pagination over the public feed (see jobs.pagination)
+            models.Index(
+                fields=['-created_at', '-id'],
+                name='jobs_job_active_feed_idx',
+                condition=models.Q(is_active=True),
+            ),
+            # Filter matrix of JobListCreateView, restricted to active jobs
+            models.Index(
+                fields=['job_type', 'experience_level', '-created_at'],
+                name='jobs_job_type_level_idx',
+                condition=models.Q(is_active=True),
+            ),
+            models.Index(
+                fields=['experience_level', '-created_at'],
+                name='jobs_job_level_recent_idx',
+                condition=models.Q(is_active=True),
+            ),
+            models.Index(
+                fields=['salary_min'],
+                name='jobs_job_salary_min_idx',
+                condition=models.Q(is_active=True),
+            ),
+            models.Index(
+                fields=['salary_max'],
+                name='jobs_job_salary_max_idx',
+                condition=models.Q(is_active=True),
+            ),
+            # location__icontains compiles to UPPER(location) LIKE UPPER(%term%)
+            GinIndex(
+                OpClass(Upper('location'), name='gin_trgm_ops'),
+                name='jobs_job_location_trgm',
+                condition=models.Q(is_active=True),
+            ),
+        ]
     
     def __str__(self):
         return f"{self.title} at {self.created_by.company_name or self.created_by.email}"
     
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        # Never write back a possibly stale applications_count or search_vector from this
+        # instance, nor a deferred column, which would be loaded one query at a time
+        if not self._state.adding and update_fields is None:
+            deferred = self.get_deferred_fields()
+            update_fields = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.attname not in deferred
+                and field.name not in ('applications_count', 'search_vector')
+            ]
+        if update_fields is None or 'skills_required' in update_fields:
+            self.skill_slugs = normalize_skills(self.skills_required)
+            if update_fields is not None:
+                update_fields = {*update_fields, 'skill_slugs'}
+        # Left alone unless description is written, so a deferred description is not loaded just for this
+        if update_fields is None or 'description' in update_fields:
+            self.summary = summarize(self.description)
+            if update_fields is not None:
+                update_fields = {*update_fields, 'summary'}
+        if update_fields is not None:
+            kwargs['update_fields'] = update_fields
+        super().save(*args, **kwargs)
+        # Only an indexed column changes the vector (see jobs.search)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or JOB_SEARCH_FIELDS & set(update_fields):
+            update_search_vector(Job.objects.filter(pk=self.pk))
+    
     @property
     def applicant_count(self):
-        return self.applications.count()
+        return self.applications_count
+    
+    @staticmethod
+    def adjust_applications_count(job_id, delta):
+        """Atomically add delta to a job's stored applicant count"""
+        queryset = Job.objects.filter(pk=job_id)
+        if delta < 0:
+            queryset = queryset.filter(applications_count__gte=-delta)
+        return queryset.update(applications_count=F('applications_count') + delta)
 
 
 class Application(models.Model):
@@ -70,6 +167,11 @@ class Application(models.Model):
     class Meta:
         ordering = ['-applied_at']
         unique_together = ['job', 'applicant']
+        indexes = [
+            # Keyset pagination over per-job and per-applicant application lists
+            models.Index(fields=['job', '-applied_at', '-id'], name='jobs_app_job_feed_idx'),
+            models.Index(fields=['applicant', '-applied_at', '-id'], name='jobs_app_applicant_feed_idx'),
+        ]
     
     def __str__(self):
         return f"{self.applicant.email} - {self.job.title} ({self.status})"
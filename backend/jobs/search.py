@@ -0,0 +1,78 @@
+"""
+Full-text search for job postings
+
+Jobs carry a stored PostgreSQL tsvector (``Job.search_vector``) backed by a
+GIN index. Terms are weighted title > skills > description > location/company so the
+ranked mode surfaces title matches first. The poster's email address is indexed
+as a single token, so it matches when searched in full.
+
+``Job.save()`` recomputes the vector when an indexed column changes, and the
+poster's jobs are re-indexed when their company name or email is saved (see
+``jobs.signals``). ``rebuild_job_search_index`` recomputes every job.
+"""
+
+from django.contrib.auth import get_user_model
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db.models import F, OuterRef, Subquery, TextField
+from django.db.models.functions import Cast
+from rest_framework import filters
+
+SEARCH_CONFIG = 'english'
+
+# Job fields the vector is built from; saving one of them recomputes it
+JOB_SEARCH_FIELDS = frozenset({'title', 'skills_required', 'description', 'location', 'created_by', 'created_by_id'})
+
+# Fields of the poster (created_by) that the vector includes
+POSTER_SEARCH_FIELDS = frozenset({'company_name', 'email'})
+
+
+def build_search_vector():
+    """
+    Build the weighted search vector expression for a Job row
+
+    Usable in ``QuerySet.update()``, so the poster's company name and email are
+    pulled in through subqueries rather than a join.
+    """
+    User = get_user_model()
+    poster = User.objects.filter(pk=OuterRef('created_by_id')).order_by()
+    company_name = Subquery(poster.values('company_name')[:1])
+    email = Subquery(poster.values('email')[:1])
+    return (
+        SearchVector('title', weight='A', config=SEARCH_CONFIG)
+        + SearchVector(Cast('skills_required', TextField()), weight='B', config=SEARCH_CONFIG)
+        + SearchVector('description', weight='C', config=SEARCH_CONFIG)
+        + SearchVector('location', weight='D', config=SEARCH_CONFIG)
+        + SearchVector(company_name, weight='D', config=SEARCH_CONFIG)
+        + SearchVector(email, weight='D', config=SEARCH_CONFIG)
+    )
+
+
+def update_search_vector(queryset):
+    """Recompute the stored search vector for every job in the queryset"""
+    return queryset.update(search_vector=build_search_vector())
+
+
+class JobSearchFilter(filters.SearchFilter):
+    """
+    Full-text search over the stored job search vector
+
+    ``?search=<terms>`` matches using websearch syntax (quoted phrases,
+    ``or``, ``-exclusions``). ``?search_mode=ranked`` additionally orders
+    results by relevance, most recent first on ties.
+    """
+    search_mode_param = 'search_mode'
+
+    def filter_queryset(self, request, queryset, view):
+        terms = request.query_params.get(self.search_param, '').strip()
+        if not terms:
+            return queryset
+
+        query = SearchQuery(terms, search_type='websearch', config=SEARCH_CONFIG)
+        queryset = queryset.filter(search_vector=query)
+
+        if request.query_params.get(self.search_mode_param) == 'ranked':
+            queryset = queryset.annotate(
+                search_rank=SearchRank(F('search_vector'), query)
+            ).order_by('-search_rank', '-created_at')
+
+        return queryset
@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from .models import Job, Application, SavedJob
+from .sparse_fields import SparseFieldsMixin
 
 User = get_user_model()
 
@@ -19,36 +20,75 @@ class JobCreatorSerializer(serializers.ModelSerializer):
         fields = ['id', 'email', 'company_name', 'location', 'website']
 
 
-class JobListSerializer(serializers.ModelSerializer):
-    """Serializer for job list"""
+class UserJobFlagsMixin:
+    """
+    Resolve is_saved/has_applied for the requesting user without a query per job
+    
+    List views annotate ``user_saved``/``user_applied`` onto the queryset (see
+    ``jobs.views.annotate_user_job_flags``). When a job is serialized without
+    those annotations (e.g. nested in an application), the user's saved and
+    applied job IDs are loaded once and shared through the serializer context.
+    """
+    
+    def _user_job_ids(self, model, user_field):
+        request = self.context.get('request')
+        if not request or not request.user.is_authenticated:
+            return set()
+        cache_key = f'_{model._meta.model_name}_job_ids'
+        if cache_key not in self.context:
+            self.context[cache_key] = set(
+                model.objects.filter(**{user_field: request.user}).values_list('job_id', flat=True)
+            )
+        return self.context[cache_key]
+    
+    def get_is_saved(self, obj):
+        flag = getattr(obj, 'user_saved', None)
+        if flag is not None:
+            return flag
+        return obj.id in self._user_job_ids(SavedJob, 'user')
+    
+    def get_has_applied(self, obj):
+        flag = getattr(obj, 'user_applied', None)
+        if flag is not None:
+            return flag
+        return obj.id in self._user_job_ids(Application, 'applicant')
+
+
+# Job columns JobListSerializer does not render by default; list querysets defer them
+JOB_LIST_DEFERRED_FIELDS = ('description', 'requirements', 'responsibilities', 'search_vector')
+
+
+def defer_job_list_fields(queryset, prefix=''):
+    """Defer JOB_LIST_DEFERRED_FIELDS, on a joined job when given a prefix such as ``'job__'``"""
+    return queryset.defer(*(prefix + name for name in JOB_LIST_DEFERRED_FIELDS))
+
+
+class JobListSerializer(SparseFieldsMixin, UserJobFlagsMixin, serializers.ModelSerializer):
+    """
+    Serializer for job list (supports ?fields=/?omit=)
+    
+    Renders the stored ``summary`` rather than the full description, so lists
+    can use ``defer_job_list_fields`` querysets. Clients that still need the
+    description ask for it with ``?fields=...,description`` (or
+    ``job.description`` when nested), which also stops the view deferring it.
+    """
     created_by = JobCreatorSerializer(read_only=True)
     applicant_count = serializers.ReadOnlyField()
     is_saved = serializers.SerializerMethodField()
     has_applied = serializers.SerializerMethodField()
+    sparse_opt_in_fields = ('description',)
     
     class Meta:
         model = Job
         fields = [
-            'id', 'title', 'description', 'location', 'job_type',
+            'id', 'title', 'summary', 'description', 'location', 'job_type',
             'experience_level', 'salary_min', 'salary_max', 'skills_required',
             'application_deadline', 'created_by', 'is_active', 'created_at',
             'applicant_count', 'is_saved', 'has_applied'
         ]
-    
-    def get_is_saved(self, obj):
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return SavedJob.objects.filter(user=request.user, job=obj).exists()
-        return False
-    
-    def get_has_applied(self, obj):
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return Application.objects.filter(applicant=request.user, job=obj).exists()
-        return False
 
 
-class JobDetailSerializer(serializers.ModelSerializer):
+class JobDetailSerializer(UserJobFlagsMixin, serializers.ModelSerializer):
     """Serializer for job details"""
     created_by = JobCreatorSerializer(read_only=True)
     applicant_count = serializers.ReadOnlyField()
@@ -63,18 +103,6 @@ class JobDetailSerializer(serializers.ModelSerializer):
             'skills_required', 'application_deadline', 'created_by', 'is_active',
             'created_at', 'updated_at', 'applicant_count', 'is_saved', 'has_applied'
         ]
-    
-    def get_is_saved(self, obj):
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return SavedJob.objects.filter(user=request.user, job=obj).exists()
-        return False
-    
-    def get_has_applied(self, obj):
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return Application.objects.filter(applicant=request.user, job=obj).exists()
-        return False
 
 
 class JobCreateUpdateSerializer(serializers.ModelSerializer):
@@ -106,8 +134,8 @@ class ApplicationWorkspaceSerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
 
-class ApplicationSerializer(serializers.ModelSerializer):
-    """Serializer for application list"""
+class ApplicationSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """Serializer for application list (supports ?fields=/?omit=)"""
     job = JobListSerializer(read_only=True)
     applicant = ApplicantSerializer(read_only=True)
     workspace = ApplicationWorkspaceSerializer(read_only=True)
@@ -0,0 +1,13 @@
+from django.conf import settings
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from .models import Job
+from .search import POSTER_SEARCH_FIELDS, update_search_vector
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def reindex_poster_jobs(sender, instance, created, update_fields=None, **kwargs):
+    """Recompute the search vectors of a user's jobs when their company name or email may have changed"""
+    if created or (update_fields is not None and not POSTER_SEARCH_FIELDS & set(update_fields)):
+        return
+    update_search_vector(Job.objects.filter(created_by=instance))
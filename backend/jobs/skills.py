@@ -0,0 +1,21 @@
+"""
+Canonical skill slugs
+
+Skills are matched on case-folded slugs stored alongside the free-form
+``skills_required`` list, so "CISSP" never matches a search for "C".
+"""
+
+
+def normalize_skill(skill):
+    """Return the canonical slug for a skill name ("Penetration  Testing" -> "penetration-testing")"""
+    return '-'.join(str(skill).split()).casefold()
+
+
+def normalize_skills(skills):
+    """Return the de-duplicated canonical slugs for a list of skills, preserving order"""
+    slugs = []
+    for skill in skills or []:
+        slug = normalize_skill(skill)
+        if slug and slug not in slugs:
+            slugs.append(slug)
+    return slugs
@@ -0,0 +1,168 @@
+"""
+Sparse fieldsets for list endpoints
+
+Clients pass ``?fields=`` to keep only the listed fields or ``?omit=`` to drop
+some, as comma-separated names. Dotted names reach into nested serializers,
+e.g. ``?fields=id,state,application.job.title`` or
+``?omit=application.cover_letter,application.job.description``. Unknown names
+are ignored. Without either parameter the full representation is returned,
+minus any opt-in fields, which are only rendered when named in ``?fields=``
+(e.g. ``?fields=id,title,description`` on job lists).
+
+Views using ``SparseFieldsViewMixin`` also ``defer()`` the large text columns
+that only the dropped fields read, so a lighter response is also a lighter query.
+"""
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from rest_framework import serializers
+
+FIELDS_PARAM = 'fields'
+OMIT_PARAM = 'omit'
+
+
+def parse_field_paths(value: str) -> dict:
+    """``'id,job.title,job.id'`` -> ``{'id': {}, 'job': {'title': {}, 'id': {}}}``"""
+    tree = {}
+    for path in value.split(','):
+        node = tree
+        for name in path.strip().split('.'):
+            if name:
+                node = node.setdefault(name, {})
+    return tree
+
+
+class SparseFieldsMixin:
+    """
+    Serializer mixin that applies ``?fields=``/``?omit=``
+
+    The outermost serializer reads the parameters from the request in its
+    context and hands the dotted remainder to nested serializers that use the
+    mixin too. ``sparse_field_sources`` names the model columns (as ORM paths)
+    read by fields whose source is not a column, e.g. method fields, so the
+    view knows what it must not defer. ``sparse_opt_in_fields`` are left out
+    unless ``?fields=`` names them.
+    """
+    sparse_field_sources = {}
+    sparse_opt_in_fields = ()
+
+    def get_fields(self):
+        fields = super().get_fields()
+        include, omit = self._sparse_selection()
+
+        if include:
+            fields = {name: field for name, field in fields.items() if name in include}
+        for name in self.sparse_opt_in_fields:
+            if not include or name not in include:
+                fields.pop(name, None)
+        for name, nested_omit in (omit or {}).items():
+            if not nested_omit:
+                fields.pop(name, None)
+
+        for name, field in fields.items():
+            nested = getattr(field, 'child', field)
+            if isinstance(nested, SparseFieldsMixin):
+                nested._sparse = ((include or {}).get(name) or None, (omit or {}).get(name) or None)
+        return fields
+
+    def _sparse_selection(self):
+        if hasattr(self, '_sparse'):
+            return self._sparse
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        request = self.context.get('request')
+        if parent is not None or request is None:
+            return None, None
+        params = request.query_params
+        return (
+            parse_field_paths(params.get(FIELDS_PARAM, '')) or None,
+            parse_field_paths(params.get(OMIT_PARAM, '')) or None,
+        )
+
+
+def _rendered_columns(serializer, prefix=''):
+    """ORM paths of the columns read by the serializer's (remaining) fields"""
+    columns = set()
+    sources = getattr(serializer, 'sparse_field_sources', {})
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        nested = getattr(field, 'child', field)
+        if isinstance(nested, serializers.ModelSerializer):
+            columns |= _rendered_columns(nested, prefix + field.source.replace('.', '__') + '__')
+        elif name in sources:
+            columns.update(prefix + source for source in sources[name])
+        elif field.source != '*':
+            columns.add(prefix + field.source.replace('.', '__'))
+    return columns
+
+
+def _is_text_column(model, path: str) -> bool:
+    field = None
+    for name in path.split('__'):
+        if field is not None:
+            if not field.is_relation:
+                return False
+            model = field.related_model
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            # Properties and other non-column attributes
+            return False
+    return isinstance(field, models.TextField)
+
+
+def defer_unrendered(queryset, serializer_class, request):
+    """
+    Defer the text columns that ``?fields=``/``?omit=`` removed from the response
+
+    Only columns on the queryset's model or on relations it already
+    ``select_related()`` are deferred; columns still read by a remaining field
+    are kept, so serializing never loads a deferred column row by row.
+    """
+    params = request.query_params
+    if not params.get(FIELDS_PARAM) and not params.get(OMIT_PARAM):
+        return queryset
+
+    full = _rendered_columns(serializer_class())
+    sparse = _rendered_columns(serializer_class(context={'request': request}))
+    queryset = _undefer(queryset, sparse)
+    selected = queryset.query.select_related
+    deferred = [
+        path for path in sorted(full - sparse)
+        if _is_text_column(queryset.model, path) and _is_selected(selected, path)
+    ]
+    return queryset.defer(*deferred) if deferred else queryset
+
+
+def _undefer(queryset, columns):
+    # A requested opt-in field may read a column the view defers by default
+    deferred, is_defer = queryset.query.deferred_loading
+    kept = deferred - columns
+    if not is_defer or kept == deferred:
+        return queryset
+    return queryset.defer(None).defer(*kept)
+
+
+def _is_selected(select_related, path: str) -> bool:
+    # Columns of relations that are fetched lazily are loaded in their own query anyway
+    *relations, _ = path.split('__')
+    node = select_related
+    for name in relations:
+        if node is True:
+            return True
+        if not isinstance(node, dict) or name not in node:
+            return False
+        node = node[name]
+    return True
+
+
+class SparseFieldsViewMixin:
+    """List view mixin that defers the columns a sparse fieldset leaves out"""
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.request.method != 'GET':
+            return queryset
+        return defer_unrendered(queryset, self.get_serializer_class(), self.request)
@@ -0,0 +1,82 @@
+"""
+Provider dashboard statistics
+
+Each report is a single grouped aggregate query so the cost does not grow
+with the number of applicants a provider has.
+"""
+
+from datetime import timedelta
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from .models import Job, Application
+
+STATUSES = [choice for choice, _ in Application.STATUS_CHOICES]
+
+
+def _rate(part, total):
+    return round(part / total, 4) if total else 0.0
+
+
+def get_status_counts_by_job(provider):
+    """Application counts per status for every job of the provider"""
+    status_counts = {
+        status: Count('applications', filter=Q(applications__status=status))
+        for status in STATUSES
+    }
+    rows = (
+        Job.objects.filter(created_by=provider)
+        .order_by('-created_at')
+        .values('id', 'title', 'is_active')
+        .annotate(total=Count('applications'), **status_counts)
+    )
+    return [
+        {
+            'job_id': row['id'],
+            'title': row['title'],
+            'is_active': row['is_active'],
+            'total': row['total'],
+            'by_status': {status: row[status] for status in STATUSES},
+        }
+        for row in rows
+    ]
+
+
+def get_daily_application_volume(provider, days):
+    """Number of applications received per day over the last ``days`` days"""
+    since = timezone.now() - timedelta(days=days)
+    rows = (
+        Application.objects.filter(job__created_by=provider, applied_at__gte=since)
+        .annotate(day=TruncDate('applied_at'))
+        .order_by('day')
+        .values('day')
+        .annotate(count=Count('id'))
+    )
+    return [{'date': row['day'].isoformat(), 'count': row['count']} for row in rows]
+
+
+def get_conversion_rates(jobs):
+    """Funnel rates across all of the provider's applications, derived from the per-job report"""
+    totals = {status: sum(job['by_status'][status] for job in jobs) for status in STATUSES}
+    total = sum(totals.values())
+    reviewed = totals['under_review'] + totals['approved'] + totals['rejected']
+    decided = totals['approved'] + totals['rejected']
+    return {
+        'total_applications': total,
+        'by_status': totals,
+        'review_rate': _rate(reviewed, total),
+        'approval_rate': _rate(totals['approved'], total),
+        'rejection_rate': _rate(totals['rejected'], total),
+        'approval_rate_of_decided': _rate(totals['approved'], decided),
+    }
+
+
+def build_provider_stats(provider, days):
+    jobs = get_status_counts_by_job(provider)
+    return {
+        'jobs': jobs,
+        'daily_applications': get_daily_application_volume(provider, days),
+        'conversion': get_conversion_rates(jobs),
+        'days': days,
+        'generated_at': timezone.now().isoformat(),
+    }
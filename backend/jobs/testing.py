@@ -0,0 +1,99 @@
+"""
+Seed data and base test case shared by the query count and query plan tests
+
+Users are numbered per process, so the helpers can be called any number of
+times in one test database.
+"""
+
+import itertools
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+from .models import Application, Job, summarize
+from .search import update_search_vector
+from .skills import normalize_skills
+
+User = get_user_model()
+
+_user_numbers = itertools.count(1)
+
+
+def create_user(user_type='job_seeker', **fields):
+    number = next(_user_numbers)
+    return User.objects.create_user(
+        username=f'{user_type}-{number}',
+        email=f'{user_type}-{number}@example.invalid',
+        password=None,
+        user_type=user_type,
+        **fields
+    )
+
+
+def create_provider(**fields):
+    fields.setdefault('company_name', 'Example Security')
+    return create_user('org_provider', **fields)
+
+
+def build_job(provider, index=0, **fields):
+    """Unsaved job for ``save_jobs``; ``fields`` override the defaults"""
+    job = Job(**{
+        'title': f'Security Analyst {index}',
+        'description': 'Synthetic job used by the tests.',
+        'requirements': 'Synthetic requirements.',
+        'location': 'Remote',
+        'job_type': 'full_time',
+        'experience_level': 'mid',
+        'created_by': provider,
+        **fields,
+    })
+    # bulk_create skips Job.save(), so derive its columns here
+    job.skill_slugs = normalize_skills(job.skills_required)
+    job.summary = summarize(job.description)
+    return job
+
+
+def save_jobs(jobs):
+    """Bulk-create ``jobs`` and compute their search vectors"""
+    jobs = Job.objects.bulk_create(jobs, batch_size=1000)
+    update_search_vector(Job.objects.filter(id__in=[job.id for job in jobs]))
+    return jobs
+
+
+def create_jobs(provider, count, **fields):
+    return save_jobs([build_job(provider, index, **fields) for index in range(count)])
+
+
+def create_applications(provider, seeker, count):
+    """
+    ``count`` jobs of ``provider``, each with an approved application of
+    ``seeker`` and one of another applicant; returns the seeker's applications
+    """
+    jobs = create_jobs(provider, count)
+    others = [create_user() for _ in range(count)]
+    applications = Application.objects.bulk_create(
+        [Application(job=job, applicant=seeker, status='approved') for job in jobs]
+        + [Application(job=job, applicant=other) for job, other in zip(jobs, others)]
+    )
+    return applications[:count]
+
+
+class ListQueryCountTestCase(TestCase):
+    """Checks that a list endpoint runs the same queries however many rows it returns"""
+
+    def get_list(self, view_class, user, query=''):
+        request = APIRequestFactory().get(f'/?{query}' if query else '/')
+        force_authenticate(request, user=user)
+        response = view_class.as_view()(request)
+        response.render()
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def assertConstantQueries(self, view_class, user, add_rows, query=''):
+        """List, call ``add_rows()`` to fill more than a page, and list again with the same number of queries"""
+        with CaptureQueriesContext(connection) as small:
+            self.get_list(view_class, user, query)
+        add_rows()
+        with self.assertNumQueries(len(small)):
+            return self.get_list(view_class, user, query)
@@ -0,0 +1,174 @@
+import random
+from decimal import Decimal
+from django.conf import settings
+from django.db import connection
+from django.test import TestCase
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, force_authenticate
+from workspaces.testing import create_workspaces
+from .models import Application, Job, SavedJob
+from .testing import (
+    ListQueryCountTestCase, build_job, create_applications, create_jobs, create_provider, create_user, save_jobs
+)
+from .views import JobListCreateView, ProviderApplicantListView, ProviderJobListView, UserApplicationListView
+
+# Common /api/jobs/ filter combinations the job board issues
+FILTER_COMBINATIONS = [
+    {},
+    {'job_type': 'full_time'},
+    {'experience_level': 'senior'},
+    {'job_type': 'remote', 'experience_level': 'mid'},
+    {'location': 'york'},
+    {'min_salary': '180000'},
+    {'max_salary': '40000'},
+    {'job_type': 'contract', 'experience_level': 'lead', 'location': 'london'},
+    {'skills': 'Cloud Security'},
+    {'skills': 'Forensics,Malware Analysis', 'skills_match': 'any'},
+    {'search': 'engineer'},
+]
+
+LOCATIONS = ['New York, NY', 'London, UK', 'Austin, TX', 'Berlin, DE', 'Remote', 'Singapore']
+
+SKILLS = [
+    'SIEM', 'Python', 'CISSP', 'Penetration Testing', 'Cloud Security',
+    'Incident Response', 'Forensics', 'Malware Analysis', 'AWS', 'Splunk',
+]
+
+
+class JobListQueryTests(ListQueryCountTestCase):
+
+    def setUp(self):
+        self.provider = create_provider()
+        self.seeker = create_user()
+
+    def add_jobs(self, count):
+        jobs = create_jobs(self.provider, count)
+        # The seeker saved every other job and applied to every third
+        SavedJob.objects.bulk_create([SavedJob(user=self.seeker, job=job) for job in jobs[::2]])
+        Application.objects.bulk_create([Application(job=job, applicant=self.seeker) for job in jobs[::3]])
+        return jobs
+
+    def test_job_list_for_seeker(self):
+        self.add_jobs(2)
+        self.assertConstantQueries(JobListCreateView, self.seeker, lambda: self.add_jobs(30))
+
+    def test_job_list_for_provider(self):
+        self.add_jobs(2)
+        self.assertConstantQueries(JobListCreateView, self.provider, lambda: self.add_jobs(30))
+
+    def test_job_list_with_cursor_pagination(self):
+        self.add_jobs(2)
+        self.assertConstantQueries(
+            JobListCreateView, self.seeker, lambda: self.add_jobs(30), query='pagination=cursor'
+        )
+
+    def test_provider_job_list(self):
+        self.add_jobs(2)
+        self.assertConstantQueries(ProviderJobListView, self.provider, lambda: self.add_jobs(30))
+
+    def test_description_only_on_request(self):
+        self.add_jobs(2)
+        results = self.get_list(JobListCreateView, self.seeker).data['results']
+        self.assertNotIn('description', results[0])
+
+        query = 'fields=id,title,summary,description'
+        response = self.assertConstantQueries(JobListCreateView, self.seeker, lambda: self.add_jobs(30), query=query)
+        self.assertEqual(response.data['results'][0]['description'], 'Synthetic job used by the tests.')
+
+    def test_nested_description_on_request(self):
+        create_applications(self.provider, self.seeker, 2)
+        self.assertConstantQueries(
+            UserApplicationListView, self.seeker, lambda: create_applications(self.provider, self.seeker, 30),
+            query='fields=id,job.title,job.description'
+        )
+
+    def test_cursor_pagination_rejects_reordering(self):
+        self.add_jobs(2)
+        for query in ('ordering=salary_min', 'search=analyst&search_mode=ranked'):
+            with self.subTest(query=query):
+                request = APIRequestFactory().get(f'/?pagination=cursor&{query}')
+                force_authenticate(request, user=self.seeker)
+                self.assertEqual(JobListCreateView.as_view()(request).status_code, 400)
+        self.get_list(JobListCreateView, self.seeker, 'pagination=cursor&search=analyst')
+
+    def test_saved_and_applied_flags(self):
+        jobs = self.add_jobs(6)
+        saved = {job.id for job in jobs[::2]}
+        applied = {job.id for job in jobs[::3]}
+
+        results = self.get_list(JobListCreateView, self.seeker).data['results']
+        self.assertEqual({job['id'] for job in results if job['is_saved']}, saved)
+        self.assertEqual({job['id'] for job in results if job['has_applied']}, applied)
+
+        results = self.get_list(JobListCreateView, self.provider).data['results']
+        self.assertFalse(any(job['is_saved'] or job['has_applied'] for job in results))
+
+
+class ApplicationListQueryTests(ListQueryCountTestCase):
+
+    def setUp(self):
+        self.provider = create_provider()
+        self.seeker = create_user()
+
+    def add_applications(self, count):
+        applications = create_applications(self.provider, self.seeker, count)
+        SavedJob.objects.bulk_create([SavedJob(user=self.seeker, job=app.job) for app in applications[::2]])
+        # Every other approved application has a workspace, so the nested workspace is serialized too
+        create_workspaces(self.provider, applications[::2])
+
+    def test_my_applications(self):
+        self.add_applications(2)
+        self.assertConstantQueries(UserApplicationListView, self.seeker, lambda: self.add_applications(30))
+
+    def test_my_applications_with_cursor_pagination(self):
+        self.add_applications(2)
+        self.assertConstantQueries(
+            UserApplicationListView, self.seeker, lambda: self.add_applications(30), query='pagination=cursor'
+        )
+
+    def test_provider_applicants(self):
+        self.add_applications(2)
+        self.assertConstantQueries(ProviderApplicantListView, self.provider, lambda: self.add_applications(30))
+
+
+class JobListQueryPlanTests(TestCase):
+    """Every common /api/jobs/ filter combination is index-backed on a realistically sized table"""
+    job_count = 20000
+
+    @classmethod
+    def setUpTestData(cls):
+        provider = create_provider()
+        rng = random.Random(0)
+        job_types = [choice for choice, _ in Job.JOB_TYPE_CHOICES]
+        levels = [choice for choice, _ in Job.EXPERIENCE_LEVEL_CHOICES]
+
+        jobs = []
+        for index in range(cls.job_count):
+            salary_min = Decimal(rng.randrange(30000, 200000, 1000))
+            jobs.append(build_job(
+                provider,
+                index,
+                title=f'Security Engineer {index}',
+                description='Synthetic job used for query plan checks. ' * 20,
+                location=rng.choice(LOCATIONS),
+                job_type=rng.choice(job_types),
+                experience_level=rng.choice(levels),
+                salary_min=salary_min,
+                salary_max=salary_min + Decimal(rng.randrange(0, 50000, 1000)),
+                skills_required=rng.sample(SKILLS, 3),
+                is_active=rng.random() < 0.9,
+            ))
+        save_jobs(jobs)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE jobs_job')
+
+    def explain(self, params):
+        request = Request(APIRequestFactory().get('/api/jobs/', params))
+        view = JobListCreateView(request=request, format_kwarg=None, kwargs={})
+        queryset = view.filter_queryset(view.get_queryset())
+        return queryset[:settings.REST_FRAMEWORK['PAGE_SIZE']].explain()
+
+    def test_filter_combinations_use_indexes(self):
+        for params in FILTER_COMBINATIONS:
+            with self.subTest(**params):
+                self.assertNotIn('Seq Scan on jobs_job', self.explain(params))
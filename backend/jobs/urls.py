@@ -8,6 +8,8 @@ from .views import (
     ApplicationStatusUpdateView,
     ProviderJobListView,
     ProviderApplicantListView,
+    ProviderStatsView,
+    JobListCacheStatsView,
     SavedJobListCreateView,
     SavedJobDeleteView
 )
@@ -18,6 +20,8 @@ urlpatterns = [
     # Job endpoints
     path('jobs/', JobListCreateView.as_view(), name='job_list_create'),
     path('jobs/<int:pk>/', JobDetailView.as_view(), name='job_detail'),
+    path('jobs/provider/stats/', ProviderStatsView.as_view(), name='provider_stats'),
+    path('jobs/cache/stats/', JobListCacheStatsView.as_view(), name='job_list_cache_stats'),
     
     # Application endpoints
     path('applications/', UserApplicationListView.as_view(), name='application_list'),
@@ -1,8 +1,10 @@
 from rest_framework import generics, status, filters
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
-from django.db.models import Q
+from rest_framework.views import APIView
+from rest_framework.permissions import IsAdminUser, IsAuthenticated, IsAuthenticatedOrReadOnly
+from django.db import transaction
+from django.db.models import Q, Exists, OuterRef
 from django.shortcuts import get_object_or_404
 from .models import Job, Application, SavedJob
 from .serializers import (
@@ -12,20 +14,43 @@ from .serializers import (
     ApplicationSerializer,
     ApplicationCreateSerializer,
     ApplicationStatusUpdateSerializer,
-    SavedJobSerializer
+    SavedJobSerializer,
+    defer_job_list_fields
 )
 from .permissions import IsJobProvider, IsJobOwner, IsJobSeeker, IsApplicationOwner
+from . import cache as jobs_cache
+from .stats import build_provider_stats
+from .search import JobSearchFilter
+from .skills import normalize_skills
+from .pagination import CursorPaginationOptInMixin, JobCursorPagination, ApplicationCursorPagination
+from .sparse_fields import SparseFieldsViewMixin
 
 
-class JobListCreateView(generics.ListCreateAPIView):
+def annotate_user_job_flags(queryset, user):
+    """Annotate user_saved/user_applied as EXISTS subqueries for the requesting user"""
+    if not user.is_authenticated:
+        return queryset
+    return queryset.annotate(
+        user_saved=Exists(SavedJob.objects.filter(user=user, job=OuterRef('pk'))),
+        user_applied=Exists(Application.objects.filter(applicant=user, job=OuterRef('pk'))),
+    )
+
+
+def select_application_graph(queryset):
+    """Join everything ApplicationSerializer nests (job, its creator, applicant, workspace)"""
+    return defer_job_list_fields(queryset.select_related('job__created_by', 'applicant', 'workspace'), 'job__')
+
+
+class JobListCreateView(SparseFieldsViewMixin, CursorPaginationOptInMixin, generics.ListCreateAPIView):
     """List all jobs or create a new job (providers only)"""
     permission_classes = [IsAuthenticatedOrReadOnly]
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ['title', 'description', 'location', 'skills_required', 'created_by__company_name', 'created_by__email']
+    cursor_pagination_class = JobCursorPagination
+    cursor_conflicting_params = {'ordering': None, 'search_mode': 'ranked'}
+    filter_backends = [JobSearchFilter, filters.OrderingFilter]
     ordering_fields = ['created_at', 'salary_min', 'application_deadline']
     
     def get_queryset(self):
-        queryset = Job.objects.filter(is_active=True).select_related('created_by')
+        queryset = defer_job_list_fields(Job.objects.filter(is_active=True).select_related('created_by'))
         
         # Filter by job type
         job_type = self.request.query_params.get('job_type')
@@ -51,20 +76,40 @@ class JobListCreateView(generics.ListCreateAPIView):
         if max_salary:
             queryset = queryset.filter(salary_max__lte=max_salary)
         
-        # Filter by skills
+        # Filter by skills (?skills_match=any matches any listed skill, default requires all)
         skills = self.request.query_params.get('skills')
         if skills:
-            skills_list = skills.split(',')
-            for skill in skills_list:
-                queryset = queryset.filter(skills_required__icontains=skill.strip())
+            skill_slugs = normalize_skills(skills.split(','))
+            if skill_slugs:
+                if self.request.query_params.get('skills_match') == 'any':
+                    queryset = queryset.filter(skill_slugs__has_any_keys=skill_slugs)
+                else:
+                    queryset = queryset.filter(skill_slugs__contains=skill_slugs)
         
-        return queryset
+        return annotate_user_job_flags(queryset, self.request.user)
     
     def get_serializer_class(self):
         if self.request.method == 'POST':
             return JobCreateUpdateSerializer
         return JobListSerializer
     
+    def list(self, request, *args, **kwargs):
+        # Anonymous pages are identical for everyone, so serve them from cache
+        if request.user.is_authenticated or not jobs_cache.is_enabled():
+            return super().list(request, *args, **kwargs)
+        
+        cache_key = jobs_cache.get_cache_key(request)
+        data = jobs_cache.get_page(cache_key)
+        if data is not None:
+            response = Response(data)
+            response['X-Cache'] = 'HIT'
+            return response
+        
+        response = super().list(request, *args, **kwargs)
+        jobs_cache.set_page(cache_key, response.data)
+        response['X-Cache'] = 'MISS'
+        return response
+    
     def perform_create(self, serializer):
         # Only providers can create jobs
         if self.request.user.user_type != 'org_provider':
@@ -73,13 +118,20 @@ class JobListCreateView(generics.ListCreateAPIView):
                 status=status.HTTP_403_FORBIDDEN
             )
         serializer.save(created_by=self.request.user)
+        jobs_cache.invalidate()
+        jobs_cache.invalidate_provider_stats(self.request.user.id)
 
 
 class JobDetailView(generics.RetrieveUpdateDestroyAPIView):
     """Get, update or delete a specific job"""
-    queryset = Job.objects.all()
     permission_classes = [IsAuthenticatedOrReadOnly]
     
+    def get_queryset(self):
+        queryset = Job.objects.select_related('created_by')
+        if self.request.method == 'GET':
+            queryset = annotate_user_job_flags(queryset, self.request.user)
+        return queryset
+    
     def get_serializer_class(self):
         if self.request.method in ['PUT', 'PATCH']:
             return JobCreateUpdateSerializer
@@ -96,6 +148,11 @@ class JobDetailView(generics.RetrieveUpdateDestroyAPIView):
         kwargs['partial'] = True
         return super().update(request, *args, **kwargs)
     
+    def perform_update(self, serializer):
+        job = serializer.save()
+        jobs_cache.invalidate()
+        jobs_cache.invalidate_provider_stats(job.created_by_id)
+    
     def destroy(self, request, *args, **kwargs):
         job = self.get_object()
         if job.created_by != request.user:
@@ -104,6 +161,12 @@ class JobDetailView(generics.RetrieveUpdateDestroyAPIView):
                 status=status.HTTP_403_FORBIDDEN
             )
         return super().destroy(request, *args, **kwargs)
+    
+    def perform_destroy(self, instance):
+        provider_id = instance.created_by_id
+        instance.delete()
+        jobs_cache.invalidate()
+        jobs_cache.invalidate_provider_stats(provider_id)
 
 
 class ApplicationCreateView(generics.CreateAPIView):
@@ -118,15 +181,22 @@ class ApplicationCreateView(generics.CreateAPIView):
                 status=status.HTTP_403_FORBIDDEN
             )
         return super().create(request, *args, **kwargs)
+    
+    def perform_create(self, serializer):
+        with transaction.atomic():
+            application = serializer.save()
+            Job.adjust_applications_count(application.job_id, 1)
+        jobs_cache.invalidate_provider_stats(application.job.created_by_id)
 
 
-class UserApplicationListView(generics.ListAPIView):
+class UserApplicationListView(SparseFieldsViewMixin, CursorPaginationOptInMixin, generics.ListAPIView):
     """List all applications for the current user"""
     serializer_class = ApplicationSerializer
     permission_classes = [IsAuthenticated]
+    cursor_pagination_class = ApplicationCursorPagination
     
     def get_queryset(self):
-        return Application.objects.filter(applicant=self.request.user)
+        return select_application_graph(Application.objects.filter(applicant=self.request.user))
 
 
 class ApplicationDetailView(generics.RetrieveDestroyAPIView):
@@ -135,7 +205,7 @@ class ApplicationDetailView(generics.RetrieveDestroyAPIView):
     permission_classes = [IsAuthenticated, IsApplicationOwner]
     
     def get_queryset(self):
-        return Application.objects.filter(applicant=self.request.user)
+        return select_application_graph(Application.objects.filter(applicant=self.request.user))
     
     def destroy(self, request, *args, **kwargs):
         application = self.get_object()
@@ -145,6 +215,14 @@ class ApplicationDetailView(generics.RetrieveDestroyAPIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         return super().destroy(request, *args, **kwargs)
+    
+    def perform_destroy(self, instance):
+        provider_id = instance.job.created_by_id
+        with transaction.atomic():
+            job_id = instance.job_id
+            instance.delete()
+            Job.adjust_applications_count(job_id, -1)
+        jobs_cache.invalidate_provider_stats(provider_id)
 
 
 class ApplicationStatusUpdateView(generics.UpdateAPIView):
@@ -161,24 +239,32 @@ class ApplicationStatusUpdateView(generics.UpdateAPIView):
                 status=status.HTTP_403_FORBIDDEN
             )
         return super().update(request, *args, **kwargs)
+    
+    def perform_update(self, serializer):
+        application = serializer.save()
+        jobs_cache.invalidate_provider_stats(application.job.created_by_id)
 
 
-class ProviderJobListView(generics.ListAPIView):
+class ProviderJobListView(SparseFieldsViewMixin, generics.ListAPIView):
     """List all jobs created by the provider"""
     serializer_class = JobListSerializer
     permission_classes = [IsAuthenticated, IsJobProvider]
     
     def get_queryset(self):
-        return Job.objects.filter(created_by=self.request.user)
+        queryset = defer_job_list_fields(Job.objects.filter(created_by=self.request.user).select_related('created_by'))
+        return annotate_user_job_flags(queryset, self.request.user)
 
 
-class ProviderApplicantListView(generics.ListAPIView):
+class ProviderApplicantListView(SparseFieldsViewMixin, CursorPaginationOptInMixin, generics.ListAPIView):
     """List all applicants for provider's jobs"""
     serializer_class = ApplicationSerializer
     permission_classes = [IsAuthenticated, IsJobProvider]
+    cursor_pagination_class = ApplicationCursorPagination
     
     def get_queryset(self):
-        queryset = Application.objects.filter(job__created_by=self.request.user)
+        queryset = select_application_graph(
+            Application.objects.filter(job__created_by=self.request.user)
+        )
         
         # Filter by job
         job_id = self.request.query_params.get('job_id')
@@ -193,13 +279,53 @@ class ProviderApplicantListView(generics.ListAPIView):
         return queryset
 
 
+class ProviderStatsView(APIView):
+    """Aggregated application stats for the provider's dashboard"""
+    permission_classes = [IsAuthenticated, IsJobProvider]
+    default_days = 30
+    max_days = 365
+    
+    def get(self, request):
+        try:
+            days = int(request.query_params.get('days', self.default_days))
+        except ValueError:
+            return Response(
+                {"error": "days must be an integer."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        days = min(max(days, 1), self.max_days)
+        
+        if not jobs_cache.provider_stats_enabled():
+            return Response(build_provider_stats(request.user, days))
+        
+        stats = jobs_cache.get_provider_stats(request.user.id, days)
+        if stats is None:
+            stats = build_provider_stats(request.user, days)
+            jobs_cache.set_provider_stats(request.user.id, days, stats)
+        return Response(stats)
+
+
+class JobListCacheStatsView(APIView):
+    """Hit/miss counters of the anonymous job list cache; DELETE resets them (staff only)"""
+    permission_classes = [IsAuthenticated, IsAdminUser]
+    
+    def get(self, request):
+        return Response(jobs_cache.get_stats())
+    
+    def delete(self, request):
+        jobs_cache.reset_stats()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
 class SavedJobListCreateView(generics.ListCreateAPIView):
     """List or create saved jobs"""
     serializer_class = SavedJobSerializer
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
-        return SavedJob.objects.filter(user=self.request.user)
+        return defer_job_list_fields(
+            SavedJob.objects.filter(user=self.request.user).select_related('job__created_by'), 'job__'
+        )
     
     def create(self, request, *args, **kwargs):
         job_id = request.data.get('job')
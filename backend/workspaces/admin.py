@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import CloudCredential, Workspace
+from .models import CloudCredential, Workspace, WorkspaceEvent, WorkspaceTask, BundleCatalog, WorkerLease
 
 
 @admin.register(CloudCredential)
@@ -17,3 +17,31 @@ class WorkspaceAdmin(admin.ModelAdmin):
     search_fields = ['workspace_id', 'application__applicant__email', 'application__job__title']
     readonly_fields = ['created_at', 'updated_at']
 
+
+
+@admin.register(WorkspaceEvent)
+class WorkspaceEventAdmin(admin.ModelAdmin):
+    list_display = ['id', 'workspace', 'previous_state', 'state', 'created_at']
+    list_filter = ['state']
+    search_fields = ['workspace__workspace_id']
+    readonly_fields = ['created_at']
+
+
+@admin.register(WorkspaceTask)
+class WorkspaceTaskAdmin(admin.ModelAdmin):
+    list_display = ['id', 'task_type', 'workspace', 'cloud_credential', 'status', 'next_attempt_at', 'locked_by']
+    list_filter = ['task_type', 'status']
+    search_fields = ['workspace__workspace_id', 'locked_by']
+    readonly_fields = ['created_at', 'updated_at']
+
+
+@admin.register(BundleCatalog)
+class BundleCatalogAdmin(admin.ModelAdmin):
+    list_display = ['cloud_provider', 'region', 'fetched_at', 'refresh_requested_at', 'updated_at']
+    list_filter = ['cloud_provider']
+    readonly_fields = ['updated_at']
+
+
+@admin.register(WorkerLease)
+class WorkerLeaseAdmin(admin.ModelAdmin):
+    list_display = ['name', 'held_by', 'expires_at']
@@ -0,0 +1,129 @@
+"""
+Async DRF views for endpoints that wait on cloud provider APIs
+
+DRF 3.14 only dispatches sync views. ``async_api_view`` is ``@api_view`` for
+``async def`` views: authentication and permission checks run through
+``sync_to_async``, ORM work goes through ``run_db`` and SDK calls through
+``run_cloud_call``. SDK calls run in one bounded thread pool per process
+(WORKSPACE_CLOUD_EXECUTOR_WORKERS), so many slow AWS/Azure round trips can be
+in flight without a server thread, or a pooled database connection, held for
+each of them.
+
+Under ASGI (``config.asgi``) these views run on the event loop. Under WSGI,
+Django runs them through ``async_to_sync``, so they work unchanged with
+``runserver``.
+"""
+
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from asgiref.sync import markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import close_old_connections, connection
+from rest_framework.views import APIView
+
+_executor = {'pid': None, 'pool': None}
+_executor_lock = threading.Lock()
+
+
+def get_cloud_executor() -> ThreadPoolExecutor:
+    """Thread pool for SDK calls, created on first use in each process"""
+    with _executor_lock:
+        if _executor['pid'] != os.getpid():
+            _executor['pool'] = ThreadPoolExecutor(
+                max_workers=settings.WORKSPACE_CLOUD_EXECUTOR_WORKERS,
+                thread_name_prefix='cloud-call'
+            )
+            _executor['pid'] = os.getpid()
+        return _executor['pool']
+
+
+async def run_cloud_call(fn, *args, **kwargs):
+    """Run a blocking SDK call on the cloud executor; it must not use the database"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_cloud_executor(), functools.partial(fn, *args, **kwargs))
+
+
+async def run_service_call(service_class, credential, method: str, *args, **kwargs):
+    """``service_class.for_credential(credential).<method>(...)`` on the cloud executor"""
+    def call():
+        return getattr(service_class.for_credential(credential), method)(*args, **kwargs)
+    return await run_cloud_call(call)
+
+
+async def run_db(fn, *args, **kwargs):
+    """
+    Run ORM work in the request's thread
+
+    The connection is then released as at the end of a request (returned to
+    the pool when DB_POOL_SIZE is set), so it is not held while the view awaits
+    a cloud call. Inside a transaction, e.g. in tests, it is kept.
+    """
+    def call():
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            release_connections()
+    return await sync_to_async(call)()
+
+
+def release_connections() -> None:
+    """Close (or return to the pool) this thread's connections as at the end of a request, outside transactions"""
+    if not connection.in_atomic_block:
+        close_old_connections()
+
+
+class AsyncAPIView(APIView):
+    """APIView whose handlers may be coroutines"""
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        # csrf_exempt wraps the view in a plain function; mark it so Django awaits it
+        return markcoroutinefunction(view)
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            # Authentication loads the user from the database
+            await run_db(self.initial, request, *args, **kwargs)
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+            response = handler(request, *args, **kwargs)
+            if asyncio.iscoroutine(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
+def async_api_view(http_method_names):
+    """``@api_view`` for ``async def`` views; combine with DRF's ``@permission_classes`` etc."""
+    def decorator(func):
+        attrs = {
+            '__doc__': func.__doc__,
+            'http_method_names': [method.lower() for method in http_method_names] + ['options'],
+        }
+        for method in http_method_names:
+            attrs[method.lower()] = lambda self, *args, **kwargs: func(*args, **kwargs)
+        for name in ('renderer_classes', 'parser_classes', 'authentication_classes',
+                     'throttle_classes', 'permission_classes'):
+            if hasattr(func, name):
+                attrs[name] = getattr(func, name)
+
+        view_class = type(func.__name__, (AsyncAPIView,), attrs)
+        view_class.__qualname__ = func.__qualname__
+        view_class.__module__ = func.__module__
+        return view_class.as_view()
+    return decorator
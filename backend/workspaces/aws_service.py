@@ -5,20 +5,41 @@ Handles all interactions with AWS WorkSpaces API
 
 import boto3
 from botocore.exceptions import ClientError
+from .clients import get_aws_client
+from . import ratelimit
+
+# Maximum number of WorkspaceIds accepted by a single DescribeWorkspaces request
+DESCRIBE_BATCH_SIZE = 25
+# Maximum number of workspaces accepted by a single CreateWorkspaces request
+CREATE_BATCH_SIZE = 25
+# Maximum number of workspaces per Start/Stop/Reboot/TerminateWorkspaces request
+ACTION_BATCH_SIZE = 25
 
 
 class AWSWorkSpacesService:
     """Service class for AWS WorkSpaces operations"""
     
-    def __init__(self, access_key, secret_key, region):
-        """Initialize AWS client with provider-specific credentials"""
-        self.client = boto3.client(
-            'workspaces',
-            aws_access_key_id=access_key,
-            aws_secret_access_key=secret_key,
-            region_name=region
-        )
-        self.region = region
+    def __init__(self, access_key=None, secret_key=None, region=None, client=None, credential_id=None):
+        """Initialize AWS client with provider-specific credentials, or wrap an existing client"""
+        if client is None:
+            client = boto3.client(
+                'workspaces',
+                aws_access_key_id=access_key,
+                aws_secret_access_key=secret_key,
+                region_name=region
+            )
+        self.client = client
+        self.region = region or client.meta.region_name
+        self.credential_id = credential_id
+    
+    @classmethod
+    def for_credential(cls, credential):
+        """Service backed by the shared client pool (see workspaces.clients)"""
+        return cls(region=credential.region, client=get_aws_client(credential), credential_id=credential.pk)
+    
+    def _call(self, operation, fn, **kwargs):
+        """Make an API call through the credential's adaptive rate limiter (see workspaces.ratelimit)"""
+        return ratelimit.call('aws', self.credential_id, operation, fn, scope=self.region, **kwargs)
     
     def create_workspace(self, directory_id, username, bundle_id, tags=None):
         """
@@ -34,31 +55,59 @@ class AWSWorkSpacesService:
             dict: WorkSpace creation response
         """
         try:
-            workspace_request = {
-                'DirectoryId': directory_id,
-                'UserName': username,
-                'BundleId': bundle_id,
-                'WorkspaceProperties': {
-                    'RunningMode': 'AUTO_STOP',
-                    'RunningModeAutoStopTimeoutInMinutes': 60
-                }
-            }
-            
-            if tags:
-                workspace_request['Tags'] = tags
+            workspace_request = self.build_workspace_request(directory_id, username, bundle_id, tags)
             
-            response = self.client.create_workspaces(
+            response = self._call('CreateWorkspaces', self.client.create_workspaces,
                 Workspaces=[workspace_request]
             )
             
             return response
         except ClientError as e:
-            raise Exception(f"Failed to create workspace: {str(e)}")
+            raise Exception(f"Failed to create workspace: {str(e)}") from e
+    
+    @staticmethod
+    def build_workspace_request(directory_id, username, bundle_id, tags=None):
+        """Build one entry of the CreateWorkspaces ``Workspaces`` list"""
+        workspace_request = {
+            'DirectoryId': directory_id,
+            'UserName': username,
+            'BundleId': bundle_id,
+            'WorkspaceProperties': {
+                'RunningMode': 'AUTO_STOP',
+                'RunningModeAutoStopTimeoutInMinutes': 60
+            }
+        }
+        
+        if tags:
+            workspace_request['Tags'] = tags
+        return workspace_request
+    
+    def create_workspaces(self, workspace_requests):
+        """
+        Create many WorkSpaces, sending up to 25 per CreateWorkspaces request
+        
+        Args:
+            workspace_requests: Entries built with build_workspace_request
+        
+        Returns:
+            dict: Merged 'PendingRequests' and 'FailedRequests' of all batches
+        """
+        result = {'PendingRequests': [], 'FailedRequests': []}
+        try:
+            for start in range(0, len(workspace_requests), CREATE_BATCH_SIZE):
+                response = self._call('CreateWorkspaces', self.client.create_workspaces,
+                    Workspaces=workspace_requests[start:start + CREATE_BATCH_SIZE]
+                )
+                result['PendingRequests'].extend(response.get('PendingRequests', []))
+                result['FailedRequests'].extend(response.get('FailedRequests', []))
+            return result
+        except ClientError as e:
+            raise Exception(f"Failed to create workspaces: {str(e)}") from e
     
     def get_workspace(self, workspace_id):
         """Get workspace details"""
         try:
-            response = self.client.describe_workspaces(
+            response = self._call('DescribeWorkspaces', self.client.describe_workspaces,
                 WorkspaceIds=[workspace_id]
             )
             
@@ -66,55 +115,111 @@ class AWSWorkSpacesService:
                 return response['Workspaces'][0]
             return None
         except ClientError as e:
-            raise Exception(f"Failed to get workspace: {str(e)}")
+            raise Exception(f"Failed to get workspace: {str(e)}") from e
+    
+    def describe_workspaces(self, workspace_ids):
+        """
+        Get details of many workspaces, batching IDs per API request
+        
+        Args:
+            workspace_ids: WorkSpace IDs to describe
+        
+        Returns:
+            dict: WorkSpace details keyed by WorkspaceId (unknown IDs are omitted)
+        """
+        workspaces = {}
+        workspace_ids = list(workspace_ids)
+        try:
+            for start in range(0, len(workspace_ids), DESCRIBE_BATCH_SIZE):
+                batch = workspace_ids[start:start + DESCRIBE_BATCH_SIZE]
+                request = {'WorkspaceIds': batch}
+                while True:
+                    response = self._call('DescribeWorkspaces', self.client.describe_workspaces, **request)
+                    for workspace in response.get('Workspaces', []):
+                        workspaces[workspace['WorkspaceId']] = workspace
+                    if not response.get('NextToken'):
+                        break
+                    request['NextToken'] = response['NextToken']
+            return workspaces
+        except ClientError as e:
+            raise Exception(f"Failed to describe workspaces: {str(e)}") from e
     
     def start_workspace(self, workspace_id):
         """Start a stopped workspace"""
         try:
-            response = self.client.start_workspaces(
+            response = self._call('StartWorkspaces', self.client.start_workspaces,
                 StartWorkspaceRequests=[
                     {'WorkspaceId': workspace_id}
                 ]
             )
             return response
         except ClientError as e:
-            raise Exception(f"Failed to start workspace: {str(e)}")
+            raise Exception(f"Failed to start workspace: {str(e)}") from e
     
     def stop_workspace(self, workspace_id):
         """Stop a running workspace"""
         try:
-            response = self.client.stop_workspaces(
+            response = self._call('StopWorkspaces', self.client.stop_workspaces,
                 StopWorkspaceRequests=[
                     {'WorkspaceId': workspace_id}
                 ]
             )
             return response
         except ClientError as e:
-            raise Exception(f"Failed to stop workspace: {str(e)}")
+            raise Exception(f"Failed to stop workspace: {str(e)}") from e
     
     def reboot_workspace(self, workspace_id):
         """Reboot a workspace"""
         try:
-            response = self.client.reboot_workspaces(
+            response = self._call('RebootWorkspaces', self.client.reboot_workspaces,
                 RebootWorkspaceRequests=[
                     {'WorkspaceId': workspace_id}
                 ]
             )
             return response
         except ClientError as e:
-            raise Exception(f"Failed to reboot workspace: {str(e)}")
+            raise Exception(f"Failed to reboot workspace: {str(e)}") from e
     
     def terminate_workspace(self, workspace_id):
         """Terminate a workspace"""
         try:
-            response = self.client.terminate_workspaces(
+            response = self._call('TerminateWorkspaces', self.client.terminate_workspaces,
                 TerminateWorkspaceRequests=[
                     {'WorkspaceId': workspace_id}
                 ]
             )
             return response
         except ClientError as e:
-            raise Exception(f"Failed to terminate workspace: {str(e)}")
+            raise Exception(f"Failed to terminate workspace: {str(e)}") from e
+    
+    def start_workspaces(self, workspace_ids):
+        """Start many workspaces; return {WorkspaceId: error message} for those AWS rejected"""
+        return self._batch_action('StartWorkspaces', self.client.start_workspaces, 'StartWorkspaceRequests', workspace_ids)
+    
+    def stop_workspaces(self, workspace_ids):
+        """Stop many workspaces; return {WorkspaceId: error message} for those AWS rejected"""
+        return self._batch_action('StopWorkspaces', self.client.stop_workspaces, 'StopWorkspaceRequests', workspace_ids)
+    
+    def reboot_workspaces(self, workspace_ids):
+        """Reboot many workspaces; return {WorkspaceId: error message} for those AWS rejected"""
+        return self._batch_action('RebootWorkspaces', self.client.reboot_workspaces, 'RebootWorkspaceRequests', workspace_ids)
+    
+    def terminate_workspaces(self, workspace_ids):
+        """Terminate many workspaces; return {WorkspaceId: error message} for those AWS rejected"""
+        return self._batch_action('TerminateWorkspaces', self.client.terminate_workspaces, 'TerminateWorkspaceRequests', workspace_ids)
+    
+    def _batch_action(self, operation, fn, request_key, workspace_ids):
+        failed = {}
+        workspace_ids = list(workspace_ids)
+        try:
+            for start in range(0, len(workspace_ids), ACTION_BATCH_SIZE):
+                batch = workspace_ids[start:start + ACTION_BATCH_SIZE]
+                response = self._call(operation, fn, **{request_key: [{'WorkspaceId': workspace_id} for workspace_id in batch]})
+                for item in response.get('FailedRequests', []):
+                    failed[item.get('WorkspaceId')] = item.get('ErrorMessage') or item.get('ErrorCode') or 'Request failed'
+            return failed
+        except ClientError as e:
+            raise Exception(f"Failed to call {operation}: {str(e)}") from e
     
     def get_connection_info(self, workspace_id):
         """Get connection information for a workspace"""
@@ -130,15 +235,21 @@ class AWSWorkSpacesService:
                 }
             return None
         except Exception as e:
-            raise Exception(f"Failed to get connection info: {str(e)}")
+            raise Exception(f"Failed to get connection info: {str(e)}") from e
     
-    def list_bundles(self):
-        """List available WorkSpace bundles"""
+    def list_bundles(self, owner='AMAZON'):
+        """List available WorkSpace bundles, following NextToken across all pages"""
         try:
-            response = self.client.describe_workspace_bundles(Owner='AMAZON')
-            return response.get('Bundles', [])
+            bundles = []
+            request = {'Owner': owner}
+            while True:
+                response = self._call('DescribeWorkspaceBundles', self.client.describe_workspace_bundles, **request)
+                bundles.extend(response.get('Bundles', []))
+                if not response.get('NextToken'):
+                    return bundles
+                request['NextToken'] = response['NextToken']
         except ClientError as e:
-            raise Exception(f"Failed to list bundles: {str(e)}")
+            raise Exception(f"Failed to list bundles: {str(e)}") from e
     
     def test_credentials(self, directory_id):
         """Test if credentials are valid"""
@@ -149,7 +260,7 @@ class AWSWorkSpacesService:
             
             # Try to describe workspaces in the directory
             # This tests both credentials and directory access
-            response = self.client.describe_workspaces(
+            response = self._call('DescribeWorkspaces', self.client.describe_workspaces,
                 DirectoryId=directory_id,
                 Limit=1  # Just need to verify access
             )
@@ -163,13 +274,13 @@ class AWSWorkSpacesService:
             
             # Re-raise with more specific error message
             if error_code == 'InvalidParameterValue':
-                raise Exception(f"Invalid directory ID or region: {error_message}")
+                raise Exception(f"Invalid directory ID or region: {error_message}") from e
             elif error_code in ['UnauthorizedOperation', 'AccessDenied']:
-                raise Exception(f"Access denied. Please ensure your IAM user has 'workspaces:Describe*' permissions: {error_message}")
+                raise Exception(f"Access denied. Please ensure your IAM user has 'workspaces:Describe*' permissions: {error_message}") from e
             elif error_code in ['AuthFailure', 'SignatureDoesNotMatch']:
-                raise Exception(f"Invalid AWS credentials (access key or secret key): {error_message}")
+                raise Exception(f"Invalid AWS credentials (access key or secret key): {error_message}") from e
             else:
-                raise Exception(f"AWS API error ({error_code}): {error_message}")
+                raise Exception(f"AWS API error ({error_code}): {error_message}") from e
         
         except ValueError as e:
             # Re-raise validation errors
@@ -178,6 +289,6 @@ class AWSWorkSpacesService:
         except Exception as e:
             # Catch any other errors
             if "Could not connect to the endpoint URL" in str(e):
-                raise Exception(f"Invalid region or network error. Please check your region setting.")
-            raise Exception(f"Unexpected error: {str(e)}")
+                raise Exception(f"Invalid region or network error. Please check your region setting.") from e
+            raise Exception(f"Unexpected error: {str(e)}") from e
 
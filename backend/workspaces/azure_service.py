@@ -6,27 +6,46 @@ Handles all interactions with Azure Virtual Desktop API
 from azure.identity import ClientSecretCredential
 from azure.mgmt.desktopvirtualization import DesktopVirtualizationMgmtClient
 from azure.core.exceptions import AzureError
+from .clients import get_azure_client
+from . import ratelimit
 
 
 class AzureVirtualDesktopService:
     """Service class for Azure Virtual Desktop operations"""
     
-    def __init__(self, client_id, client_secret, tenant_id, subscription_id, resource_group):
-        """Initialize Azure client with provider-specific credentials"""
+    def __init__(self, client_id=None, client_secret=None, tenant_id=None, subscription_id=None, resource_group=None, client=None, credential_id=None):
+        """Initialize Azure client with provider-specific credentials, or wrap an existing client"""
         self.subscription_id = subscription_id
         self.resource_group = resource_group
+        self.credential_id = credential_id
         
-        credential = ClientSecretCredential(
-            tenant_id=tenant_id,
-            client_id=client_id,
-            client_secret=client_secret
-        )
-        
-        self.client = DesktopVirtualizationMgmtClient(
-            credential=credential,
-            subscription_id=subscription_id
+        if client is None:
+            credential = ClientSecretCredential(
+                tenant_id=tenant_id,
+                client_id=client_id,
+                client_secret=client_secret
+            )
+            
+            client = DesktopVirtualizationMgmtClient(
+                credential=credential,
+                subscription_id=subscription_id
+            )
+        self.client = client
+    
+    @classmethod
+    def for_credential(cls, credential):
+        """Service backed by the shared client pool (see workspaces.clients)"""
+        return cls(
+            subscription_id=credential.subscription_id,
+            resource_group=credential.resource_group,
+            client=get_azure_client(credential),
+            credential_id=credential.pk
         )
     
+    def _call(self, operation, fn, **kwargs):
+        """Make an API call through the credential's adaptive rate limiter (see workspaces.ratelimit)"""
+        return ratelimit.call('azure', self.credential_id, operation, fn, scope=self.subscription_id, **kwargs)
+    
     def create_session_host(self, host_pool_name, vm_name, vm_size='Standard_D2s_v3', username=None):
         """
         Create a new session host (virtual machine) in a host pool
@@ -51,13 +70,13 @@ class AzureVirtualDesktopService:
             
             # Check if host pool exists
             try:
-                host_pool = self.client.host_pools.get(
+                host_pool = self._call('HostPools.Get', self.client.host_pools.get,
                     resource_group_name=self.resource_group,
                     host_pool_name=host_pool_name
                 )
             except AzureError as e:
                 if "ResourceNotFound" in str(e):
-                    raise Exception(f"Host pool '{host_pool_name}' not found in resource group '{self.resource_group}'")
+                    raise Exception(f"Host pool '{host_pool_name}' not found in resource group '{self.resource_group}'") from e
                 raise e
             
             # Generate a unique session host name
@@ -83,19 +102,19 @@ class AzureVirtualDesktopService:
             return response
             
         except AzureError as e:
-            raise Exception(f"Failed to create session host: {str(e)}")
+            raise Exception(f"Failed to create session host: {str(e)}") from e
     
     def get_session_host(self, host_pool_name, session_host_name):
         """Get session host details"""
         try:
-            response = self.client.session_hosts.get(
+            response = self._call('SessionHosts.Get', self.client.session_hosts.get,
                 resource_group_name=self.resource_group,
                 host_pool_name=host_pool_name,
                 session_host_name=session_host_name
             )
             return response
         except AzureError as e:
-            raise Exception(f"Failed to get session host: {str(e)}")
+            raise Exception(f"Failed to get session host: {str(e)}") from e
     
     def start_session_host(self, vm_name):
         """Start a stopped session host"""
@@ -106,7 +125,7 @@ class AzureVirtualDesktopService:
                 'vm_name': vm_name
             }
         except AzureError as e:
-            raise Exception(f"Failed to start session host: {str(e)}")
+            raise Exception(f"Failed to start session host: {str(e)}") from e
     
     def stop_session_host(self, vm_name):
         """Stop a running session host"""
@@ -117,19 +136,19 @@ class AzureVirtualDesktopService:
                 'vm_name': vm_name
             }
         except AzureError as e:
-            raise Exception(f"Failed to stop session host: {str(e)}")
+            raise Exception(f"Failed to stop session host: {str(e)}") from e
     
     def delete_session_host(self, host_pool_name, session_host_name):
         """Delete a session host"""
         try:
-            self.client.session_hosts.delete(
+            self._call('SessionHosts.Delete', self.client.session_hosts.delete,
                 resource_group_name=self.resource_group,
                 host_pool_name=host_pool_name,
                 session_host_name=session_host_name
             )
             return {'status': 'deleted'}
         except AzureError as e:
-            raise Exception(f"Failed to delete session host: {str(e)}")
+            raise Exception(f"Failed to delete session host: {str(e)}") from e
     
     def get_connection_info(self, session_host_name):
         """Get connection information for a session host"""
@@ -140,26 +159,27 @@ class AzureVirtualDesktopService:
                 'rdp_available': True
             }
         except Exception as e:
-            raise Exception(f"Failed to get connection info: {str(e)}")
+            raise Exception(f"Failed to get connection info: {str(e)}") from e
     
     def list_host_pools(self):
         """List available host pools"""
         try:
-            response = self.client.host_pools.list_by_resource_group(
-                resource_group_name=self.resource_group
-            )
-            return list(response)
+            # Pages are fetched while iterating, so the whole listing is one limited call
+            return self._call('HostPools.ListByResourceGroup', self._list_host_pools)
         except AzureError as e:
-            raise Exception(f"Failed to list host pools: {str(e)}")
+            raise Exception(f"Failed to list host pools: {str(e)}") from e
+    
+    def _list_host_pools(self):
+        return list(self.client.host_pools.list_by_resource_group(
+            resource_group_name=self.resource_group
+        ))
     
     def test_credentials(self):
         """Test if credentials are valid"""
         try:
             # Try to list host pools in the resource group
             # This tests both credentials and resource group access
-            host_pools = list(self.client.host_pools.list_by_resource_group(
-                resource_group_name=self.resource_group
-            ))
+            host_pools = self._call('HostPools.ListByResourceGroup', self._list_host_pools)
             
             # If we get here, credentials are valid
             return True
@@ -169,18 +189,18 @@ class AzureVirtualDesktopService:
             
             # Provide more specific error messages
             if "AuthenticationFailed" in error_message:
-                raise Exception(f"Invalid Azure credentials: {error_message}")
+                raise Exception(f"Invalid Azure credentials: {error_message}") from e
             elif "InvalidAuthenticationTokenTenant" in error_message:
-                raise Exception(f"Invalid tenant ID: {error_message}")
+                raise Exception(f"Invalid tenant ID: {error_message}") from e
             elif "SubscriptionNotFound" in error_message:
-                raise Exception(f"Subscription ID not found or not accessible: {error_message}")
+                raise Exception(f"Subscription ID not found or not accessible: {error_message}") from e
             elif "ResourceGroupNotFound" in error_message:
-                raise Exception(f"Resource group '{self.resource_group}' not found: {error_message}")
+                raise Exception(f"Resource group '{self.resource_group}' not found: {error_message}") from e
             elif "AuthorizationFailed" in error_message:
-                raise Exception(f"Access denied. Please ensure your service principal has 'Desktop Virtualization Reader' role: {error_message}")
+                raise Exception(f"Access denied. Please ensure your service principal has 'Desktop Virtualization Reader' role: {error_message}") from e
             else:
-                raise Exception(f"Azure API error: {error_message}")
+                raise Exception(f"Azure API error: {error_message}") from e
         
         except Exception as e:
-            raise Exception(f"Unexpected error testing Azure credentials: {str(e)}")
+            raise Exception(f"Unexpected error testing Azure credentials: {str(e)}") from e
 
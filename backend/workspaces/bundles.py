@@ -0,0 +1,104 @@
+"""
+Cached bundle catalog
+
+Bundle lists change rarely, so they are stored per (provider, region) in
+``BundleCatalog`` and served from the table. A catalog older than
+``BUNDLE_CATALOG_TTL`` is still served while a ``refresh_bundles`` task fetches
+a fresh copy in the background (stale-while-revalidate); only a region that
+has never been fetched is loaded synchronously. ``aget_bundle_catalog`` is the
+variant for async views: that first fetch runs on the cloud executor, with no
+database connection held meanwhile.
+
+Background refreshes are ``WorkspaceTask`` rows, run only while
+``run_workspace_workers`` is up. Without it a stale catalog keeps being served
+(with ``metadata.stale`` set in the API response) until a worker runs.
+"""
+
+import logging
+from datetime import timedelta
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from .async_api import run_cloud_call, run_db
+from .models import BundleCatalog, CloudCredential, WorkspaceTask
+from .queue import enqueue
+from .tasks import BundleManager
+
+logger = logging.getLogger(__name__)
+
+# A refresh requested longer ago than this is assumed lost and may be requested again
+REFRESH_RETRY_AFTER = timedelta(minutes=5)
+
+
+def get_bundle_catalog(credential: CloudCredential) -> BundleCatalog:
+    """Catalog for the credential's provider and region, fetching it only if it was never loaded"""
+    catalog = _get_catalog(credential)
+    if catalog.fetched_at is None:
+        return refresh_bundle_catalog(catalog, credential)
+    return catalog
+
+
+async def aget_bundle_catalog(credential: CloudCredential) -> BundleCatalog:
+    """Async ``get_bundle_catalog``"""
+    catalog = await run_db(_get_catalog, credential)
+    if catalog.fetched_at is None:
+        try:
+            bundles = await run_cloud_call(BundleManager.fetch_bundles, credential)
+        except Exception as e:
+            await run_db(_record_error, catalog, e)
+            raise
+        catalog = await run_db(_store_bundles, catalog, bundles)
+    return catalog
+
+
+def refresh_bundle_catalog(catalog: BundleCatalog, credential: CloudCredential) -> BundleCatalog:
+    """Fetch the bundle list live and store it in the catalog"""
+    try:
+        bundles = BundleManager.fetch_bundles(credential)
+    except Exception as e:
+        _record_error(catalog, e)
+        raise
+    return _store_bundles(catalog, bundles)
+
+
+def _get_catalog(credential: CloudCredential) -> BundleCatalog:
+    # A new catalog is created empty; a stale one gets a background refresh
+    catalog, _ = BundleCatalog.objects.get_or_create(
+        cloud_provider=credential.cloud_provider,
+        region=credential.region
+    )
+    if catalog.fetched_at is not None and catalog.is_stale(settings.BUNDLE_CATALOG_TTL):
+        _schedule_refresh(catalog, credential)
+    return catalog
+
+
+def _record_error(catalog: BundleCatalog, error: Exception) -> None:
+    BundleCatalog.objects.filter(pk=catalog.pk).update(last_error=str(error), updated_at=timezone.now())
+
+
+def _store_bundles(catalog: BundleCatalog, bundles: list) -> BundleCatalog:
+    catalog.bundles = bundles
+    catalog.bundle_ids = [bundle['bundle_id'] for bundle in bundles]
+    catalog.fetched_at = timezone.now()
+    catalog.refresh_requested_at = None
+    catalog.last_error = ''
+    catalog.save()
+    catalog.__dict__.pop('bundle_id_set', None)
+    logger.info(f"Refreshed {catalog.cloud_provider} bundle catalog for {catalog.region} ({len(bundles)} bundles)")
+    return catalog
+
+
+def _schedule_refresh(catalog: BundleCatalog, credential: CloudCredential) -> None:
+    now = timezone.now()
+    # Conditional UPDATE so concurrent readers of a stale catalog queue a single refresh
+    claimed = BundleCatalog.objects.filter(pk=catalog.pk).filter(
+        Q(refresh_requested_at__isnull=True) | Q(refresh_requested_at__lt=now - REFRESH_RETRY_AFTER)
+    ).update(refresh_requested_at=now)
+    if claimed:
+        enqueue('refresh_bundles', cloud_credential=credential, payload={'catalog_id': catalog.pk})
+
+
+def refresh_bundles_task(task: WorkspaceTask) -> None:
+    """Worker handler for 'refresh_bundles' tasks"""
+    catalog = BundleCatalog.objects.get(pk=task.payload['catalog_id'])
+    refresh_bundle_catalog(catalog, task.cloud_credential)
@@ -0,0 +1,98 @@
+"""
+Process-wide pool of cloud SDK clients
+
+Building a boto3 or Azure management client costs tens of milliseconds and
+opens a fresh connection pool, so clients are cached per credential and shared
+by views and background workers. The cache key includes the credential's
+``updated_at``, so editing a credential switches to a new client.
+"""
+
+import logging
+import threading
+import time
+import boto3
+from azure.identity import ClientSecretCredential
+from azure.mgmt.desktopvirtualization import DesktopVirtualizationMgmtClient
+from django.conf import settings
+from .lru import TTLLRUCache
+
+logger = logging.getLogger(__name__)
+
+_pool = TTLLRUCache(settings.WORKSPACE_CLIENT_CACHE_SIZE, settings.WORKSPACE_CLIENT_CACHE_TTL)
+
+_construction_lock = threading.Lock()
+_construction = {'count': 0, 'total_seconds': 0.0, 'max_seconds': 0.0}
+
+
+def _credential_key(credential):
+    return (credential.cloud_provider, credential.pk, credential.updated_at, credential.region)
+
+
+def _timed(kind, build):
+    def factory():
+        started = time.perf_counter()
+        client = build()
+        elapsed = time.perf_counter() - started
+        with _construction_lock:
+            _construction['count'] += 1
+            _construction['total_seconds'] += elapsed
+            _construction['max_seconds'] = max(_construction['max_seconds'], elapsed)
+        logger.debug(f"Built {kind} client in {elapsed * 1000:.1f}ms")
+        return client
+    return factory
+
+
+def get_aws_client(credential):
+    """Shared boto3 WorkSpaces client for the credential"""
+    def build():
+        # boto3 sessions are not thread-safe, so every cached client gets its own
+        session = boto3.session.Session(
+            aws_access_key_id=credential.get_access_key(),
+            aws_secret_access_key=credential.get_secret_key(),
+            region_name=credential.region
+        )
+        return session.client('workspaces')
+
+    return _pool.get_or_create(_credential_key(credential), _timed('aws', build))
+
+
+def get_azure_client(credential):
+    """Shared Azure Desktop Virtualization client for the credential"""
+    def build():
+        azure_credential = ClientSecretCredential(
+            tenant_id=credential.tenant_id,
+            client_id=credential.get_access_key(),
+            client_secret=credential.get_secret_key()
+        )
+        return DesktopVirtualizationMgmtClient(
+            credential=azure_credential,
+            subscription_id=credential.subscription_id
+        )
+
+    return _pool.get_or_create(_credential_key(credential), _timed('azure', build))
+
+
+def invalidate_credential(credential_id: int) -> int:
+    """Drop cached clients of a credential (e.g. after it is edited or deleted)"""
+    return _pool.discard(lambda key: key[1] == credential_id)
+
+
+def get_stats() -> dict:
+    stats = _pool.stats()
+    with _construction_lock:
+        count = _construction['count']
+        stats.update({
+            'constructions': count,
+            'construction_seconds_total': round(_construction['total_seconds'], 4),
+            'construction_seconds_max': round(_construction['max_seconds'], 4),
+            'construction_seconds_avg': round(_construction['total_seconds'] / count, 4) if count else 0.0,
+        })
+    lookups = stats['hits'] + stats['misses']
+    stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+    return stats
+
+
+def reset_stats() -> None:
+    _pool.reset_stats()
+    with _construction_lock:
+        _construction.update({'count': 0, 'total_seconds': 0.0, 'max_seconds': 0.0})
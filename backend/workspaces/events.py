@@ -0,0 +1,241 @@
+"""
+Workspace state event stream (Server-Sent Events)
+
+State transitions are stored as ``WorkspaceEvent`` rows by whatever writes
+them (the status poller, creation tasks, lifecycle endpoints). Each open stream
+reads new rows for the user's workspaces from the table; a process-wide
+signature of the table keeps idle streams down to one aggregate query per
+``WORKSPACE_EVENT_POLL_INTERVAL`` per process, however many clients listen.
+
+IDs are assigned at insert, so an event can commit after one with a higher ID
+has been streamed. Each read therefore also re-checks the last
+``EVENT_REWIND_WINDOW`` seconds and skips the events it already sent. A
+resumed stream re-checks that window too, so a client may see an event again
+after reconnecting.
+
+Browsers open the stream with a single-use ``?ticket=`` from
+``issue_stream_ticket``, so access tokens stay out of URLs and access logs.
+
+The stream is async under ASGI (``config.asgi``). Under WSGI, e.g. ``runserver``
+during development, it would hold a worker for the whole stream, so each
+request makes one read and closes; the client reconnects after
+``RECONNECT_DELAY_MS``. Either way the database connection is released after
+every read, so an open stream does not hold a pooled connection between polls.
+"""
+
+import asyncio
+import json
+import secrets
+import threading
+import time
+from collections import deque
+from datetime import timedelta
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count, Max, Q
+from django.utils import timezone
+from rest_framework.authentication import BaseAuthentication
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.renderers import BaseRenderer
+from .async_api import release_connections, run_db
+from .models import EventStreamTicket, WorkspaceEvent
+
+# Milliseconds the browser waits before reconnecting a closed stream
+RECONNECT_DELAY_MS = 3000
+
+# Comment line sent when nothing happened for this long, so proxies keep the connection open
+HEARTBEAT_INTERVAL = 15
+
+# Events sent per read, so a client resuming after a long gap catches up in steps
+MAX_EVENTS_PER_READ = 100
+
+# Seconds an event may take to commit after insert and still be streamed (see module docstring)
+EVENT_REWIND_WINDOW = 30
+
+_table_state = {'state': None, 'checked_at': float('-inf'), 'samples': deque()}
+_table_state_lock = threading.Lock()
+
+
+class EventStreamRenderer(BaseRenderer):
+    """Lets content negotiation accept ``text/event-stream``; errors are rendered as JSON"""
+    media_type = 'text/event-stream'
+    format = 'event-stream'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return json.dumps(data, cls=DjangoJSONEncoder).encode()
+
+
+def issue_stream_ticket(user) -> str:
+    """New single-use stream ticket for ``user``, valid WORKSPACE_EVENT_TICKET_TTL seconds"""
+    now = timezone.now()
+    EventStreamTicket.objects.filter(user=user, expires_at__lt=now).delete()
+    key = secrets.token_urlsafe(32)
+    EventStreamTicket.objects.create(
+        key=key, user=user, expires_at=now + timedelta(seconds=settings.WORKSPACE_EVENT_TICKET_TTL)
+    )
+    return key
+
+
+class StreamTicketAuthentication(BaseAuthentication):
+    """``?ticket=`` from issue_stream_ticket, used up by the request it authenticates"""
+
+    def authenticate(self, request):
+        key = request.query_params.get('ticket')
+        if not key:
+            return None
+        ticket = EventStreamTicket.objects.select_related('user').filter(
+            key=key, expires_at__gte=timezone.now()
+        ).first()
+        # Deleting the row is the claim, so two requests cannot both use one ticket
+        if ticket is None or not EventStreamTicket.objects.filter(key=key).delete()[0]:
+            raise AuthenticationFailed('Invalid or expired stream ticket.')
+        if not ticket.user.is_active:
+            raise AuthenticationFailed('User is inactive.')
+        return ticket.user, None
+
+
+def latest_event_id() -> int:
+    return WorkspaceEvent.objects.aggregate(latest=Max('id'))['latest'] or 0
+
+
+def event_table_state(max_age: float = None):
+    """
+    Signature of the event table, re-read at most every ``max_age`` seconds (None while unknown)
+
+    Besides the highest ID it counts the events above the highest ID seen
+    EVENT_REWIND_WINDOW seconds ago, so it also changes when an event commits
+    behind an ID that was already visible. Until the process has such a sample
+    it returns None and streams read every time.
+    """
+    if max_age is None:
+        max_age = settings.WORKSPACE_EVENT_POLL_INTERVAL
+    with _table_state_lock:
+        now = time.monotonic()
+        if now - _table_state['checked_at'] >= max_age:
+            samples = _table_state['samples']
+            while len(samples) > 1 and now - samples[1][0] >= EVENT_REWIND_WINDOW:
+                samples.popleft()
+            if samples and now - samples[0][0] >= EVENT_REWIND_WINDOW:
+                anchor = samples[0][1]
+                row = WorkspaceEvent.objects.aggregate(latest=Max('id'), recent=Count('id', filter=Q(id__gt=anchor)))
+                latest = row['latest'] or 0
+                _table_state['state'] = (latest, anchor, row['recent'])
+            else:
+                latest = latest_event_id()
+                _table_state['state'] = None
+            samples.append((now, latest))
+            _table_state['checked_at'] = now
+        return _table_state['state']
+
+
+def fetch_events(user, after_id: int, workspace_pk: int = None, since=None, floor: int = None, exclude=()) -> list:
+    """
+    Events for workspaces the user created or is assigned to
+
+    Those after ``after_id`` and, if ``since`` is given, those created since
+    then, leaving out IDs in ``exclude`` and any not above ``floor``.
+    """
+    unseen = Q(id__gt=after_id)
+    if since is not None:
+        unseen |= Q(created_at__gte=since)
+    queryset = WorkspaceEvent.objects.filter(unseen).filter(
+        Q(workspace__created_by=user) | Q(workspace__application__applicant=user)
+    )
+    if floor is not None:
+        queryset = queryset.filter(id__gt=floor)
+    if exclude:
+        queryset = queryset.exclude(id__in=exclude)
+    if workspace_pk is not None:
+        queryset = queryset.filter(workspace_id=workspace_pk)
+    return list(
+        queryset.order_by('id').values(
+            'id', 'workspace_id', 'workspace__workspace_id', 'previous_state', 'state', 'error_message', 'created_at'
+        )[:MAX_EVENTS_PER_READ]
+    )
+
+
+def format_event(event: dict, cursor: int) -> str:
+    """SSE message; its ``id`` is the stream position ``cursor``, which a late event does not move back"""
+    data = json.dumps({
+        'workspace': event['workspace_id'],
+        'workspace_id': event['workspace__workspace_id'],
+        'previous_state': event['previous_state'],
+        'state': event['state'],
+        'error_message': event['error_message'],
+        'created_at': event['created_at'],
+    }, cls=DjangoJSONEncoder)
+    return f"id: {cursor}\nevent: workspace_state\ndata: {data}\n\n"
+
+
+def format_position(cursor: int) -> str:
+    """Message carrying only the stream position, so a client that starts fresh can resume"""
+    return f"id: {cursor}\nevent: position\ndata: {{}}\n\n"
+
+
+def prune_events() -> int:
+    """Delete events older than WORKSPACE_EVENT_RETENTION seconds"""
+    cutoff = timezone.now() - timedelta(seconds=settings.WORKSPACE_EVENT_RETENTION)
+    deleted, _ = WorkspaceEvent.objects.filter(created_at__lt=cutoff).delete()
+    return deleted
+
+
+class WorkspaceEventStream:
+    """
+    One client's stream, starting after ``last_event_id``
+
+    ``None`` starts at the newest event, so only transitions from now on are sent.
+    """
+
+    def __init__(self, user, last_event_id: int = None, workspace_pk: int = None):
+        self.user = user
+        self.workspace_pk = workspace_pk
+        self.last_event_id = last_event_id
+        # A fresh stream wants nothing from before it started, a resumed one re-checks the window
+        self._floor = None
+        self._sent = {}
+        self._checked_state = None
+
+    def read(self) -> list:
+        """Formatted events since the last read ([] without a query if the table did not change)"""
+        if self.last_event_id is None:
+            self.last_event_id = self._floor = latest_event_id()
+            return [format_position(self.last_event_id)]
+        state = event_table_state()
+        if state is not None and state == self._checked_state:
+            return []
+        since = timezone.now() - timedelta(seconds=EVENT_REWIND_WINDOW)
+        self._sent = {event_id: created_at for event_id, created_at in self._sent.items() if created_at >= since}
+        events = fetch_events(
+            self.user, self.last_event_id, self.workspace_pk, since=since, floor=self._floor, exclude=list(self._sent)
+        )
+        chunks = []
+        for event in events:
+            self._sent[event['id']] = event['created_at']
+            self.last_event_id = max(self.last_event_id, event['id'])
+            chunks.append(format_event(event, self.last_event_id))
+        if len(events) < MAX_EVENTS_PER_READ:
+            self._checked_state = state
+        return chunks
+
+    def __iter__(self):
+        # Blocking fallback for WSGI: one read, then the client reconnects, so no worker is held
+        yield f"retry: {RECONNECT_DELAY_MS}\n\n"
+        chunks = self.read()
+        release_connections()
+        yield from chunks
+
+    async def __aiter__(self):
+        yield f"retry: {RECONNECT_DELAY_MS}\n\n"
+        deadline = time.monotonic() + settings.WORKSPACE_EVENT_STREAM_TIMEOUT
+        last_write = time.monotonic()
+        while time.monotonic() < deadline:
+            chunks = await run_db(self.read)
+            for chunk in chunks:
+                yield chunk
+            if chunks:
+                last_write = time.monotonic()
+            elif time.monotonic() - last_write >= HEARTBEAT_INTERVAL:
+                last_write = time.monotonic()
+                yield ": keep-alive\n\n"
+            await asyncio.sleep(settings.WORKSPACE_EVENT_POLL_INTERVAL)
@@ -0,0 +1,178 @@
+"""
+Lifecycle actions on many workspaces at once
+
+Workspaces are grouped by cloud credential. AWS workspaces are sent in
+Start/Stop/Reboot/TerminateWorkspaces requests of up to 25, Azure session
+hosts are handled with concurrent calls, and the new state is written back
+with a single UPDATE. Every workspace gets an entry in the returned results.
+"""
+
+import logging
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from django.utils import timezone
+from .models import Workspace, WorkspaceEvent
+from .aws_service import AWSWorkSpacesService, ACTION_BATCH_SIZE
+from .azure_service import AzureVirtualDesktopService
+
+logger = logging.getLogger(__name__)
+
+# Concurrent Azure calls per credential
+AZURE_CONCURRENCY = 8
+
+# State rules match the single-workspace endpoints; None allows any state but TERMINATED
+ACTIONS = {
+    'start': {
+        'verb': 'started',
+        'allowed_states': {'STOPPED', 'AVAILABLE'},
+        'state': 'STARTING',
+        'aws': 'start_workspaces',
+        'azure': 'start_session_host',
+    },
+    'stop': {
+        'verb': 'stopped',
+        'allowed_states': {'AVAILABLE'},
+        'state': 'STOPPING',
+        'aws': 'stop_workspaces',
+        'azure': 'stop_session_host',
+    },
+    'restart': {
+        'verb': 'restarted',
+        'allowed_states': None,
+        'state': 'REBOOTING',
+        'aws': 'reboot_workspaces',
+        'azure': None,
+    },
+    'terminate': {
+        'verb': 'terminated',
+        'allowed_states': None,
+        'state': 'TERMINATED',
+        'aws': 'terminate_workspaces',
+        'azure': None,
+    },
+}
+
+
+def _result(workspace, status, error=None):
+    result = {
+        'id': workspace.id,
+        'workspace_id': workspace.workspace_id,
+        'status': status,
+        'state': workspace.state,
+    }
+    if error:
+        result['error'] = error
+    return result
+
+
+def _is_allowed(spec, state):
+    if spec['allowed_states'] is None:
+        return state != 'TERMINATED'
+    return state in spec['allowed_states']
+
+
+def _run_aws(spec, credential, workspaces, results):
+    """Send the action in batches; return the workspaces AWS accepted"""
+    service = AWSWorkSpacesService.for_credential(credential)
+    method = getattr(service, spec['aws'])
+    accepted = []
+    for start in range(0, len(workspaces), ACTION_BATCH_SIZE):
+        batch = workspaces[start:start + ACTION_BATCH_SIZE]
+        try:
+            failed = method([workspace.workspace_id for workspace in batch])
+        except Exception as e:
+            # One failed request only fails its own batch
+            for workspace in batch:
+                results[workspace.id] = _result(workspace, 'failed', str(e))
+            continue
+        for workspace in batch:
+            if workspace.workspace_id in failed:
+                results[workspace.id] = _result(workspace, 'failed', failed[workspace.workspace_id])
+            else:
+                accepted.append(workspace)
+    return accepted
+
+
+def _run_azure(action, spec, credential, workspaces, results):
+    """Return the Azure workspaces whose state should change"""
+    if action == 'terminate':
+        # Session host deletion is not implemented yet; like terminate_workspace, only mark the record
+        return workspaces
+    if spec['azure'] is None:
+        for workspace in workspaces:
+            results[workspace.id] = _result(workspace, 'skipped', f"Action '{action}' is not supported for Azure workspaces")
+        return []
+
+    service = AzureVirtualDesktopService.for_credential(credential)
+    method = getattr(service, spec['azure'])
+
+    def call(workspace):
+        try:
+            method(workspace.workspace_id)
+            return workspace, None
+        except Exception as e:
+            return workspace, str(e)
+
+    with ThreadPoolExecutor(max_workers=min(AZURE_CONCURRENCY, len(workspaces))) as executor:
+        for workspace, error in executor.map(call, workspaces):
+            # Azure power state is not tracked yet, so the stored state is left as it is
+            results[workspace.id] = _result(workspace, 'failed', error) if error else _result(workspace, 'ok')
+    return []
+
+
+def run_bulk_action(action: str, workspaces) -> list:
+    """
+    Apply a lifecycle action to many workspaces
+
+    Args:
+        action: One of ACTIONS
+        workspaces: Workspaces with cloud_credential loaded
+
+    Returns:
+        list: One result per workspace, in input order
+    """
+    spec = ACTIONS[action]
+    workspaces = list(workspaces)
+    results = {}
+    by_credential = defaultdict(list)
+    changed = []
+
+    for workspace in workspaces:
+        if not _is_allowed(spec, workspace.state):
+            results[workspace.id] = _result(
+                workspace, 'skipped', f"Workspace cannot be {spec['verb']} in state {workspace.state}"
+            )
+        elif workspace.cloud_credential is None:
+            if action == 'terminate':
+                # Nothing to delete in the cloud; same as terminate_workspace without a credential
+                changed.append(workspace)
+            else:
+                results[workspace.id] = _result(workspace, 'failed', "Workspace has no cloud credential assigned")
+        elif workspace.cloud_credential.cloud_provider == 'aws' and not workspace.workspace_id:
+            results[workspace.id] = _result(workspace, 'failed', "Workspace has not been provisioned yet")
+        else:
+            by_credential[workspace.cloud_credential_id].append(workspace)
+
+    for group in by_credential.values():
+        credential = group[0].cloud_credential
+        try:
+            if credential.cloud_provider == 'aws':
+                changed.extend(_run_aws(spec, credential, group, results))
+            else:
+                changed.extend(_run_azure(action, spec, credential, group, results))
+        except Exception as e:
+            logger.error(f"Bulk {action} failed for credential {credential.id}: {str(e)}")
+            for workspace in group:
+                results.setdefault(workspace.id, _result(workspace, 'failed', str(e)))
+
+    if changed:
+        Workspace.objects.filter(id__in=[workspace.id for workspace in changed]).update(
+            state=spec['state'], updated_at=timezone.now()
+        )
+        for workspace in changed:
+            workspace.state = spec['state']
+            results[workspace.id] = _result(workspace, 'ok')
+        WorkspaceEvent.record(changed)
+    logger.info(f"Bulk {action}: {len(changed)} of {len(workspaces)} workspaces changed state")
+
+    return [results[workspace.id] for workspace in workspaces]
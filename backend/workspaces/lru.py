@@ -0,0 +1,93 @@
+"""
+Thread-safe in-process LRU cache with a time-to-live
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class TTLLRUCache:
+    """
+    Bounded mapping that evicts the least recently used entry and expires
+    entries ``ttl`` seconds after they were stored
+
+    Values are built by a factory on a miss. Builds are single-flight per key
+    and run outside the main lock, so a slow build neither runs twice nor
+    blocks hits on other keys.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._build_locks = {}
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0}
+
+    def get_or_create(self, key, factory):
+        value = self._lookup(key)
+        if value is not _MISSING:
+            return value
+
+        with self._lock:
+            build_lock = self._build_locks.setdefault(key, threading.Lock())
+        with build_lock:
+            # Another thread may have built the value while this one waited
+            value = self._lookup(key)
+            if value is not _MISSING:
+                return value
+            try:
+                with self._lock:
+                    self._stats['misses'] += 1
+                value = factory()
+                self._store(key, value)
+            finally:
+                with self._lock:
+                    self._build_locks.pop(key, None)
+        return value
+
+    def _lookup(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self._stats['expirations'] += 1
+                return _MISSING
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            return value
+
+    def _store(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def discard(self, predicate) -> int:
+        """Remove every entry whose key matches ``predicate``"""
+        with self._lock:
+            stale = [key for key in self._entries if predicate(key)]
+            for key in stale:
+                del self._entries[key]
+        return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, 'size': len(self._entries), 'max_size': self.max_size, 'ttl': self.ttl}
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            for name in self._stats:
+                self._stats[name] = 0
@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from workspaces.models import CloudCredential, Workspace, get_cipher
+
+
+class Command(BaseCommand):
+    help = (
+        'Re-encrypt cloud credentials and workspace passwords with the first key in '
+        'CRYPTOGRAPHY_KEYS, after which older keys can be removed from the keyring'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Rows re-encrypted per UPDATE (default: 500)'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        cipher = get_cipher()
+
+        def rotate(token):
+            return cipher.rotate(token.encode()).decode() if token else token
+
+        # All or nothing: a token no key can decrypt aborts the whole rotation
+        with transaction.atomic():
+            credentials = self._rotate_model(
+                CloudCredential.objects.all(), ['access_key', 'secret_key'], rotate, batch_size
+            )
+            workspaces = self._rotate_model(
+                Workspace.objects.exclude(password_encrypted=''), ['password_encrypted'], rotate, batch_size
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Re-encrypted {credentials} cloud credentials and {workspaces} workspace passwords"
+        ))
+
+    def _rotate_model(self, queryset, fields, rotate, batch_size):
+        model = queryset.model
+        batch = []
+        total = 0
+        for instance in queryset.only('id', *fields).iterator(chunk_size=batch_size):
+            for field in fields:
+                setattr(instance, field, rotate(getattr(instance, field)))
+            batch.append(instance)
+            if len(batch) >= batch_size:
+                model.objects.bulk_update(batch, fields)
+                total += len(batch)
+                batch = []
+        if batch:
+            model.objects.bulk_update(batch, fields)
+            total += len(batch)
+        return total
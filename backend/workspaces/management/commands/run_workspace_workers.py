@@ -0,0 +1,65 @@
+import signal
+import threading
+from django.core.management.base import BaseCommand
+from workspaces.poller import WorkspaceStatusPoller
+from workspaces.workers import WorkspaceWorkerPool
+
+
+class Command(BaseCommand):
+    help = 'Run the bounded worker pool that processes queued workspace tasks'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=4,
+            help='Number of worker threads (default: 4)'
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=2.0,
+            help='Seconds an idle worker waits before polling the queue again (default: 2)'
+        )
+        parser.add_argument(
+            '--lease-seconds',
+            type=float,
+            default=900,
+            help='Seconds after which a running task of a dead worker is requeued (default: 900)'
+        )
+        parser.add_argument(
+            '--status-interval',
+            type=float,
+            default=30,
+            help='Seconds between batched workspace status polls, 0 to disable (default: 30)'
+        )
+
+    def handle(self, *args, **options):
+        pool = WorkspaceWorkerPool(
+            concurrency=options['concurrency'],
+            poll_interval=options['poll_interval'],
+            lease_seconds=options['lease_seconds'],
+        )
+        poller = WorkspaceStatusPoller(interval=options['status_interval']) if options['status_interval'] > 0 else None
+        stop_requested = threading.Event()
+
+        def request_stop(signum, frame):
+            self.stdout.write("Stopping workers after their current task...")
+            stop_requested.set()
+
+        signal.signal(signal.SIGTERM, request_stop)
+        signal.signal(signal.SIGINT, request_stop)
+
+        pool.start()
+        if poller:
+            poller.start()
+        self.stdout.write(self.style.SUCCESS(f"Running {options['concurrency']} workspace workers"))
+
+        while not stop_requested.wait(1):
+            if not pool.is_running():
+                break
+
+        if poller:
+            poller.stop()
+        pool.stop()
+        self.stdout.write(self.style.SUCCESS("Workspace workers stopped"))
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.25 on 2026-10-16 23:11
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workspaces', '0003_make_cloud_credential_nullable'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cloudcredential',
+            name='max_concurrent_tasks',
+            field=models.PositiveIntegerField(default=5),
+        ),
+        migrations.CreateModel(
+            name='WorkspaceTask',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task_type', models.CharField(choices=[('create_workspace', 'Create Workspace'), ('monitor_workspace', 'Monitor Workspace')], max_length=50)),
+                ('payload', models.JSONField(blank=True, default=dict)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='queued', max_length=20)),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('locked_by', models.CharField(blank=True, max_length=255)),
+                ('locked_at', models.DateTimeField(blank=True, null=True)),
+                ('last_error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('cloud_credential', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='tasks', to='workspaces.cloudcredential')),
+                ('workspace', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='tasks', to='workspaces.workspace')),
+            ],
+            options={
+                'ordering': ['next_attempt_at', 'id'],
+                'indexes': [models.Index(condition=models.Q(('status', 'queued')), fields=['next_attempt_at', 'id'], name='ws_task_queued_idx'), models.Index(fields=['cloud_credential', 'status'], name='ws_task_credential_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.25 on 2026-10-16 23:14
+
+from django.db import migrations, models
+
+
+def delete_monitor_tasks(apps, schema_editor):
+    # Pending workspaces are now tracked by the batched status poller
+    WorkspaceTask = apps.get_model('workspaces', 'WorkspaceTask')
+    WorkspaceTask.objects.filter(task_type='monitor_workspace').delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workspaces', '0004_workspace_task_queue'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_monitor_tasks, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='workspacetask',
+            name='task_type',
+            field=models.CharField(choices=[('create_workspace', 'Create Workspace')], max_length=50),
+        ),
+    ]
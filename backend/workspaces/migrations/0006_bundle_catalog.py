@@ -0,0 +1,35 @@
+# Generated by Django 4.2.25 on 2026-10-16 23:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workspaces', '0005_drop_monitor_task_type'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='workspacetask',
+            name='task_type',
+            field=models.CharField(choices=[('create_workspace', 'Create Workspace'), ('refresh_bundles', 'Refresh Bundle Catalog')], max_length=50),
+        ),
+        migrations.CreateModel(
+            name='BundleCatalog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cloud_provider', models.CharField(choices=[('aws', 'AWS WorkSpaces'), ('azure', 'Azure Virtual Desktop')], max_length=10)),
+                ('region', models.CharField(max_length=100)),
+                ('bundles', models.JSONField(blank=True, default=list)),
+                ('bundle_ids', models.JSONField(blank=True, default=list)),
+                ('fetched_at', models.DateTimeField(blank=True, null=True)),
+                ('refresh_requested_at', models.DateTimeField(blank=True, null=True)),
+                ('last_error', models.TextField(blank=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'unique_together': {('cloud_provider', 'region')},
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.25 on 2026-10-16 23:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workspaces', '0006_bundle_catalog'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='workspacetask',
+            name='task_type',
+            field=models.CharField(choices=[('create_workspace', 'Create Workspace'), ('create_workspace_batch', 'Create Workspace Batch'), ('refresh_bundles', 'Refresh Bundle Catalog')], max_length=50),
+        ),
+    ]
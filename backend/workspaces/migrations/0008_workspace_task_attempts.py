@@ -0,0 +1,18 @@
+# Generated by Django 4.2.25 on 2026-10-16 23:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workspaces', '0007_workspace_batch_task'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='workspacetask',
+            name='attempts',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.25 on 2026-10-16 23:28
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workspaces', '0008_workspace_task_attempts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WorkspaceEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('previous_state', models.CharField(blank=True, max_length=20)),
+                ('state', models.CharField(choices=[('PENDING', 'Pending'), ('AVAILABLE', 'Available'), ('STOPPED', 'Stopped'), ('STOPPING', 'Stopping'), ('STARTING', 'Starting'), ('REBOOTING', 'Rebooting'), ('TERMINATED', 'Terminated'), ('ERROR', 'Error')], max_length=20)),
+                ('error_message', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('workspace', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='events', to='workspaces.workspace')),
+            ],
+            options={
+                'ordering': ['id'],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.25 on 2026-10-16 23:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workspaces', '0009_workspace_events'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='workspace',
+            name='last_polled_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
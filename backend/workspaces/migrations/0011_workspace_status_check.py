@@ -0,0 +1,28 @@
+# Generated by Django 4.2.25 on 2026-10-16 23:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workspaces', '0010_workspace_last_polled_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='workspace',
+            name='status_check_error',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='workspace',
+            name='status_checked_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='workspace',
+            name='status_refresh_claimed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
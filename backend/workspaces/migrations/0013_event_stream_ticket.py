@@ -0,0 +1,24 @@
+# Generated by Django 4.2.25 on 2026-10-17 00:10
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('workspaces', '0012_worker_lease'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventStreamTicket',
+            fields=[
+                ('key', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('expires_at', models.DateTimeField()),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='event_stream_tickets', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
@@ -1,19 +1,45 @@
 from django.db import models
 from django.contrib.auth import get_user_model
+from django.utils import timezone
+from django.utils.functional import cached_property
 from jobs.models import Application
 import base64
-from cryptography.fernet import Fernet
+from datetime import timedelta
+from functools import lru_cache
+from cryptography.fernet import Fernet, MultiFernet
 from django.conf import settings
+from .lru import TTLLRUCache
 
 User = get_user_model()
 
+_secret_cache = TTLLRUCache(settings.WORKSPACE_SECRET_CACHE_SIZE, settings.WORKSPACE_SECRET_CACHE_TTL)
+
+
+@lru_cache(maxsize=4)
+def _build_cipher(keys):
+    fernets = []
+    for key in keys:
+        # Ensure key is properly formatted for Fernet
+        fernets.append(Fernet(base64.urlsafe_b64encode(key.encode().ljust(32)[:32])))
+    return MultiFernet(fernets)
+
 
 def get_cipher():
-    """Get cipher for encryption/decryption"""
-    key = settings.CRYPTOGRAPHY_KEY.encode()
-    # Ensure key is properly formatted for Fernet
-    key = base64.urlsafe_b64encode(key.ljust(32)[:32])
-    return Fernet(key)
+    """Get cipher for encryption/decryption (encrypts with the newest key, decrypts with any)"""
+    return _build_cipher(tuple(settings.CRYPTOGRAPHY_KEYS))
+
+
+def decrypt_cached(instance, token):
+    """
+    Decrypt a token stored on ``instance``, reusing the plaintext for repeated reads
+
+    Entries are keyed by the row's id and ``updated_at`` plus the token itself, so
+    an edited (even unsaved) value never returns a stale plaintext.
+    """
+    if not token:
+        return ''
+    key = (instance._meta.label, instance.pk, instance.updated_at, token)
+    return _secret_cache.get_or_create(key, lambda: get_cipher().decrypt(token.encode()).decode())
 
 
 class CloudCredential(models.Model):
@@ -40,6 +66,7 @@ class CloudCredential(models.Model):
     resource_group = models.CharField(max_length=255, blank=True)  # Azure Resource Group
     
     is_active = models.BooleanField(default=True)
+    max_concurrent_tasks = models.PositiveIntegerField(default=5)  # Background tasks run in parallel against this account
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -59,10 +86,7 @@ class CloudCredential(models.Model):
     
     def decrypt_field(self, value):
         """Decrypt a field value"""
-        if not value:
-            return ''
-        cipher = get_cipher()
-        return cipher.decrypt(value.encode()).decode()
+        return decrypt_cached(self, value)
     
     def set_access_key(self, value):
         self.access_key = self.encrypt_field(value)
@@ -110,6 +134,10 @@ class Workspace(models.Model):
     registration_code = models.CharField(max_length=255, blank=True)  # AWS WorkSpaces registration code
     password_encrypted = models.TextField(blank=True)  # Encrypted password for imported workspaces
     error_message = models.TextField(blank=True)
+    last_polled_at = models.DateTimeField(null=True, blank=True)  # Last successful status read from the cloud provider
+    status_checked_at = models.DateTimeField(null=True, blank=True)  # Last refresh attempt, successful or not
+    status_check_error = models.TextField(blank=True)  # Error of that attempt
+    status_refresh_claimed_at = models.DateTimeField(null=True, blank=True)  # Set while a caller refreshes the status
     
     created_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='workspaces_created')
     created_at = models.DateTimeField(auto_now_add=True)
@@ -118,6 +146,19 @@ class Workspace(models.Model):
     class Meta:
         ordering = ['-created_at']
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored state so a save can tell whether it is a transition
+        instance._loaded_state = dict(zip(field_names, values)).get('state')
+        return instance
+    
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'state' in update_fields:
+            WorkspaceEvent.record([self])
+    
     def set_password(self, value):
         """Encrypt and store password"""
         if not value:
@@ -128,13 +169,142 @@ class Workspace(models.Model):
     
     def get_password(self):
         """Decrypt and return password"""
-        if not self.password_encrypted:
-            return ''
-        cipher = get_cipher()
-        return cipher.decrypt(self.password_encrypted.encode()).decode()
+        return decrypt_cached(self, self.password_encrypted)
     
     def __str__(self):
         if self.application:
             return f"{self.workspace_type} workspace for {self.application.applicant.email}"
         return f"{self.workspace_type} workspace {self.workspace_id or '(unassigned)'}"
 
+
+class WorkspaceEvent(models.Model):
+    """Workspace state transition, streamed to the workspace's provider and seeker"""
+    
+    workspace = models.ForeignKey(Workspace, on_delete=models.CASCADE, related_name='events')
+    previous_state = models.CharField(max_length=20, blank=True)  # Empty for a newly created workspace
+    state = models.CharField(max_length=20, choices=Workspace.STATE_CHOICES)
+    error_message = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    
+    class Meta:
+        ordering = ['id']
+    
+    def __str__(self):
+        return f"Workspace {self.workspace_id}: {self.previous_state or 'NEW'} -> {self.state}"
+    
+    @classmethod
+    def record(cls, workspaces) -> list:
+        """
+        Store an event for each workspace whose state differs from the state it was loaded with
+        
+        Paths that write with bulk_update()/update() call this after the write;
+        Workspace.save() calls it itself.
+        """
+        events = []
+        for workspace in workspaces:
+            previous_state = getattr(workspace, '_loaded_state', None)
+            if workspace.state != previous_state:
+                events.append(cls(
+                    workspace_id=workspace.id,
+                    previous_state=previous_state or '',
+                    state=workspace.state,
+                    error_message=workspace.error_message
+                ))
+                workspace._loaded_state = workspace.state
+        return cls.objects.bulk_create(events) if events else []
+
+
+class EventStreamTicket(models.Model):
+    """Short-lived single-use key that opens one event stream, since EventSource cannot send an Authorization header"""
+    
+    key = models.CharField(max_length=64, primary_key=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='event_stream_tickets')
+    expires_at = models.DateTimeField()
+    
+    def __str__(self):
+        return f"Stream ticket for {self.user_id} until {self.expires_at}"
+
+
+class WorkspaceTask(models.Model):
+    """Durable background task, claimed by the run_workspace_workers pool"""
+    
+    TASK_TYPE_CHOICES = [
+        ('create_workspace', 'Create Workspace'),
+        ('create_workspace_batch', 'Create Workspace Batch'),
+        ('refresh_bundles', 'Refresh Bundle Catalog'),
+    ]
+    
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+    
+    task_type = models.CharField(max_length=50, choices=TASK_TYPE_CHOICES)
+    workspace = models.ForeignKey(Workspace, on_delete=models.CASCADE, related_name='tasks', null=True, blank=True)
+    cloud_credential = models.ForeignKey(CloudCredential, on_delete=models.CASCADE, related_name='tasks', null=True, blank=True)
+    payload = models.JSONField(default=dict, blank=True)
+    
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveIntegerField(default=0)  # Times the task has been claimed by a worker
+    locked_by = models.CharField(max_length=255, blank=True)  # Worker that claimed the task
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['next_attempt_at', 'id']
+        indexes = [
+            models.Index(
+                fields=['next_attempt_at', 'id'],
+                name='ws_task_queued_idx',
+                condition=models.Q(status='queued'),
+            ),
+            models.Index(fields=['cloud_credential', 'status'], name='ws_task_credential_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.task_type} #{self.id} ({self.status})"
+
+
+class WorkerLease(models.Model):
+    """Named singleton job lease, taken with a conditional UPDATE so it also works through PgBouncer"""
+    
+    name = models.CharField(max_length=100, primary_key=True)
+    held_by = models.CharField(max_length=255, blank=True)  # Process holding the lease
+    expires_at = models.DateTimeField(null=True, blank=True)  # Lease is free once this has passed
+    
+    def __str__(self):
+        return f"{self.name} ({self.held_by or 'free'})"
+
+
+class BundleCatalog(models.Model):
+    """Cached list of workspace bundles a cloud provider offers in a region"""
+    
+    cloud_provider = models.CharField(max_length=10, choices=CloudCredential.CLOUD_PROVIDER_CHOICES)
+    region = models.CharField(max_length=100)
+    
+    bundles = models.JSONField(default=list, blank=True)  # Formatted bundle dicts as returned by the API views
+    bundle_ids = models.JSONField(default=list, blank=True)
+    
+    fetched_at = models.DateTimeField(null=True, blank=True)  # Last successful refresh
+    refresh_requested_at = models.DateTimeField(null=True, blank=True)  # Background refresh in flight
+    last_error = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        unique_together = ['cloud_provider', 'region']
+    
+    def __str__(self):
+        return f"{self.cloud_provider} bundles in {self.region} ({len(self.bundle_ids)})"
+    
+    @cached_property
+    def bundle_id_set(self):
+        return frozenset(self.bundle_ids)
+    
+    def is_stale(self, ttl: int) -> bool:
+        return self.fetched_at is None or timezone.now() - self.fetched_at > timedelta(seconds=ttl)
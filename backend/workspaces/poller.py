@@ -0,0 +1,211 @@
+"""
+Batched workspace status poller
+
+A single loop refreshes every workspace in a transitional state. Workspaces are
+grouped by cloud credential (which fixes the account and region), each AWS
+account is queried with ``DescribeWorkspaces`` in batches of 25 IDs, and all
+state changes are written back with one ``bulk_update``.
+"""
+
+import logging
+import os
+import socket
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import timedelta
+from django.db import close_old_connections, connection
+from django.db.models import Q
+from django.utils import timezone
+from .models import Workspace, WorkspaceEvent, WorkerLease
+from .aws_service import AWSWorkSpacesService
+from .events import prune_events
+
+logger = logging.getLogger(__name__)
+
+# States the cloud provider moves out of on its own, so they need polling
+POLLED_STATES = ['PENDING', 'STARTING', 'STOPPING', 'REBOOTING']
+
+# A workspace left PENDING this long without progress is reported as timed out
+PENDING_TIMEOUT = timedelta(minutes=30)
+PENDING_TIMEOUT_MESSAGE = "Workspace creation timeout - please check manually"
+
+# Azure session hosts are simulated as available after this long
+AZURE_SIMULATED_PROVISION_TIME = timedelta(minutes=5)
+
+# Lease held while polling so several worker processes do not poll twice. A row
+# lease rather than an advisory lock, which PgBouncer transaction pooling breaks.
+# One left by a crashed process expires after POLLER_LEASE_DURATION.
+POLLER_LEASE_NAME = 'workspace-status-poller'
+POLLER_LEASE_DURATION = timedelta(minutes=5)
+
+UPDATE_FIELDS = ['state', 'connection_string', 'error_message', 'updated_at']
+
+
+def apply_aws_workspace_info(workspace: Workspace, info: dict) -> bool:
+    """Copy a DescribeWorkspaces entry onto the workspace; return True if anything changed"""
+    changed = False
+    current_state = info.get('State')
+
+    if current_state and current_state != workspace.state:
+        logger.info(f"Workspace {workspace.id} state updated to: {current_state}")
+        workspace.state = current_state
+        changed = True
+
+    if current_state == 'AVAILABLE':
+        connection_string = f"workspaces://{workspace.workspace_id}"
+        if workspace.connection_string != connection_string:
+            workspace.connection_string = connection_string
+            changed = True
+
+    if current_state == 'ERROR' and info.get('ErrorMessage'):
+        if workspace.error_message != info['ErrorMessage']:
+            workspace.error_message = info['ErrorMessage']
+            changed = True
+
+    return changed
+
+
+def apply_azure_simulated_status(workspace: Workspace, now=None) -> bool:
+    """Mark a pending Azure workspace available once it is old enough (no real status API yet)"""
+    now = now or timezone.now()
+    if workspace.state != 'PENDING' or not workspace.created_at:
+        return False
+    if now - workspace.created_at < AZURE_SIMULATED_PROVISION_TIME:
+        return False
+    workspace.state = 'AVAILABLE'
+    workspace.connection_string = f"ms-avd://{workspace.workspace_id}"
+    logger.info(f"Azure workspace {workspace.id} marked as available (simulated)")
+    return True
+
+
+def _poll_aws(credential, workspaces: list) -> list:
+    service = AWSWorkSpacesService.for_credential(credential)
+    infos = service.describe_workspaces([workspace.workspace_id for workspace in workspaces])
+    return [
+        workspace for workspace in workspaces
+        if workspace.workspace_id in infos and apply_aws_workspace_info(workspace, infos[workspace.workspace_id])
+    ]
+
+
+def poll_workspace_states() -> dict:
+    """
+    Refresh all workspaces in POLLED_STATES in one pass
+
+    Returns:
+        Counts of workspaces checked and updated, and credentials that failed
+    """
+    now = timezone.now()
+    workspaces = list(
+        Workspace.objects.select_related('cloud_credential')
+        .filter(state__in=POLLED_STATES, cloud_credential__isnull=False)
+        .exclude(workspace_id='')
+    )
+
+    by_credential = defaultdict(list)
+    for workspace in workspaces:
+        by_credential[workspace.cloud_credential_id].append(workspace)
+
+    changed = {}
+    polled_ids = []
+    failed_credentials = 0
+    for group in by_credential.values():
+        credential = group[0].cloud_credential
+        try:
+            if credential.cloud_provider == 'aws':
+                updated = _poll_aws(credential, group)
+            elif credential.cloud_provider == 'azure':
+                updated = [workspace for workspace in group if apply_azure_simulated_status(workspace, now)]
+            else:
+                updated = []
+        except Exception as e:
+            failed_credentials += 1
+            logger.error(f"Error polling workspaces for credential {credential.id}: {str(e)}")
+            continue
+        polled_ids.extend(workspace.id for workspace in group)
+        for workspace in updated:
+            changed[workspace.id] = workspace
+
+    for workspace in workspaces:
+        if (
+            workspace.state == 'PENDING'
+            and not workspace.error_message
+            and now - workspace.updated_at > PENDING_TIMEOUT
+        ):
+            workspace.error_message = PENDING_TIMEOUT_MESSAGE
+            changed[workspace.id] = workspace
+            logger.warning(f"Monitoring timeout for workspace {workspace.id}")
+
+    # bulk_update bypasses auto_now, so stamp updated_at explicitly
+    for workspace in changed.values():
+        workspace.updated_at = now
+    Workspace.objects.bulk_update(changed.values(), UPDATE_FIELDS)
+    WorkspaceEvent.record(changed.values())
+    # Separate UPDATE so unchanged rows keep their updated_at
+    Workspace.objects.filter(id__in=polled_ids).update(last_polled_at=now)
+
+    return {
+        'checked': len(workspaces),
+        'updated': len(changed),
+        'failed_credentials': failed_credentials,
+    }
+
+
+@contextmanager
+def _poller_lease():
+    """Yield True if this process holds the poller lease"""
+    holder = f"{socket.gethostname()}:{os.getpid()}"
+    now = timezone.now()
+    WorkerLease.objects.get_or_create(name=POLLER_LEASE_NAME)
+    acquired = WorkerLease.objects.filter(name=POLLER_LEASE_NAME).filter(
+        Q(expires_at__isnull=True) | Q(expires_at__lt=now)
+    ).update(held_by=holder, expires_at=now + POLLER_LEASE_DURATION) == 1
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            WorkerLease.objects.filter(name=POLLER_LEASE_NAME, held_by=holder).update(held_by='', expires_at=None)
+
+
+class WorkspaceStatusPoller:
+    """Background thread that runs poll_workspace_states every ``interval`` seconds"""
+
+    def __init__(self, interval: float = 30):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name='workspace-status-poller', daemon=True)
+        self._thread.start()
+        logger.info(f"Started workspace status poller (every {self.interval}s)")
+
+    def stop(self, timeout: float = None) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def poll_once(self):
+        """Poll if no other process is polling; return the poll summary or None"""
+        with _poller_lease() as acquired:
+            if not acquired:
+                return None
+            summary = poll_workspace_states()
+            summary['pruned_events'] = prune_events()
+            return summary
+
+    def _run(self) -> None:
+        try:
+            while not self._stop.is_set():
+                close_old_connections()
+                try:
+                    self.poll_once()
+                except Exception as e:
+                    logger.error(f"Workspace status poll failed: {str(e)}")
+                close_old_connections()
+                self._stop.wait(self.interval)
+        finally:
+            connection.close()
@@ -0,0 +1,145 @@
+"""
+Durable workspace task queue
+
+Tasks live in the ``WorkspaceTask`` table so they survive process restarts.
+Workers claim them with ``SELECT ... FOR UPDATE SKIP LOCKED`` and respect the
+``max_concurrent_tasks`` limit of each cloud credential.
+"""
+
+import logging
+from datetime import timedelta
+from typing import Optional
+from django.db import transaction
+from django.utils import timezone
+from .models import CloudCredential, WorkspaceTask
+
+logger = logging.getLogger(__name__)
+
+# Number of due tasks locked per claim attempt, so a busy credential does not starve others
+CLAIM_BATCH_SIZE = 10
+
+# Claims (attempts) after which a task whose worker died is failed instead of requeued
+MAX_TASK_ATTEMPTS = 5
+
+
+class RescheduleTask(Exception):
+    """Raised by a task handler to run the same task again later"""
+
+    def __init__(self, delay: float, reason: str = ''):
+        super().__init__(reason or f"Rescheduled in {delay}s")
+        self.delay = delay
+
+
+def enqueue(task_type: str, workspace=None, cloud_credential=None, payload: Optional[dict] = None, delay: float = 0) -> WorkspaceTask:
+    """
+    Add a task to the queue
+
+    Args:
+        task_type: One of WorkspaceTask.TASK_TYPE_CHOICES
+        workspace: Workspace the task acts on, if any
+        cloud_credential: Credential whose concurrency limit applies (defaults to the workspace's)
+        payload: Extra JSON arguments for the handler
+        delay: Seconds before the task becomes due
+    """
+    if cloud_credential is None and workspace is not None:
+        cloud_credential = workspace.cloud_credential
+    return WorkspaceTask.objects.create(
+        task_type=task_type,
+        workspace=workspace,
+        cloud_credential=cloud_credential,
+        payload=payload or {},
+        next_attempt_at=timezone.now() + timedelta(seconds=delay),
+    )
+
+
+def claim_next_task(worker_id: str) -> Optional[WorkspaceTask]:
+    """Claim the next due task whose credential has spare capacity, or return None"""
+    with transaction.atomic():
+        candidates = (
+            WorkspaceTask.objects.select_for_update(skip_locked=True)
+            .filter(status='queued', next_attempt_at__lte=timezone.now())
+            .order_by('next_attempt_at', 'id')[:CLAIM_BATCH_SIZE]
+        )
+        for task in candidates:
+            if task.cloud_credential_id and not _has_capacity(task.cloud_credential_id):
+                continue
+            task.status = 'running'
+            task.attempts += 1
+            task.locked_by = worker_id
+            task.locked_at = timezone.now()
+            task.save(update_fields=['status', 'attempts', 'locked_by', 'locked_at', 'updated_at'])
+            return task
+    return None
+
+
+def _has_capacity(credential_id: int) -> bool:
+    # Locking the credential row serializes claims per credential, so the running count is exact.
+    # A row another worker has locked is skipped rather than waited for, so claims for
+    # one credential never queue up the other workers; its tasks are tried next round.
+    limit = (
+        CloudCredential.objects.select_for_update(skip_locked=True)
+        .filter(pk=credential_id)
+        .values_list('max_concurrent_tasks', flat=True)
+        .first()
+    )
+    if limit is None:
+        return False
+    running = WorkspaceTask.objects.filter(cloud_credential_id=credential_id, status='running').count()
+    return running < limit
+
+
+def complete_task(task: WorkspaceTask) -> None:
+    task.status = 'done'
+    task.locked_by = ''
+    task.locked_at = None
+    task.save(update_fields=['status', 'locked_by', 'locked_at', 'updated_at'])
+
+
+def fail_task(task: WorkspaceTask, error: str) -> None:
+    task.status = 'failed'
+    task.last_error = error
+    task.locked_by = ''
+    task.locked_at = None
+    task.save(update_fields=['status', 'last_error', 'locked_by', 'locked_at', 'updated_at'])
+
+
+def reschedule_task(task: WorkspaceTask, delay: float, reason: str = '') -> None:
+    """Put a claimed task back in the queue, due after ``delay`` seconds"""
+    task.status = 'queued'
+    task.next_attempt_at = timezone.now() + timedelta(seconds=delay)
+    task.last_error = reason
+    task.locked_by = ''
+    task.locked_at = None
+    task.save(update_fields=['status', 'next_attempt_at', 'last_error', 'locked_by', 'locked_at', 'updated_at'])
+
+
+def requeue_stale_tasks(lease_seconds: float) -> dict:
+    """
+    Return tasks held by workers that died (lease expired) to the queue
+
+    ``attempts`` already counts the claim of the dead worker; a task that has
+    been claimed MAX_TASK_ATTEMPTS times is failed instead, so a task that
+    keeps crashing its worker is not retried forever.
+    """
+    now = timezone.now()
+    stale = WorkspaceTask.objects.filter(status='running', locked_at__lt=now - timedelta(seconds=lease_seconds))
+    failed = stale.filter(attempts__gte=MAX_TASK_ATTEMPTS).update(
+        status='failed',
+        last_error=f"Worker lease expired on attempt {MAX_TASK_ATTEMPTS}; giving up",
+        locked_by='',
+        locked_at=None,
+        updated_at=now,
+    )
+    requeued = stale.update(
+        status='queued',
+        locked_by='',
+        locked_at=None,
+        next_attempt_at=now,
+        last_error='Worker lease expired',
+        updated_at=now,
+    )
+    if requeued:
+        logger.warning(f"Requeued {requeued} workspace tasks with expired leases")
+    if failed:
+        logger.error(f"Failed {failed} workspace tasks whose lease expired {MAX_TASK_ATTEMPTS} times")
+    return {'requeued': requeued, 'failed': failed}
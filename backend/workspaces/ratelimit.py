@@ -0,0 +1,193 @@
+"""
+Adaptive client-side rate limiting for cloud provider APIs
+
+Every SDK call made by the service wrappers first takes a token from a bucket
+kept per (credential, API operation). A service built from raw keys has no
+credential; its calls share a bucket per provider scope (AWS region or Azure
+subscription) instead of one bucket for every such caller. Buckets adapt AIMD-style: a throttling
+response halves the refill rate, and each successful call adds a small step
+back towards ``WORKSPACE_API_RATE``. Buckets live in process memory, so every
+web or worker process gets the configured rate on its own.
+"""
+
+import threading
+import time
+from botocore.exceptions import ClientError
+from azure.core.exceptions import HttpResponseError
+from django.conf import settings
+
+# AWS and Azure error codes returned when a caller exceeds the API request rate
+THROTTLING_CODES = {
+    'Throttling',
+    'ThrottlingException',
+    'TooManyRequestsException',
+    'RequestLimitExceeded',
+    'RequestThrottled',
+    'TooManyRequests',
+}
+
+# Rate multiplier applied on throttling, and fraction of the ceiling regained per success
+DECREASE_FACTOR = 0.5
+INCREASE_FRACTION = 0.05
+
+# Throttles reported within this many seconds of a decrease count as the same episode
+DECREASE_COOLDOWN = 1.0
+
+
+class RateLimited(Exception):
+    """No token became available within WORKSPACE_API_MAX_WAIT seconds"""
+
+
+class AdaptiveTokenBucket:
+    """
+    Token bucket whose refill rate moves between ``min_rate`` and ``max_rate``
+
+    Tokens are reserved under the lock and callers sleep outside it, so waiting
+    callers are served in arrival order without holding up each other.
+    """
+
+    def __init__(self, rate: float, burst: float, min_rate: float):
+        self.max_rate = rate
+        self.min_rate = min(min_rate, rate)
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._refilled_at = time.monotonic()
+        self._decreased_at = None
+        self._lock = threading.Lock()
+        self._stats = {'calls': 0, 'throttled': 0, 'waits': 0, 'wait_seconds': 0.0, 'rejected': 0}
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+
+    def acquire(self, max_wait: float) -> float:
+        """Take a token, sleeping until one is available; return the seconds waited"""
+        with self._lock:
+            self._refill(time.monotonic())
+            wait = 0.0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+            if wait > max_wait:
+                self._stats['rejected'] += 1
+                raise RateLimited(f"No API token available within {max_wait}s (rate {self.rate:.2f}/s)")
+            self._tokens -= 1
+            self._stats['calls'] += 1
+            if wait:
+                self._stats['waits'] += 1
+                self._stats['wait_seconds'] += wait
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    def on_throttle(self) -> None:
+        """Multiplicative decrease, at most once per DECREASE_COOLDOWN"""
+        with self._lock:
+            self._stats['throttled'] += 1
+            now = time.monotonic()
+            if self._decreased_at is not None and now - self._decreased_at < DECREASE_COOLDOWN:
+                return
+            self._refill(now)
+            self.rate = max(self.min_rate, self.rate * DECREASE_FACTOR)
+            # Drop the saved-up burst so the next calls follow the lower rate
+            self._tokens = min(self._tokens, 0.0)
+            self._decreased_at = now
+
+    def on_success(self) -> None:
+        """Additive increase back towards max_rate"""
+        with self._lock:
+            if self.rate < self.max_rate:
+                self._refill(time.monotonic())
+                self.rate = min(self.max_rate, self.rate + self.max_rate * INCREASE_FRACTION)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            self._refill(time.monotonic())
+            return {
+                **self._stats,
+                'wait_seconds': round(self._stats['wait_seconds'], 3),
+                'rate': round(self.rate, 3),
+                'max_rate': self.max_rate,
+                'tokens': round(self._tokens, 2),
+            }
+
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+
+def get_bucket(provider: str, credential_id, operation: str, scope: str = None) -> AdaptiveTokenBucket:
+    """Bucket shared by all calls of ``operation`` made with one credential, or without one in ``scope``"""
+    key = (provider, credential_id, None if credential_id is not None else scope, operation)
+    with _buckets_lock:
+        bucket = _buckets.get(key)
+        if bucket is None:
+            bucket = _buckets[key] = AdaptiveTokenBucket(
+                settings.WORKSPACE_API_RATE,
+                settings.WORKSPACE_API_BURST,
+                settings.WORKSPACE_API_MIN_RATE
+            )
+        return bucket
+
+
+def is_throttling_error(error: BaseException) -> bool:
+    """True if an SDK exception is a request-rate rejection"""
+    if isinstance(error, ClientError):
+        code = error.response.get('Error', {}).get('Code', '')
+        status = error.response.get('ResponseMetadata', {}).get('HTTPStatusCode')
+        return code in THROTTLING_CODES or status == 429
+    if isinstance(error, HttpResponseError):
+        code = error.error.code if error.error is not None else ''
+        return code in THROTTLING_CODES or error.status_code == 429
+    return False
+
+
+def _has_throttled_items(response) -> bool:
+    # Batch WorkSpaces operations report per-item throttling in FailedRequests
+    if not isinstance(response, dict):
+        return False
+    return any(item.get('ErrorCode') in THROTTLING_CODES for item in response.get('FailedRequests', []))
+
+
+def call(provider: str, credential_id, operation: str, fn, *args, scope: str = None, **kwargs):
+    """
+    Run one SDK call under the (credential, operation) bucket, or the
+    (scope, operation) bucket if ``credential_id`` is None
+
+    Throttling responses lower the bucket's rate and are re-raised; any other
+    completed call raises it. Raises RateLimited if the bucket would make the
+    caller wait longer than WORKSPACE_API_MAX_WAIT.
+    """
+    bucket = get_bucket(provider, credential_id, operation, scope)
+    bucket.acquire(settings.WORKSPACE_API_MAX_WAIT)
+    try:
+        response = fn(*args, **kwargs)
+    except Exception as e:
+        if is_throttling_error(e):
+            bucket.on_throttle()
+        raise
+    if _has_throttled_items(response):
+        bucket.on_throttle()
+    else:
+        bucket.on_success()
+    return response
+
+
+def forget_credential(credential_id: int) -> int:
+    """Drop the buckets of a deleted credential"""
+    with _buckets_lock:
+        stale = [key for key in _buckets if key[1] == credential_id]
+        for key in stale:
+            del _buckets[key]
+    return len(stale)
+
+
+def get_stats() -> list:
+    """Current rate and counters of every bucket"""
+    with _buckets_lock:
+        buckets = list(_buckets.items())
+    return [
+        {
+            'provider': provider, 'credential_id': credential_id, 'scope': scope, 'operation': operation,
+            **bucket.snapshot()
+        }
+        for (provider, credential_id, scope, operation), bucket in sorted(buckets, key=lambda item: str(item[0]))
+    ]
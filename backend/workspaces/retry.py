@@ -0,0 +1,95 @@
+"""
+Retry classification and backoff for cloud provider calls
+
+Errors are classified by the provider's error code (or HTTP status) rather
+than by matching text in the message. Service wrappers re-raise with
+``raise ... from e``, so the original SDK exception is found on the
+``__cause__`` chain.
+"""
+
+import random
+from botocore.exceptions import ClientError, ConnectionError as BotoConnectionError, HTTPClientError
+from azure.core.exceptions import HttpResponseError, ServiceRequestError, ServiceResponseError
+from .ratelimit import RateLimited
+
+# AWS error codes (ClientError Error.Code or FailedRequests ErrorCode) worth retrying
+RETRYABLE_AWS_CODES = {
+    'Throttling',
+    'ThrottlingException',
+    'TooManyRequestsException',
+    'RequestLimitExceeded',
+    'RequestThrottled',
+    'ServiceUnavailable',
+    'ServiceUnavailableException',
+    'InternalError',
+    'InternalFailure',
+    'InternalServerError',
+    'RequestTimeout',
+    'RequestTimeoutException',
+}
+
+# Azure ARM error codes worth retrying
+RETRYABLE_AZURE_CODES = {
+    'TooManyRequests',
+    'ServerBusy',
+    'ServiceUnavailable',
+    'InternalServerError',
+    'InternalError',
+    'OperationTimedOut',
+    'RetryableError',
+}
+
+# HTTP statuses that indicate a transient failure on any provider
+RETRYABLE_HTTP_STATUSES = {408, 429, 500, 502, 503, 504}
+
+BASE_DELAY = 30
+MAX_DELAY = 15 * 60
+
+
+def is_retryable_code(code) -> bool:
+    """True for an AWS or Azure error code that signals a transient failure"""
+    return bool(code) and (code in RETRYABLE_AWS_CODES or code in RETRYABLE_AZURE_CODES)
+
+
+def get_error_code(error: BaseException) -> str:
+    """Provider error code of ``error`` or of the first exception in its cause chain"""
+    for exc in _cause_chain(error):
+        if isinstance(exc, ClientError):
+            return exc.response.get('Error', {}).get('Code', '')
+        if isinstance(exc, HttpResponseError) and exc.error is not None and exc.error.code:
+            return exc.error.code
+    return ''
+
+
+def is_retryable(error: BaseException) -> bool:
+    """True if ``error`` (or its cause) is a throttling, server-side or connection failure"""
+    for exc in _cause_chain(error):
+        if isinstance(exc, RateLimited):
+            return True
+        if isinstance(exc, ClientError):
+            status = exc.response.get('ResponseMetadata', {}).get('HTTPStatusCode')
+            return is_retryable_code(get_error_code(exc)) or status in RETRYABLE_HTTP_STATUSES
+        if isinstance(exc, (BotoConnectionError, HTTPClientError, ServiceRequestError, ServiceResponseError)):
+            return True
+        if isinstance(exc, HttpResponseError):
+            return is_retryable_code(get_error_code(exc)) or exc.status_code in RETRYABLE_HTTP_STATUSES
+    return False
+
+
+def backoff_delay(retry_count: int, base: float = BASE_DELAY, cap: float = MAX_DELAY) -> float:
+    """
+    Exponential backoff with jitter for the given retry (0 for the first retry)
+
+    Half of the delay is fixed and half random ("equal jitter"), so retries of
+    a throttled batch spread out instead of hitting the API together again.
+    """
+    delay = min(cap, base * (2 ** retry_count))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def _cause_chain(error):
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        yield error
+        error = error.__cause__ or error.__context__
@@ -1,6 +1,31 @@
 from rest_framework import serializers
-from .models import CloudCredential, Workspace
-from jobs.serializers import ApplicationSerializer
+from .models import CloudCredential, Workspace, WorkspaceEvent
+from jobs.serializers import ApplicationSerializer, defer_job_list_fields
+from jobs.sparse_fields import SparseFieldsMixin
+
+
+def validate_bundle(credential, bundle_id):
+    """Reject a bundle ID that is not in the credential's cached bundle catalog"""
+    from .bundles import get_bundle_catalog
+    
+    if not bundle_id:
+        return
+    try:
+        catalog = get_bundle_catalog(credential)
+    except Exception as e:
+        # If we can't load the catalog, log a warning but don't fail validation
+        # This allows fallback for manual bundle IDs
+        import logging
+        logger = logging.getLogger(__name__)
+        logger.warning(f"Could not validate bundle compatibility: {str(e)}")
+        return
+    
+    if bundle_id not in catalog.bundle_id_set:
+        bundle_ids = catalog.bundle_ids
+        raise serializers.ValidationError({
+            "bundle_id": f"Bundle '{bundle_id}' is not available for this cloud provider/credential. "
+                       f"Available bundles: {', '.join(bundle_ids[:5])}{'...' if len(bundle_ids) > 5 else ''}"
+        })
 
 
 class CloudCredentialSerializer(serializers.ModelSerializer):
@@ -14,7 +39,7 @@ class CloudCredentialSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'credential_name', 'cloud_provider', 'region',
             'directory_id', 'tenant_id', 'subscription_id', 'resource_group',
-            'is_active', 'created_at', 'updated_at',
+            'is_active', 'max_concurrent_tasks', 'created_at', 'updated_at',
             'access_key_masked', 'secret_key_masked'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
@@ -42,7 +67,8 @@ class CloudCredentialCreateSerializer(serializers.ModelSerializer):
         fields = [
             'credential_name', 'cloud_provider', 'region',
             'access_key_plain', 'secret_key_plain',
-            'directory_id', 'tenant_id', 'subscription_id', 'resource_group'
+            'directory_id', 'tenant_id', 'subscription_id', 'resource_group',
+            'max_concurrent_tasks'
         ]
     
     def validate(self, attrs):
@@ -77,8 +103,39 @@ class CloudCredentialCreateSerializer(serializers.ModelSerializer):
         return credential
 
 
-class WorkspaceSerializer(serializers.ModelSerializer):
-    """Serializer for workspace"""
+def workspace_list_queryset():
+    """Workspaces joined with every relation WorkspaceSerializer renders"""
+    # application__workspace is filled from the same row, so the nested
+    # application's workspace does not cost a query either
+    return defer_job_list_fields(
+        Workspace.objects.select_related(
+            'cloud_credential',
+            'application__applicant',
+            'application__job__created_by',
+        ),
+        'application__job__'
+    )
+
+
+class WorkspaceSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """
+    Serializer for workspace
+    
+    Lists should pass a queryset from ``workspace_list_queryset`` so the
+    credential, application, applicant and job are loaded with the workspaces.
+    Supports ``?fields=``/``?omit=`` (see ``jobs.sparse_fields``).
+    """
+    
+    # Columns read by the method fields, kept when a sparse fieldset defers the rest
+    sparse_field_sources = {
+        'cloud_credential_name': ['cloud_credential__credential_name'],
+        'applicant_name': ['application__applicant__email'],
+        'job_title': ['application__job__title'],
+        'is_imported': ['registration_code', 'cloud_credential_id'],
+        'registration_code': ['registration_code'],
+        'password': ['password_encrypted', 'application__applicant_id', 'created_by_id'],
+        'connection_string': ['registration_code', 'connection_string'],
+    }
     
     application = ApplicationSerializer(read_only=True, allow_null=True)
     cloud_credential_name = serializers.SerializerMethodField()
@@ -95,12 +152,12 @@ class WorkspaceSerializer(serializers.ModelSerializer):
             'id', 'application', 'cloud_credential', 'cloud_credential_name',
             'workspace_id', 'cloud_provider', 'workspace_type', 'bundle_id',
             'state', 'connection_string', 'username', 'error_message',
-            'created_by', 'created_at', 'updated_at',
+            'created_by', 'created_at', 'updated_at', 'last_polled_at',
             'applicant_name', 'job_title', 'is_imported', 'registration_code', 'password'
         ]
         read_only_fields = [
             'id', 'workspace_id', 'state',
-            'created_by', 'created_at', 'updated_at', 'error_message'
+            'created_by', 'created_at', 'updated_at', 'last_polled_at', 'error_message'
         ]
     
     def get_cloud_credential_name(self, obj):
@@ -126,7 +183,7 @@ class WorkspaceSerializer(serializers.ModelSerializer):
         # A workspace is considered imported if:
         # 1. It has a registration_code (imported from AWS/Azure console)
         # 2. OR it has no cloud_credential (imported without credential)
-        return bool(obj.registration_code or not obj.cloud_credential)
+        return bool(obj.registration_code or obj.cloud_credential_id is None)
     
     def get_registration_code(self, obj):
         """Get registration code"""
@@ -141,24 +198,20 @@ class WorkspaceSerializer(serializers.ModelSerializer):
     def get_password(self, obj):
         """Get decrypted password - for seekers (workspace owners) and providers (workspace creators)"""
         request = self.context.get('request')
-        if request:
-            # Show password to:
-            # 1. The seeker who owns the workspace (application.applicant)
-            # 2. The provider who created the workspace (created_by)
-            if obj.application and obj.application.applicant == request.user:
-                # Seeker owns the workspace
-                try:
-                    password = obj.get_password()
-                    return password if password else ''
-                except Exception:
-                    return ''
-            elif obj.created_by == request.user:
-                # Provider created the workspace
-                try:
-                    password = obj.get_password()
-                    return password if password else ''
-                except Exception:
-                    return ''
+        # Nothing to decrypt for workspaces created through the API
+        if not request or not obj.password_encrypted:
+            return ''
+        # Show password to:
+        # 1. The seeker who owns the workspace (application.applicant)
+        # 2. The provider who created the workspace (created_by)
+        # Compared by ID so neither user row is loaded per workspace
+        user_id = request.user.id
+        if (obj.application_id and obj.application.applicant_id == user_id) or obj.created_by_id == user_id:
+            try:
+                password = obj.get_password()
+                return password if password else ''
+            except Exception:
+                return ''
         return ''
 
 
@@ -177,7 +230,6 @@ class WorkspaceCreateSerializer(serializers.ModelSerializer):
     
     def validate(self, attrs):
         from jobs.models import Application
-        from .tasks import BundleManager
         
         # Validate application exists and is approved
         try:
@@ -205,25 +257,8 @@ class WorkspaceCreateSerializer(serializers.ModelSerializer):
         if application.job.created_by != self.context['request'].user:
             raise serializers.ValidationError({"application_id": "You don't have permission to create workspace for this application."})
         
-        # Validate bundle compatibility
-        bundle_id = attrs.get('bundle_id')
-        if bundle_id:
-            try:
-                # Get available bundles for this credential
-                available_bundles = BundleManager.get_available_bundles(credential.cloud_provider, credential)
-                bundle_ids = [bundle['bundle_id'] for bundle in available_bundles]
-                
-                if bundle_id not in bundle_ids:
-                    raise serializers.ValidationError({
-                        "bundle_id": f"Bundle '{bundle_id}' is not available for this cloud provider/credential. "
-                                   f"Available bundles: {', '.join(bundle_ids[:5])}{'...' if len(bundle_ids) > 5 else ''}"
-                    })
-            except Exception as e:
-                # If we can't validate bundles, log a warning but don't fail validation
-                # This allows fallback for manual bundle IDs
-                import logging
-                logger = logging.getLogger(__name__)
-                logger.warning(f"Could not validate bundle compatibility: {str(e)}")
+        # Validate bundle compatibility against the cached catalog
+        validate_bundle(credential, attrs.get('bundle_id'))
         
         # Validate workspace type compatibility
         workspace_type = attrs.get('workspace_type')
@@ -259,6 +294,159 @@ class WorkspaceCreateSerializer(serializers.ModelSerializer):
         return workspace
 
 
+class WorkspaceBulkCreateSerializer(serializers.Serializer):
+    """Serializer for creating workspaces for many approved applications at once"""
+    
+    MAX_APPLICATIONS = 200
+    
+    application_ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        allow_empty=False,
+        max_length=MAX_APPLICATIONS
+    )
+    cloud_credential_id = serializers.IntegerField()
+    workspace_type = serializers.ChoiceField(choices=Workspace.OS_TYPE_CHOICES)
+    bundle_id = serializers.CharField(max_length=255, required=False, allow_blank=True, default='')
+    # Optional directory username per application ID; defaults to the applicant's username
+    usernames = serializers.DictField(child=serializers.CharField(max_length=255), required=False, default=dict)
+    
+    def validate(self, attrs):
+        from jobs.models import Application
+        
+        user = self.context['request'].user
+        application_ids = list(dict.fromkeys(attrs['application_ids']))
+        
+        try:
+            credential = CloudCredential.objects.get(id=attrs['cloud_credential_id'], provider_user=user)
+        except CloudCredential.DoesNotExist:
+            raise serializers.ValidationError({"cloud_credential_id": "Cloud credential not found."})
+        
+        # Fixed number of queries for applications and existing workspaces, however many IDs are sent
+        applications = Application.objects.select_related('applicant', 'job__created_by').in_bulk(application_ids)
+        with_workspace = set(
+            Workspace.objects.filter(application_id__in=application_ids).values_list('application_id', flat=True)
+        )
+        
+        errors = {}
+        usernames = {}
+        for application_id in application_ids:
+            application = applications.get(application_id)
+            if application is None or application.job.created_by_id != user.id:
+                errors[str(application_id)] = "Application not found."
+            elif application.status != 'approved':
+                errors[str(application_id)] = "Application must be approved first."
+            elif application_id in with_workspace:
+                errors[str(application_id)] = "Workspace already exists for this application."
+            else:
+                applicant = application.applicant
+                usernames[application_id] = (
+                    attrs['usernames'].get(str(application_id))
+                    or applicant.username
+                    or applicant.email.split('@')[0]
+                )
+        
+        # Usernames identify rows in the CreateWorkspaces response, so they must be unique
+        seen = {}
+        for application_id, username in usernames.items():
+            if username in seen:
+                errors[str(application_id)] = f"Username '{username}' is also used by application {seen[username]}."
+            seen.setdefault(username, application_id)
+        
+        # Nor may they clash with a live workspace already created with the same credential
+        taken = set(
+            Workspace.objects.filter(cloud_credential=credential, username__in=seen)
+            .exclude(state='TERMINATED')
+            .values_list('username', flat=True)
+        )
+        for application_id, username in usernames.items():
+            if username in taken:
+                errors.setdefault(
+                    str(application_id), f"Username '{username}' already has a workspace on this credential."
+                )
+        
+        if errors:
+            raise serializers.ValidationError({"application_ids": errors})
+        
+        validate_bundle(credential, attrs.get('bundle_id'))
+        
+        attrs['applications'] = [applications[application_id] for application_id in application_ids]
+        attrs['resolved_usernames'] = usernames
+        attrs['cloud_credential'] = credential
+        return attrs
+    
+    def create(self, validated_data):
+        credential = validated_data['cloud_credential']
+        workspaces = [
+            Workspace(
+                application=application,
+                cloud_credential=credential,
+                cloud_provider=credential.cloud_provider,
+                workspace_type=validated_data['workspace_type'],
+                bundle_id=validated_data['bundle_id'],
+                username=validated_data['resolved_usernames'][application.id],
+                created_by=self.context['request'].user,
+                state='PENDING'
+            )
+            for application in validated_data['applications']
+        ]
+        workspaces = Workspace.objects.bulk_create(workspaces)
+        WorkspaceEvent.record(workspaces)
+        return workspaces
+
+
+class WorkspaceBulkActionSerializer(serializers.Serializer):
+    """Selects the provider's workspaces for a bulk lifecycle action by ID list and/or filters"""
+    
+    MAX_WORKSPACES = 1000
+    
+    workspace_ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        required=False,
+        allow_empty=False,
+        max_length=MAX_WORKSPACES
+    )
+    job_id = serializers.IntegerField(required=False)
+    cloud_credential_id = serializers.IntegerField(required=False)
+    states = serializers.ListField(
+        child=serializers.ChoiceField(choices=Workspace.STATE_CHOICES),
+        required=False,
+        allow_empty=False
+    )
+    
+    def validate(self, attrs):
+        if not attrs:
+            raise serializers.ValidationError(
+                "Provide workspace_ids or at least one filter (job_id, cloud_credential_id, states)."
+            )
+        
+        queryset = Workspace.objects.select_related('cloud_credential').filter(
+            created_by=self.context['request'].user
+        )
+        if 'workspace_ids' in attrs:
+            queryset = queryset.filter(id__in=attrs['workspace_ids'])
+        if 'job_id' in attrs:
+            queryset = queryset.filter(application__job_id=attrs['job_id'])
+        if 'cloud_credential_id' in attrs:
+            queryset = queryset.filter(cloud_credential_id=attrs['cloud_credential_id'])
+        if 'states' in attrs:
+            queryset = queryset.filter(state__in=attrs['states'])
+        
+        # One row past the limit is enough to tell the selection is too large
+        workspaces = list(queryset.order_by('id')[:self.MAX_WORKSPACES + 1])
+        if len(workspaces) > self.MAX_WORKSPACES:
+            raise serializers.ValidationError(
+                f"Selection matches more than {self.MAX_WORKSPACES} workspaces; narrow the filters."
+            )
+        
+        found = {workspace.id for workspace in workspaces}
+        attrs['workspaces'] = workspaces
+        attrs['missing_ids'] = [
+            workspace_id for workspace_id in dict.fromkeys(attrs.get('workspace_ids', []))
+            if workspace_id not in found
+        ]
+        return attrs
+
+
 class WorkspaceConnectionSerializer(serializers.ModelSerializer):
     """Serializer for workspace connection details"""
     
@@ -2,58 +2,195 @@
 Workspace background tasks and monitoring
 """
 
-import threading
-import time
 import logging
+import time
+from datetime import datetime, timedelta
 from typing import Optional
+from django.conf import settings
+from django.db.models import Q
 from django.utils import timezone
-from .models import Workspace, CloudCredential
-from .aws_service import AWSWorkSpacesService
+from .models import Workspace, WorkspaceEvent, CloudCredential
+from .aws_service import AWSWorkSpacesService, CREATE_BATCH_SIZE
 from .azure_service import AzureVirtualDesktopService
+from .async_api import release_connections
+from .poller import UPDATE_FIELDS as POLL_UPDATE_FIELDS, apply_aws_workspace_info, apply_azure_simulated_status
+from .queue import enqueue, RescheduleTask
+from .retry import backoff_delay, is_retryable, is_retryable_code
 
 logger = logging.getLogger(__name__)
 
+# Seconds a status refresh claim is honoured; one left by a crashed caller expires after this
+REFRESH_CLAIM_TIMEOUT = 30
+
+# Seconds between re-reads of a workspace whose status another caller is refreshing
+REFRESH_WAIT_INTERVAL = 0.2
+
+# Columns written by the creation tasks
+CREATION_FIELDS = ['workspace_id', 'state', 'error_message', 'updated_at']
+
 
 class WorkspaceManager:
     """Manages workspace creation and monitoring operations"""
     
+    # Transient creation errors are retried this many times before the workspace goes to ERROR
+    MAX_RETRIES = 3
+    
     @staticmethod
     def create_workspace_async(workspace_id: int) -> None:
         """
-        Create workspace asynchronously in a background thread
+        Queue workspace creation for the run_workspace_workers pool
         
         Args:
             workspace_id: ID of the workspace to create
         """
-        thread = threading.Thread(
-            target=WorkspaceManager._create_workspace_background,
-            args=(workspace_id,),
-            daemon=True
+        workspace = Workspace.objects.select_related('cloud_credential').get(id=workspace_id)
+        enqueue('create_workspace', workspace=workspace)
+    
+    @staticmethod
+    def create_workspaces_async(workspaces: list) -> None:
+        """
+        Queue creation of many workspaces, one task per CreateWorkspaces batch
+        
+        Args:
+            workspaces: Saved workspaces sharing one cloud credential
+        """
+        for start in range(0, len(workspaces), CREATE_BATCH_SIZE):
+            batch = workspaces[start:start + CREATE_BATCH_SIZE]
+            enqueue(
+                'create_workspace_batch',
+                cloud_credential=batch[0].cloud_credential,
+                payload={'workspace_ids': [workspace.id for workspace in batch]}
+            )
+    
+    @staticmethod
+    def create_workspaces_batch(workspace_ids: list, retry_count: int = 0) -> None:
+        """
+        Create queued workspaces with a single CreateWorkspaces call and map results back to rows
+        
+        Rows that failed with a transient error stay PENDING and the task is
+        rescheduled (RescheduleTask) with only those rows left to create.
+        """
+        workspaces = list(
+            Workspace.objects.select_related('cloud_credential', 'application__job', 'application__applicant')
+            .filter(id__in=workspace_ids, state='PENDING', workspace_id='')
         )
-        thread.start()
+        if not workspaces:
+            return
+        
+        credential = workspaces[0].cloud_credential
+        if credential.cloud_provider != 'aws':
+            # No batch API for Azure session hosts, so each gets its own task (and retries)
+            for workspace in workspaces:
+                enqueue('create_workspace', workspace=workspace)
+            return
+        
+        can_retry = retry_count < WorkspaceManager.MAX_RETRIES
+        retry_ids = []
+        
+        # UserName is unique within a directory, so it identifies the row in the response
+        by_username = {workspace.username: workspace for workspace in workspaces}
+        try:
+            service = AWSWorkSpacesService.for_credential(credential)
+            response = service.create_workspaces([
+                service.build_workspace_request(
+                    credential.directory_id,
+                    workspace.username,
+                    workspace.bundle_id,
+                    WorkspaceManager._workspace_tags(workspace, retry_count)
+                )
+                for workspace in workspaces
+            ])
+        except Exception as e:
+            logger.error(f"Error creating AWS workspace batch {workspace_ids}: {str(e)}")
+            response = {'PendingRequests': [], 'FailedRequests': []}
+            for workspace in workspaces:
+                workspace.error_message = str(e)
+            if can_retry and is_retryable(e):
+                retry_ids = [workspace.id for workspace in workspaces]
+        
+        answered = set(retry_ids)
+        for pending in response['PendingRequests']:
+            workspace = by_username.get(pending.get('UserName'))
+            if workspace is None:
+                continue
+            workspace.workspace_id = pending['WorkspaceId']
+            workspace.error_message = ''
+            answered.add(workspace.id)
+            logger.info(f"AWS workspace creation initiated: {workspace.workspace_id}")
+        
+        for failed in response['FailedRequests']:
+            workspace = by_username.get(failed.get('WorkspaceRequest', {}).get('UserName'))
+            if workspace is None:
+                continue
+            error_message = ': '.join(
+                part for part in [failed.get('ErrorCode'), failed.get('ErrorMessage')] if part
+            )
+            answered.add(workspace.id)
+            if can_retry and is_retryable_code(failed.get('ErrorCode')):
+                workspace.error_message = f"Retrying after: {error_message}"
+                retry_ids.append(workspace.id)
+                continue
+            workspace.state = 'ERROR'
+            workspace.error_message = f"Failed after {retry_count + 1} attempts: {error_message}"
+            logger.error(f"AWS workspace creation failed for {workspace.username}: {workspace.error_message}")
+        
+        for workspace in workspaces:
+            if workspace.id not in answered:
+                workspace.state = 'ERROR'
+                workspace.error_message = workspace.error_message or "No response from AWS WorkSpaces API"
+            workspace.updated_at = timezone.now()
+        
+        # Progress of the pending rows is tracked by the batched status poller (workspaces.poller)
+        Workspace.objects.bulk_update(workspaces, CREATION_FIELDS)
+        WorkspaceEvent.record(workspaces)
+        
+        if retry_ids:
+            delay = backoff_delay(retry_count)
+            logger.warning(f"Retrying {len(retry_ids)} workspaces of batch in {delay:.0f}s (attempt {retry_count + 1}/{WorkspaceManager.MAX_RETRIES})")
+            raise RescheduleTask(delay, f"{len(retry_ids)} workspaces hit a transient error")
     
     @staticmethod
-    def _create_workspace_background(workspace_id: int) -> None:
-        """Background task to create workspace with cloud provider"""
+    def _workspace_tags(workspace: Workspace, retry_count: int = 0) -> list:
+        return [
+            {'Key': 'JobTitle', 'Value': workspace.application.job.title},
+            {'Key': 'Applicant', 'Value': workspace.application.applicant.email},
+            {'Key': 'WorkspaceType', 'Value': workspace.workspace_type},
+            {'Key': 'ManagedBy', 'Value': 'JobPortal'},
+            {'Key': 'RetryCount', 'Value': str(retry_count)}
+        ]
+    
+    @staticmethod
+    def _create_workspace_background(workspace_id: int, retry_count: int = 0) -> None:
+        """
+        Background task to create workspace with cloud provider
+        
+        Transient provider errors raise RescheduleTask so the worker is freed
+        and the task runs again after a jittered backoff. The queue also runs a
+        task again after its lease expired, so a workspace that already has a
+        cloud ID or left PENDING is not created a second time.
+        """
         try:
-            workspace = Workspace.objects.get(id=workspace_id)
-            logger.info(f"Starting background workspace creation for {workspace_id}")
-            
-            # Update state to indicate processing has started
-            workspace.state = 'PENDING'
-            workspace.save()
+            workspace = Workspace.objects.select_related(
+                'cloud_credential', 'application__job', 'application__applicant'
+            ).get(id=workspace_id)
+            if workspace.workspace_id or workspace.state != 'PENDING':
+                logger.info(f"Workspace {workspace_id} is already being created ({workspace.state}), skipping")
+                return
+            logger.info(f"Starting background workspace creation for {workspace_id} (retry {retry_count})")
             
             credential = workspace.cloud_credential
             
             if credential.cloud_provider == 'aws':
-                WorkspaceManager._create_aws_workspace(workspace)
+                WorkspaceManager._create_aws_workspace(workspace, retry_count)
             elif credential.cloud_provider == 'azure':
-                WorkspaceManager._create_azure_workspace(workspace)
+                WorkspaceManager._create_azure_workspace(workspace, retry_count)
             else:
                 workspace.state = 'ERROR'
                 workspace.error_message = f"Unsupported cloud provider: {credential.cloud_provider}"
-                workspace.save()
+                workspace.save(update_fields=CREATION_FIELDS)
                 
+        except RescheduleTask:
+            raise
         except Workspace.DoesNotExist:
             logger.error(f"Workspace {workspace_id} not found")
         except Exception as e:
@@ -62,117 +199,78 @@ class WorkspaceManager:
                 workspace = Workspace.objects.get(id=workspace_id)
                 workspace.state = 'ERROR'
                 workspace.error_message = str(e)
-                workspace.save()
+                workspace.save(update_fields=CREATION_FIELDS)
             except:
                 pass
     
+    @staticmethod
+    def _schedule_retry(workspace: Workspace, retry_count: int, error_msg: str) -> None:
+        """Record a transient failure on the workspace and reschedule the creation task"""
+        delay = backoff_delay(retry_count)
+        logger.warning(
+            f"Retryable error creating {workspace.cloud_provider} workspace "
+            f"(attempt {retry_count + 1}/{WorkspaceManager.MAX_RETRIES}), retrying in {delay:.0f}s: {error_msg}"
+        )
+        workspace.error_message = f"Retrying after: {error_msg}"
+        workspace.save(update_fields=['error_message', 'updated_at'])
+        raise RescheduleTask(delay, error_msg)
+    
+    @staticmethod
+    def _fail_creation(workspace: Workspace, retry_count: int, error_msg: str) -> None:
+        workspace.state = 'ERROR'
+        workspace.error_message = f"Failed after {retry_count + 1} attempts: {error_msg}"
+        workspace.save(update_fields=CREATION_FIELDS)
+        logger.error(f"{workspace.cloud_provider.upper()} workspace creation failed permanently: {error_msg}")
+    
     @staticmethod
     def _create_aws_workspace(workspace: Workspace, retry_count: int = 0) -> None:
-        """Create AWS workspace with retry mechanism"""
+        """Create AWS workspace; transient errors are retried by rescheduling the task"""
         credential = workspace.cloud_credential
-        max_retries = 3
         
         try:
-            service = AWSWorkSpacesService(
-                access_key=credential.get_access_key(),
-                secret_key=credential.get_secret_key(),
-                region=credential.region
-            )
+            service = AWSWorkSpacesService.for_credential(credential)
             
             # Create the workspace
             response = service.create_workspace(
                 directory_id=credential.directory_id,
                 username=workspace.username,
                 bundle_id=workspace.bundle_id,
-                tags=[
-                    {'Key': 'JobTitle', 'Value': workspace.application.job.title},
-                    {'Key': 'Applicant', 'Value': workspace.application.applicant.email},
-                    {'Key': 'WorkspaceType', 'Value': workspace.workspace_type},
-                    {'Key': 'ManagedBy', 'Value': 'JobPortal'},
-                    {'Key': 'RetryCount', 'Value': str(retry_count)}
-                ]
+                tags=WorkspaceManager._workspace_tags(workspace, retry_count)
             )
-            
-            if response.get('FailedRequests'):
-                error_msg = response['FailedRequests'][0]['ErrorMessage']
-                error_code = response['FailedRequests'][0].get('ErrorCode', '')
-                
-                # Check if error is retryable
-                retryable_errors = [
-                    'ThrottlingException',
-                    'ServiceUnavailableException',
-                    'InternalServerError',
-                    'RequestLimitExceeded'
-                ]
-                
-                is_retryable = any(retryable in error_code for retryable in retryable_errors)
-                
-                if is_retryable and retry_count < max_retries:
-                    logger.warning(f"Retryable error creating AWS workspace (attempt {retry_count + 1}/{max_retries}): {error_msg}")
-                    # Exponential backoff: 2^retry_count * 30 seconds
-                    delay = (2 ** retry_count) * 30
-                    time.sleep(delay)
-                    WorkspaceManager._create_aws_workspace(workspace, retry_count + 1)
-                    return
-                else:
-                    workspace.state = 'ERROR'
-                    workspace.error_message = f"Failed after {retry_count + 1} attempts: {error_msg}"
-                    workspace.save()
-                    logger.error(f"AWS workspace creation failed permanently: {error_msg}")
-                    
-            elif response.get('PendingRequests'):
-                aws_workspace_id = response['PendingRequests'][0]['WorkspaceId']
-                workspace.workspace_id = aws_workspace_id
-                workspace.state = 'PENDING'
-                workspace.save()
-                logger.info(f"AWS workspace creation initiated: {aws_workspace_id}")
-                
-                # Start monitoring the workspace
-                WorkspaceManager.monitor_workspace_creation(workspace.id)
-            else:
-                workspace.state = 'ERROR'
-                workspace.error_message = "No response from AWS WorkSpaces API"
-                workspace.save()
-                
         except Exception as e:
-            error_msg = str(e)
-            
-            # Check if this is a retryable exception
-            retryable_exceptions = [
-                'ConnectionError',
-                'TimeoutError',
-                'SSLError',
-                'ReadTimeoutError'
-            ]
-            
-            is_retryable = any(retryable in error_msg for retryable in retryable_exceptions)
+            if is_retryable(e) and retry_count < WorkspaceManager.MAX_RETRIES:
+                WorkspaceManager._schedule_retry(workspace, retry_count, str(e))
+            WorkspaceManager._fail_creation(workspace, retry_count, str(e))
+            return
+        
+        if response.get('FailedRequests'):
+            error_msg = response['FailedRequests'][0]['ErrorMessage']
+            error_code = response['FailedRequests'][0].get('ErrorCode', '')
             
-            if is_retryable and retry_count < max_retries:
-                logger.warning(f"Retryable exception creating AWS workspace (attempt {retry_count + 1}/{max_retries}): {error_msg}")
-                delay = (2 ** retry_count) * 30
-                time.sleep(delay)
-                WorkspaceManager._create_aws_workspace(workspace, retry_count + 1)
-                return
-            else:
-                workspace.state = 'ERROR'
-                workspace.error_message = f"Failed after {retry_count + 1} attempts: {error_msg}"
-                workspace.save()
-                logger.error(f"Exception creating AWS workspace: {error_msg}")
+            if is_retryable_code(error_code) and retry_count < WorkspaceManager.MAX_RETRIES:
+                WorkspaceManager._schedule_retry(workspace, retry_count, f"{error_code}: {error_msg}")
+            WorkspaceManager._fail_creation(workspace, retry_count, error_msg)
+                
+        elif response.get('PendingRequests'):
+            aws_workspace_id = response['PendingRequests'][0]['WorkspaceId']
+            workspace.workspace_id = aws_workspace_id
+            workspace.state = 'PENDING'
+            workspace.error_message = ''
+            workspace.save(update_fields=CREATION_FIELDS)
+            logger.info(f"AWS workspace creation initiated: {aws_workspace_id}")
+            # Progress is tracked by the batched status poller (workspaces.poller)
+        else:
+            workspace.state = 'ERROR'
+            workspace.error_message = "No response from AWS WorkSpaces API"
+            workspace.save(update_fields=CREATION_FIELDS)
     
     @staticmethod
     def _create_azure_workspace(workspace: Workspace, retry_count: int = 0) -> None:
-        """Create Azure workspace with retry mechanism"""
+        """Create Azure workspace; transient errors are retried by rescheduling the task"""
         credential = workspace.cloud_credential
-        max_retries = 3
         
         try:
-            service = AzureVirtualDesktopService(
-                client_id=credential.get_access_key(),
-                client_secret=credential.get_secret_key(),
-                tenant_id=credential.tenant_id,
-                subscription_id=credential.subscription_id,
-                resource_group=credential.resource_group
-            )
+            service = AzureVirtualDesktopService.for_credential(credential)
             
             # Use bundle_id as host_pool_name for Azure
             # In a real implementation, you'd have a mapping or configuration
@@ -186,44 +284,23 @@ class WorkspaceManager:
                 vm_size=WorkspaceManager._get_azure_vm_size(workspace.bundle_id),
                 username=workspace.username
             )
-            
-            if response.get('status') == 'pending':
-                workspace.workspace_id = response['session_host_name']
-                workspace.state = 'PENDING'
-                workspace.save()
-                logger.info(f"Azure workspace creation initiated: {workspace.workspace_id}")
-                
-                # Start monitoring the workspace
-                WorkspaceManager.monitor_workspace_creation(workspace.id)
-            else:
-                workspace.state = 'ERROR'
-                workspace.error_message = f"Unexpected response from Azure: {response}"
-                workspace.save()
-                
         except Exception as e:
-            error_msg = str(e)
-            
-            # Check if this is a retryable exception
-            retryable_exceptions = [
-                'ConnectionError',
-                'TimeoutError',
-                'ServiceUnavailable',
-                'InternalError'
-            ]
-            
-            is_retryable = any(retryable in error_msg for retryable in retryable_exceptions)
-            
-            if is_retryable and retry_count < max_retries:
-                logger.warning(f"Retryable exception creating Azure workspace (attempt {retry_count + 1}/{max_retries}): {error_msg}")
-                delay = (2 ** retry_count) * 30
-                time.sleep(delay)
-                WorkspaceManager._create_azure_workspace(workspace, retry_count + 1)
-                return
-            else:
-                workspace.state = 'ERROR'
-                workspace.error_message = f"Failed after {retry_count + 1} attempts: {error_msg}"
-                workspace.save()
-                logger.error(f"Exception creating Azure workspace: {error_msg}")
+            if is_retryable(e) and retry_count < WorkspaceManager.MAX_RETRIES:
+                WorkspaceManager._schedule_retry(workspace, retry_count, str(e))
+            WorkspaceManager._fail_creation(workspace, retry_count, str(e))
+            return
+        
+        if response.get('status') == 'pending':
+            workspace.workspace_id = response['session_host_name']
+            workspace.state = 'PENDING'
+            workspace.error_message = ''
+            workspace.save(update_fields=CREATION_FIELDS)
+            logger.info(f"Azure workspace creation initiated: {workspace.workspace_id}")
+            # Progress is tracked by the batched status poller (workspaces.poller)
+        else:
+            workspace.state = 'ERROR'
+            workspace.error_message = f"Unexpected response from Azure: {response}"
+            workspace.save(update_fields=CREATION_FIELDS)
     
     @staticmethod
     def _get_azure_vm_size(bundle_id: str) -> str:
@@ -237,123 +314,49 @@ class WorkspaceManager:
         }
         return size_mapping.get(bundle_id, 'Standard_D2s_v3')
     
-    @staticmethod
-    def monitor_workspace_creation(workspace_id: int) -> None:
-        """
-        Monitor workspace creation progress in background
-        
-        Args:
-            workspace_id: ID of workspace to monitor
-        """
-        thread = threading.Thread(
-            target=WorkspaceManager._monitor_workspace_background,
-            args=(workspace_id,),
-            daemon=True
-        )
-        thread.start()
-    
-    @staticmethod
-    def _monitor_workspace_background(workspace_id: int) -> None:
-        """Background monitoring task"""
-        max_attempts = 60  # 30 minutes with 30-second intervals
-        attempt = 0
-        
-        while attempt < max_attempts:
-            try:
-                workspace = Workspace.objects.get(id=workspace_id)
-                
-                # Skip monitoring if workspace is no longer pending
-                if workspace.state not in ['PENDING']:
-                    logger.info(f"Stopping monitoring for workspace {workspace_id} (state: {workspace.state})")
-                    break
-                
-                credential = workspace.cloud_credential
-                
-                if credential.cloud_provider == 'aws':
-                    WorkspaceManager._check_aws_workspace_status(workspace)
-                elif credential.cloud_provider == 'azure':
-                    WorkspaceManager._check_azure_workspace_status(workspace)
-                
-                # Check if workspace is now available
-                workspace.refresh_from_db()
-                if workspace.state == 'AVAILABLE':
-                    logger.info(f"Workspace {workspace_id} is now available")
-                    break
-                elif workspace.state == 'ERROR':
-                    logger.error(f"Workspace {workspace_id} creation failed")
-                    break
-                
-                time.sleep(30)  # Wait 30 seconds before checking again
-                attempt += 1
-                
-            except Workspace.DoesNotExist:
-                logger.error(f"Workspace {workspace_id} not found during monitoring")
-                break
-            except Exception as e:
-                logger.error(f"Error monitoring workspace {workspace_id}: {str(e)}")
-                attempt += 1
-                time.sleep(30)
-        
-        if attempt >= max_attempts:
-            try:
-                workspace = Workspace.objects.get(id=workspace_id)
-                if workspace.state == 'PENDING':
-                    workspace.error_message = "Workspace creation timeout - please check manually"
-                    workspace.save()
-                    logger.warning(f"Monitoring timeout for workspace {workspace_id}")
-            except:
-                pass
-    
     @staticmethod
     def _check_aws_workspace_status(workspace: Workspace) -> None:
         """Check AWS workspace status"""
         credential = workspace.cloud_credential
         
         try:
-            service = AWSWorkSpacesService(
-                access_key=credential.get_access_key(),
-                secret_key=credential.get_secret_key(),
-                region=credential.region
-            )
+            service = AWSWorkSpacesService.for_credential(credential)
             
             workspace_info = service.get_workspace(workspace.workspace_id)
-            if workspace_info:
-                current_state = workspace_info.get('State')
-                
-                # Update workspace state
-                if current_state != workspace.state:
-                    workspace.state = current_state
-                    logger.info(f"Workspace {workspace.id} state updated to: {current_state}")
-                
-                # Update connection info if available
-                if current_state == 'AVAILABLE':
-                    connection_info = service.get_connection_info(workspace.workspace_id)
-                    if connection_info:
-                        workspace.connection_string = connection_info.get('connection_string', '')
-                
-                # Update error message if workspace failed
-                if current_state == 'ERROR' and workspace_info.get('ErrorMessage'):
-                    workspace.error_message = workspace_info['ErrorMessage']
-                
-                workspace.save()
-                
         except Exception as e:
             logger.error(f"Error checking AWS workspace status: {str(e)}")
+            WorkspaceManager._record_status_check(workspace, error=str(e))
+            return
+        changed = bool(workspace_info) and apply_aws_workspace_info(workspace, workspace_info)
+        WorkspaceManager._record_status_check(workspace, changed=changed)
     
     @staticmethod
     def _check_azure_workspace_status(workspace: Workspace) -> None:
         """Check Azure workspace status (placeholder)"""
         # TODO: Implement actual Azure status checking
-        # For now, just mark as available after some time
         try:
-            # Simulate workspace becoming available after 5 minutes
-            if workspace.created_at and (timezone.now() - workspace.created_at).seconds > 300:
-                workspace.state = 'AVAILABLE'
-                workspace.connection_string = f"ms-avd://{workspace.workspace_id}"
-                workspace.save()
-                logger.info(f"Azure workspace {workspace.id} marked as available (simulated)")
+            changed = apply_azure_simulated_status(workspace)
         except Exception as e:
             logger.error(f"Error checking Azure workspace status: {str(e)}")
+            WorkspaceManager._record_status_check(workspace, error=str(e))
+            return
+        WorkspaceManager._record_status_check(workspace, changed=changed)
+    
+    @staticmethod
+    def _record_status_check(workspace: Workspace, changed: bool = False, error: str = '') -> None:
+        """Store the outcome of a status read and release the refresh claim (see refresh_workspace_status)"""
+        now = timezone.now()
+        workspace.status_checked_at = now
+        workspace.status_check_error = error
+        workspace.status_refresh_claimed_at = None
+        fields = ['status_checked_at', 'status_check_error', 'status_refresh_claimed_at']
+        if not error:
+            workspace.last_polled_at = now
+            fields.append('last_polled_at')
+        if changed:
+            # Otherwise updated_at is left alone: the poller's PENDING timeout measures time without progress
+            fields += POLL_UPDATE_FIELDS
+        workspace.save(update_fields=fields)
 
 
 class BundleManager:
@@ -362,7 +365,7 @@ class BundleManager:
     @staticmethod
     def get_available_bundles(cloud_provider: str, credential: CloudCredential) -> list:
         """
-        Get available workspace bundles for a cloud provider
+        Get available workspace bundles for a cloud provider from the cached catalog
         
         Args:
             cloud_provider: 'aws' or 'azure'
@@ -371,48 +374,45 @@ class BundleManager:
         Returns:
             List of available bundles
         """
+        from .bundles import get_bundle_catalog
+        
         try:
-            if cloud_provider == 'aws':
-                return BundleManager._get_aws_bundles(credential)
-            elif cloud_provider == 'azure':
-                return BundleManager._get_azure_bundles(credential)
-            else:
-                return []
+            return get_bundle_catalog(credential).bundles
         except Exception as e:
             logger.error(f"Error getting bundles for {cloud_provider}: {str(e)}")
             return []
     
+    @staticmethod
+    def fetch_bundles(credential: CloudCredential) -> list:
+        """Fetch the bundle list live from the cloud provider (raises on API errors)"""
+        if credential.cloud_provider == 'aws':
+            return BundleManager._get_aws_bundles(credential)
+        elif credential.cloud_provider == 'azure':
+            return BundleManager._get_azure_bundles(credential)
+        return []
+    
     @staticmethod
     def _get_aws_bundles(credential: CloudCredential) -> list:
         """Get AWS WorkSpaces bundles"""
-        try:
-            service = AWSWorkSpacesService(
-                access_key=credential.get_access_key(),
-                secret_key=credential.get_secret_key(),
-                region=credential.region
-            )
-            
-            bundles = service.list_bundles()
-            
-            # Format bundles for API response
-            formatted_bundles = []
-            for bundle in bundles:
-                formatted_bundles.append({
-                    'bundle_id': bundle['BundleId'],
-                    'name': bundle['Name'],
-                    'description': bundle.get('Description', ''),
-                    'compute_type': bundle['ComputeType']['Name'],
-                    'user_storage': bundle['UserStorage']['Capacity'],
-                    'root_storage': bundle['RootStorage']['Capacity'],
-                    'owner': bundle.get('Owner', 'AMAZON'),
-                    'cloud_provider': 'aws'
-                })
-            
-            return formatted_bundles
-            
-        except Exception as e:
-            logger.error(f"Error getting AWS bundles: {str(e)}")
-            return []
+        service = AWSWorkSpacesService.for_credential(credential)
+        
+        bundles = service.list_bundles()
+        
+        # Format bundles for API response
+        formatted_bundles = []
+        for bundle in bundles:
+            formatted_bundles.append({
+                'bundle_id': bundle['BundleId'],
+                'name': bundle['Name'],
+                'description': bundle.get('Description', ''),
+                'compute_type': bundle['ComputeType']['Name'],
+                'user_storage': bundle['UserStorage']['Capacity'],
+                'root_storage': bundle['RootStorage']['Capacity'],
+                'owner': bundle.get('Owner', 'AMAZON'),
+                'cloud_provider': 'aws'
+            })
+        
+        return formatted_bundles
     
     @staticmethod
     def _get_azure_bundles(credential: CloudCredential) -> list:
@@ -442,34 +442,103 @@ class BundleManager:
         ]
 
 
-def refresh_workspace_status(workspace_id: int) -> dict:
+def _is_fresh(workspace: Workspace, max_age: float) -> bool:
+    checked_at = max(filter(None, [workspace.last_polled_at, workspace.status_checked_at]), default=None)
+    return checked_at is not None and (timezone.now() - checked_at).total_seconds() < max_age
+
+
+def _claim_refresh(workspace_id: int, max_age: float) -> Optional[datetime]:
+    """Claim time if this caller now owns the workspace's refresh, else None"""
+    now = timezone.now()
+    stale = now - timedelta(seconds=max_age)
+    # Conditional UPDATE, so one caller per workspace calls the cloud API
+    claimed = Workspace.objects.filter(id=workspace_id).filter(
+        Q(status_refresh_claimed_at__isnull=True)
+        | Q(status_refresh_claimed_at__lt=now - timedelta(seconds=REFRESH_CLAIM_TIMEOUT)),
+        Q(last_polled_at__isnull=True) | Q(last_polled_at__lt=stale),
+        Q(status_checked_at__isnull=True) | Q(status_checked_at__lt=stale),
+    ).update(status_refresh_claimed_at=now)
+    return now if claimed else None
+
+
+def _release_refresh(workspace_id: int, claimed_at: datetime) -> None:
+    # No-op once _record_status_check has stored the result, or if the claim expired and was taken over
+    Workspace.objects.filter(
+        id=workspace_id, status_refresh_claimed_at=claimed_at
+    ).update(status_refresh_claimed_at=None)
+
+
+def _status_result(workspace: Workspace, polled: bool) -> dict:
+    return {
+        'id': workspace.id,
+        'state': workspace.state,
+        'workspace_id': workspace.workspace_id,
+        'connection_string': workspace.connection_string,
+        'error_message': workspace.error_message,
+        'updated_at': workspace.updated_at,
+        'last_polled_at': workspace.last_polled_at,
+        'status_checked_at': workspace.status_checked_at,
+        'status_check_error': workspace.status_check_error,
+        'cached': not polled
+    }
+
+
+def refresh_workspace_status(workspace_id: int, max_age: Optional[float] = None) -> dict:
     """
     Manually refresh workspace status
     
+    A status read from the cloud less than ``max_age`` seconds ago (default
+    WORKSPACE_STATUS_MAX_AGE) is served from the row, and so is the error of
+    a failed read that recent. Otherwise one caller per workspace, across all
+    processes, claims the refresh with a conditional UPDATE and calls the cloud
+    API outside any transaction. Concurrent callers re-read the row, without
+    holding a connection in between, until that result is stored. The claim is
+    a row update, not an advisory lock, so it also works through PgBouncer in
+    transaction pooling mode.
+    
     Args:
         workspace_id: ID of workspace to refresh
+        max_age: Seconds a polled status counts as fresh
         
     Returns:
         Updated workspace info
     """
+    if max_age is None:
+        max_age = settings.WORKSPACE_STATUS_MAX_AGE
+    queryset = Workspace.objects.select_related('cloud_credential')
     try:
-        workspace = Workspace.objects.get(id=workspace_id)
-        credential = workspace.cloud_credential
+        workspace = queryset.get(id=workspace_id)
+        # Nothing to read from the cloud yet, so never claim (and never wait on) a refresh
+        if not workspace.cloud_credential or not workspace.workspace_id:
+            return _status_result(workspace, polled=False)
         
-        if credential.cloud_provider == 'aws':
-            WorkspaceManager._check_aws_workspace_status(workspace)
-        elif credential.cloud_provider == 'azure':
-            WorkspaceManager._check_azure_workspace_status(workspace)
+        polled = False
+        deadline = time.monotonic() + REFRESH_CLAIM_TIMEOUT
+        while not _is_fresh(workspace, max_age):
+            claimed_at = _claim_refresh(workspace_id, max_age)
+            if claimed_at:
+                try:
+                    workspace = queryset.get(id=workspace_id)
+                    # No connection is held during the cloud call
+                    release_connections()
+                    credential = workspace.cloud_credential
+                    if credential.cloud_provider == 'aws':
+                        WorkspaceManager._check_aws_workspace_status(workspace)
+                    elif credential.cloud_provider == 'azure':
+                        WorkspaceManager._check_azure_workspace_status(workspace)
+                    polled = True
+                finally:
+                    # Released even if the check raised, so later refreshes are not no-ops until the claim expires
+                    _release_refresh(workspace_id, claimed_at)
+                break
+            if time.monotonic() >= deadline:
+                break
+            # Another caller is refreshing; wait for its result without holding a connection
+            release_connections()
+            time.sleep(REFRESH_WAIT_INTERVAL)
+            workspace = queryset.get(id=workspace_id)
         
-        workspace.refresh_from_db()
-        return {
-            'id': workspace.id,
-            'state': workspace.state,
-            'workspace_id': workspace.workspace_id,
-            'connection_string': workspace.connection_string,
-            'error_message': workspace.error_message,
-            'updated_at': workspace.updated_at
-        }
+        return _status_result(workspace, polled)
         
     except Workspace.DoesNotExist:
         return {'error': 'Workspace not found'}
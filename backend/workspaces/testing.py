@@ -0,0 +1,26 @@
+"""
+Seed data shared by the workspace query count tests
+"""
+
+from .models import Workspace
+
+
+def create_workspaces(provider, applications, **fields):
+    """An AWS workspace for each application; every other one is imported with a password"""
+    workspaces = []
+    for index, application in enumerate(applications):
+        workspace = Workspace(**{
+            'application': application,
+            'cloud_provider': 'aws',
+            'workspace_type': 'ubuntu',
+            'username': f'seeker{application.id}',
+            'workspace_id': f'ws-test{application.id}',
+            'state': 'AVAILABLE',
+            'created_by': provider,
+            **fields,
+        })
+        # So the list tests exercise password decryption as well
+        if index % 2:
+            workspace.set_password(f'password-{index}')
+        workspaces.append(workspace)
+    return Workspace.objects.bulk_create(workspaces)
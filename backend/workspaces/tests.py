@@ -0,0 +1,85 @@
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory
+from jobs.testing import ListQueryCountTestCase, create_applications, create_provider, create_user
+from .models import CloudCredential
+from .serializers import WorkspaceBulkCreateSerializer
+from .testing import create_workspaces
+from .views import ProviderWorkspaceListView, SeekerWorkspaceListView, WorkspaceListCreateView
+
+
+class WorkspaceListQueryTests(ListQueryCountTestCase):
+
+    def setUp(self):
+        self.provider = create_provider()
+        self.seeker = create_user()
+
+    def add_workspaces(self, count):
+        create_workspaces(self.provider, create_applications(self.provider, self.seeker, count))
+
+    def test_workspace_list_for_provider(self):
+        self.add_workspaces(2)
+        self.assertConstantQueries(WorkspaceListCreateView, self.provider, lambda: self.add_workspaces(30))
+
+    def test_workspace_list_for_seeker(self):
+        self.add_workspaces(2)
+        self.assertConstantQueries(WorkspaceListCreateView, self.seeker, lambda: self.add_workspaces(30))
+
+    def test_provider_workspace_list(self):
+        self.add_workspaces(2)
+        self.assertConstantQueries(ProviderWorkspaceListView, self.provider, lambda: self.add_workspaces(30))
+
+    def test_seeker_workspace_list(self):
+        self.add_workspaces(2)
+        self.assertConstantQueries(SeekerWorkspaceListView, self.seeker, lambda: self.add_workspaces(30))
+
+    def test_sparse_workspace_list(self):
+        self.add_workspaces(2)
+        self.assertConstantQueries(
+            ProviderWorkspaceListView, self.provider, lambda: self.add_workspaces(30),
+            query='fields=id,state,application.job.title'
+        )
+
+
+class WorkspaceBulkCreateValidationTests(TestCase):
+
+    def setUp(self):
+        self.provider = create_provider()
+        self.seeker = create_user()
+        self.credential = CloudCredential.objects.create(
+            provider_user=self.provider, cloud_provider='aws', credential_name='Test',
+            access_key='key', secret_key='secret', region='us-east-1'
+        )
+
+    def validate(self, applications, usernames):
+        request = APIRequestFactory().post('/')
+        request.user = self.provider
+        serializer = WorkspaceBulkCreateSerializer(data={
+            'application_ids': [application.id for application in applications],
+            'cloud_credential_id': self.credential.id,
+            'workspace_type': 'ubuntu',
+            'usernames': {str(application.id): username for application, username in zip(applications, usernames)},
+        }, context={'request': request})
+        serializer.is_valid()
+        return serializer
+
+    def test_username_taken_on_the_credential(self):
+        existing = create_applications(self.provider, self.seeker, 1)
+        create_workspaces(self.provider, existing, cloud_credential=self.credential, username='analyst')
+        applications = create_applications(self.provider, self.seeker, 2)
+
+        serializer = self.validate(applications, ['analyst', 'responder'])
+        self.assertEqual(list(serializer.errors['application_ids']), [str(applications[0].id)])
+
+    def test_username_free_once_terminated_or_on_another_credential(self):
+        other = CloudCredential.objects.create(
+            provider_user=self.provider, cloud_provider='aws', credential_name='Other',
+            access_key='key', secret_key='secret', region='us-east-1'
+        )
+        existing = create_applications(self.provider, self.seeker, 2)
+        create_workspaces(self.provider, existing[:1], cloud_credential=self.credential, username='analyst',
+                          state='TERMINATED')
+        create_workspaces(self.provider, existing[1:], cloud_credential=other, username='responder')
+        applications = create_applications(self.provider, self.seeker, 2)
+
+        serializer = self.validate(applications, ['analyst', 'responder'])
+        self.assertEqual(serializer.errors, {})
@@ -11,12 +11,18 @@ from .views import (
     terminate_workspace,
     workspace_connection,
     import_workspace,
+    bulk_create_workspaces,
+    bulk_workspace_action,
+    workspace_event_stream,
+    workspace_event_ticket,
     refresh_workspace_status_view,
     retry_workspace_creation,
     workspace_troubleshooting,
     list_workspace_bundles,
     workspace_logs,
     workspace_metrics,
+    client_pool_stats,
+    rate_limit_stats,
     ProviderWorkspaceListView,
     SeekerWorkspaceListView
 )
@@ -32,6 +38,10 @@ urlpatterns = [
     # Workspace endpoints
     path('workspaces/', WorkspaceListCreateView.as_view(), name='workspace_list_create'),
     path('workspaces/import/', import_workspace, name='import_workspace'),
+    path('workspaces/bulk/', bulk_create_workspaces, name='bulk_create_workspaces'),
+    path('workspaces/bulk/<str:action>/', bulk_workspace_action, name='bulk_workspace_action'),
+    path('workspaces/events/', workspace_event_stream, name='workspace_event_stream'),
+    path('workspaces/events/ticket/', workspace_event_ticket, name='workspace_event_ticket'),
     path('workspaces/<int:pk>/', WorkspaceDetailView.as_view(), name='workspace_detail'),
     path('workspaces/<int:pk>/start/', start_workspace, name='start_workspace'),
     path('workspaces/<int:pk>/stop/', stop_workspace, name='stop_workspace'),
@@ -47,6 +57,10 @@ urlpatterns = [
     # Bundle endpoints
     path('bundles/<int:credential_id>/', list_workspace_bundles, name='list_workspace_bundles'),
     
+    # Operational metrics (staff only)
+    path('client-pool/stats/', client_pool_stats, name='client_pool_stats'),
+    path('rate-limits/stats/', rate_limit_stats, name='rate_limit_stats'),
+    
     # Role-specific endpoints
     path('provider/workspaces/', ProviderWorkspaceListView.as_view(), name='provider_workspaces'),
     path('seeker/workspaces/', SeekerWorkspaceListView.as_view(), name='seeker_workspaces'),
@@ -1,23 +1,38 @@
 from rest_framework import generics, status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, authentication_classes, permission_classes, renderer_classes
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import IntegrityError, transaction
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
-from .models import CloudCredential, Workspace
+from .models import CloudCredential, Workspace, WorkspaceEvent
 from .serializers import (
     CloudCredentialSerializer,
     CloudCredentialCreateSerializer,
     WorkspaceSerializer,
     WorkspaceCreateSerializer,
+    WorkspaceBulkCreateSerializer,
+    WorkspaceBulkActionSerializer,
     WorkspaceConnectionSerializer,
     WorkspaceImportSerializer,
-    WorkspaceUpdateSerializer
+    WorkspaceUpdateSerializer,
+    workspace_list_queryset
 )
 from .aws_service import AWSWorkSpacesService
 from .azure_service import AzureVirtualDesktopService
-from .tasks import WorkspaceManager, BundleManager, refresh_workspace_status
+from .tasks import WorkspaceManager, refresh_workspace_status
+from .async_api import async_api_view, run_db, run_service_call
+from .bundles import aget_bundle_catalog
+from .events import EventStreamRenderer, StreamTicketAuthentication, WorkspaceEventStream, issue_stream_ticket
+from .lifecycle import ACTIONS as LIFECYCLE_ACTIONS, run_bulk_action
+from . import clients as workspace_clients
+from . import ratelimit
 from jobs.permissions import IsJobProvider
+from jobs.sparse_fields import SparseFieldsViewMixin
 
 
 class CloudCredentialListCreateView(generics.ListCreateAPIView):
@@ -44,13 +59,23 @@ class CloudCredentialDetailView(generics.RetrieveUpdateDestroyAPIView):
         if self.request.method in ['PUT', 'PATCH']:
             return CloudCredentialCreateSerializer
         return CloudCredentialSerializer
+    
+    def perform_update(self, serializer):
+        credential = serializer.save()
+        workspace_clients.invalidate_credential(credential.id)
+    
+    def perform_destroy(self, instance):
+        credential_id = instance.id
+        instance.delete()
+        workspace_clients.invalidate_credential(credential_id)
+        ratelimit.forget_credential(credential_id)
 
 
-@api_view(['POST'])
+@async_api_view(['POST'])
 @permission_classes([IsAuthenticated, IsJobProvider])
-def test_cloud_credential(request, pk):
+async def test_cloud_credential(request, pk):
     """Test if cloud credentials are valid"""
-    credential = get_object_or_404(CloudCredential, pk=pk, provider_user=request.user)
+    credential = await run_db(get_object_or_404, CloudCredential, pk=pk, provider_user=request.user)
     
     # Validate required fields before testing
     validation_errors = []
@@ -94,12 +119,9 @@ def test_cloud_credential(request, pk):
     # Attempt to test credentials
     try:
         if credential.cloud_provider == 'aws':
-            service = AWSWorkSpacesService(
-                access_key=credential.get_access_key(),
-                secret_key=credential.get_secret_key(),
-                region=credential.region
+            is_valid = await run_service_call(
+                AWSWorkSpacesService, credential, 'test_credentials', credential.directory_id
             )
-            is_valid = service.test_credentials(credential.directory_id)
             
             if is_valid:
                 return Response({
@@ -119,14 +141,7 @@ def test_cloud_credential(request, pk):
                 )
         
         elif credential.cloud_provider == 'azure':
-            service = AzureVirtualDesktopService(
-                client_id=credential.get_access_key(),
-                client_secret=credential.get_secret_key(),
-                tenant_id=credential.tenant_id,
-                subscription_id=credential.subscription_id,
-                resource_group=credential.resource_group
-            )
-            is_valid = service.test_credentials()
+            is_valid = await run_service_call(AzureVirtualDesktopService, credential, 'test_credentials')
             
             if is_valid:
                 return Response({
@@ -176,7 +191,7 @@ def test_cloud_credential(request, pk):
         )
 
 
-class WorkspaceListCreateView(generics.ListCreateAPIView):
+class WorkspaceListCreateView(SparseFieldsViewMixin, generics.ListCreateAPIView):
     """List or create workspaces"""
     permission_classes = [IsAuthenticated]
     
@@ -185,10 +200,10 @@ class WorkspaceListCreateView(generics.ListCreateAPIView):
         
         # Provider sees their created workspaces
         if user.user_type == 'org_provider':
-            return Workspace.objects.filter(created_by=user)
+            return workspace_list_queryset().filter(created_by=user)
         
         # Seekers see workspaces assigned to them
-        return Workspace.objects.filter(application__applicant=user)
+        return workspace_list_queryset().filter(application__applicant=user)
     
     def get_serializer_class(self):
         if self.request.method == 'POST':
@@ -235,8 +250,8 @@ class WorkspaceDetailView(generics.RetrieveUpdateDestroyAPIView):
     def get_queryset(self):
         user = self.request.user
         if user.user_type == 'org_provider':
-            return Workspace.objects.filter(created_by=user)
-        return Workspace.objects.filter(application__applicant=user)
+            return workspace_list_queryset().filter(created_by=user)
+        return workspace_list_queryset().filter(application__applicant=user)
     
     def get_serializer_class(self):
         if self.request.method in ['PUT', 'PATCH']:
@@ -282,11 +297,7 @@ class WorkspaceDetailView(generics.RetrieveUpdateDestroyAPIView):
                 
                 # For AWS, termination permanently deletes the workspace
                 if credential.cloud_provider == 'aws':
-                    service = AWSWorkSpacesService(
-                        access_key=credential.get_access_key(),
-                        secret_key=credential.get_secret_key(),
-                        region=credential.region
-                    )
+                    service = AWSWorkSpacesService.for_credential(credential)
                     
                     # Terminate/Delete the workspace in AWS
                     response = service.terminate_workspace(instance.workspace_id)
@@ -340,11 +351,16 @@ class WorkspaceDetailView(generics.RetrieveUpdateDestroyAPIView):
         return response
 
 
-@api_view(['POST'])
+def _get_provider_workspace(user, pk):
+    # The async views read the credential without a database connection, so it is loaded here
+    return get_object_or_404(Workspace.objects.select_related('cloud_credential'), pk=pk, created_by=user)
+
+
+@async_api_view(['POST'])
 @permission_classes([IsAuthenticated, IsJobProvider])
-def start_workspace(request, pk):
+async def start_workspace(request, pk):
     """Start a stopped workspace"""
-    workspace = get_object_or_404(Workspace, pk=pk, created_by=request.user)
+    workspace = await run_db(_get_provider_workspace, request.user, pk)
     
     if not workspace.cloud_credential:
         return Response(
@@ -362,25 +378,20 @@ def start_workspace(request, pk):
         credential = workspace.cloud_credential
         
         if credential.cloud_provider == 'aws':
-            service = AWSWorkSpacesService(
-                access_key=credential.get_access_key(),
-                secret_key=credential.get_secret_key(),
-                region=credential.region
-            )
-            service.start_workspace(workspace.workspace_id)
+            await run_service_call(AWSWorkSpacesService, credential, 'start_workspace', workspace.workspace_id)
             workspace.state = 'STARTING'
-            workspace.save()
+            await run_db(workspace.save)
         
         return Response({"message": "Workspace starting", "state": workspace.state})
     except Exception as e:
         return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 
-@api_view(['POST'])
+@async_api_view(['POST'])
 @permission_classes([IsAuthenticated, IsJobProvider])
-def stop_workspace(request, pk):
+async def stop_workspace(request, pk):
     """Stop a running workspace"""
-    workspace = get_object_or_404(Workspace, pk=pk, created_by=request.user)
+    workspace = await run_db(_get_provider_workspace, request.user, pk)
     
     if not workspace.cloud_credential:
         return Response(
@@ -398,25 +409,20 @@ def stop_workspace(request, pk):
         credential = workspace.cloud_credential
         
         if credential.cloud_provider == 'aws':
-            service = AWSWorkSpacesService(
-                access_key=credential.get_access_key(),
-                secret_key=credential.get_secret_key(),
-                region=credential.region
-            )
-            service.stop_workspace(workspace.workspace_id)
+            await run_service_call(AWSWorkSpacesService, credential, 'stop_workspace', workspace.workspace_id)
             workspace.state = 'STOPPING'
-            workspace.save()
+            await run_db(workspace.save)
         
         return Response({"message": "Workspace stopping", "state": workspace.state})
     except Exception as e:
         return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 
-@api_view(['POST'])
+@async_api_view(['POST'])
 @permission_classes([IsAuthenticated, IsJobProvider])
-def restart_workspace(request, pk):
+async def restart_workspace(request, pk):
     """Restart a workspace"""
-    workspace = get_object_or_404(Workspace, pk=pk, created_by=request.user)
+    workspace = await run_db(_get_provider_workspace, request.user, pk)
     
     if not workspace.cloud_credential:
         return Response(
@@ -428,30 +434,28 @@ def restart_workspace(request, pk):
         credential = workspace.cloud_credential
         
         if credential.cloud_provider == 'aws':
-            service = AWSWorkSpacesService(
-                access_key=credential.get_access_key(),
-                secret_key=credential.get_secret_key(),
-                region=credential.region
-            )
-            service.reboot_workspace(workspace.workspace_id)
+            await run_service_call(AWSWorkSpacesService, credential, 'reboot_workspace', workspace.workspace_id)
             workspace.state = 'REBOOTING'
-            workspace.save()
+            await run_db(workspace.save)
         
         return Response({"message": "Workspace rebooting", "state": workspace.state})
     except Exception as e:
         return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 
-@api_view(['GET'])
+@async_api_view(['GET'])
 @permission_classes([IsAuthenticated])
-def workspace_connection(request, pk):
+async def workspace_connection(request, pk):
     """Get workspace connection information"""
     user = request.user
     
     if user.user_type == 'org_provider':
-        workspace = get_object_or_404(Workspace, pk=pk, created_by=user)
+        workspace = await run_db(_get_provider_workspace, user, pk)
     else:
-        workspace = get_object_or_404(Workspace, pk=pk, application__applicant=user)
+        workspace = await run_db(
+            get_object_or_404, Workspace.objects.select_related('cloud_credential'),
+            pk=pk, application__applicant=user
+        )
     
     try:
         # If workspace has no cloud credential, return basic connection info
@@ -462,19 +466,15 @@ def workspace_connection(request, pk):
         credential = workspace.cloud_credential
         
         if credential.cloud_provider == 'aws':
-            service = AWSWorkSpacesService(
-                access_key=credential.get_access_key(),
-                secret_key=credential.get_secret_key(),
-                region=credential.region
+            # One DescribeWorkspaces call gives both the connection info and the current state
+            connection_info = await run_service_call(
+                AWSWorkSpacesService, credential, 'get_connection_info', workspace.workspace_id
             )
-            connection_info = service.get_connection_info(workspace.workspace_id)
-            
-            # Update workspace state
-            workspace_data = service.get_workspace(workspace.workspace_id)
-            if workspace_data:
-                workspace.state = workspace_data['State']
+            if connection_info:
+                workspace.state = connection_info['state']
                 workspace.connection_string = connection_info['connection_string']
-                workspace.save()
+                workspace.last_polled_at = timezone.now()
+                await run_db(workspace.save)
         
         serializer = WorkspaceConnectionSerializer(workspace)
         return Response(serializer.data)
@@ -496,22 +496,135 @@ def import_workspace(request):
     )
 
 
-class ProviderWorkspaceListView(generics.ListAPIView):
+@api_view(['POST'])
+@permission_classes([IsAuthenticated, IsJobProvider])
+def bulk_create_workspaces(request):
+    """Create workspaces for many approved applications, provisioned in batches of 25"""
+    serializer = WorkspaceBulkCreateSerializer(data=request.data, context={'request': request})
+    serializer.is_valid(raise_exception=True)
+    
+    try:
+        with transaction.atomic():
+            workspaces = serializer.save()
+    except IntegrityError:
+        # Another request created a workspace for one of the applications meanwhile
+        return Response(
+            {"error": "Workspace already exists for one of the applications."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    # Initiate workspace creation with cloud provider in background
+    try:
+        WorkspaceManager.create_workspaces_async(workspaces)
+    except Exception as e:
+        Workspace.objects.filter(id__in=[workspace.id for workspace in workspaces]).update(
+            state='ERROR', error_message=str(e), updated_at=timezone.now()
+        )
+        for workspace in workspaces:
+            workspace.state = 'ERROR'
+            workspace.error_message = str(e)
+        WorkspaceEvent.record(workspaces)
+    
+    return Response(
+        {
+            "count": len(workspaces),
+            "workspaces": WorkspaceSerializer(workspaces, many=True, context={'request': request}).data
+        },
+        status=status.HTTP_201_CREATED
+    )
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated, IsJobProvider])
+def bulk_workspace_action(request, action):
+    """Start, stop, restart or terminate many workspaces, selected by ID list and/or filters"""
+    if action not in LIFECYCLE_ACTIONS:
+        return Response(
+            {"error": f"Unknown action '{action}'. Use one of: {', '.join(LIFECYCLE_ACTIONS)}."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    serializer = WorkspaceBulkActionSerializer(data=request.data, context={'request': request})
+    serializer.is_valid(raise_exception=True)
+    workspaces = serializer.validated_data['workspaces']
+    missing_ids = serializer.validated_data['missing_ids']
+    
+    if not workspaces and not missing_ids:
+        return Response({"error": "No workspaces matched the selection."}, status=status.HTTP_400_BAD_REQUEST)
+    
+    results = run_bulk_action(action, workspaces)
+    results.extend(
+        {"id": workspace_id, "status": "failed", "error": "Workspace not found."}
+        for workspace_id in missing_ids
+    )
+    
+    summary = {outcome: 0 for outcome in ('ok', 'failed', 'skipped')}
+    for result in results:
+        summary[result['status']] += 1
+    
+    return Response({
+        "action": action,
+        "count": len(results),
+        "succeeded": summary['ok'],
+        "failed": summary['failed'],
+        "skipped": summary['skipped'],
+        "results": results
+    })
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def workspace_event_ticket(request):
+    """Single-use ticket for opening the event stream with ?ticket= (EventSource cannot send headers)"""
+    return Response({
+        'ticket': issue_stream_ticket(request.user),
+        'expires_in': settings.WORKSPACE_EVENT_TICKET_TTL
+    }, status=status.HTTP_201_CREATED)
+
+
+@api_view(['GET'])
+@authentication_classes([JWTAuthentication, StreamTicketAuthentication])
+@permission_classes([IsAuthenticated])
+@renderer_classes([EventStreamRenderer])
+def workspace_event_stream(request):
+    """Server-Sent Events stream of state changes of the user's workspaces (optionally one, via ?workspace=)"""
+    try:
+        last_event_id = request.headers.get('Last-Event-ID') or request.query_params.get('last_event_id')
+        last_event_id = int(last_event_id) if last_event_id else None
+        workspace_pk = request.query_params.get('workspace')
+        workspace_pk = int(workspace_pk) if workspace_pk else None
+    except ValueError:
+        return Response(
+            {"error": "last_event_id and workspace must be integers."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    stream = WorkspaceEventStream(request.user, last_event_id, workspace_pk)
+    # WSGI servers would buffer an async iterator whole, so they get the blocking
+    # one, which reads once and closes instead of holding a worker (see workspaces.events)
+    content = stream.__aiter__() if isinstance(request._request, ASGIRequest) else iter(stream)
+    response = StreamingHttpResponse(content, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+class ProviderWorkspaceListView(SparseFieldsViewMixin, generics.ListAPIView):
     """List all workspaces created by provider"""
     serializer_class = WorkspaceSerializer
     permission_classes = [IsAuthenticated, IsJobProvider]
     
     def get_queryset(self):
-        return Workspace.objects.filter(created_by=self.request.user)
+        return workspace_list_queryset().filter(created_by=self.request.user)
 
 
-class SeekerWorkspaceListView(generics.ListAPIView):
+class SeekerWorkspaceListView(SparseFieldsViewMixin, generics.ListAPIView):
     """List all workspaces assigned to seeker"""
     serializer_class = WorkspaceSerializer
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
-        return Workspace.objects.filter(application__applicant=self.request.user)
+        return workspace_list_queryset().filter(application__applicant=self.request.user)
     
     def get_serializer_context(self):
         """Add request to serializer context"""
@@ -520,16 +633,15 @@ class SeekerWorkspaceListView(generics.ListAPIView):
         return context
 
 
-@api_view(['GET'])
+@async_api_view(['GET'])
 @permission_classes([IsAuthenticated, IsJobProvider])
-def list_workspace_bundles(request, credential_id):
+async def list_workspace_bundles(request, credential_id):
     """List available workspace bundles for a cloud credential with grouping"""
     try:
-        credential = get_object_or_404(CloudCredential, pk=credential_id, provider_user=request.user)
+        credential = await run_db(get_object_or_404, CloudCredential, pk=credential_id, provider_user=request.user)
         
-        bundles = BundleManager.get_available_bundles(credential.cloud_provider, credential)
-
-        print(bundles)
+        catalog = await aget_bundle_catalog(credential)
+        bundles = catalog.bundles
         
         # Group bundles by type for better frontend organization
         bundles_by_type = {}
@@ -577,8 +689,10 @@ def list_workspace_bundles(request, credential_id):
             "total_count": len(bundles),
             "available_types": sorted(list(bundle_types)),
             "metadata": {
-                "last_updated": timezone.now().isoformat(),
-                "source": f"{credential.cloud_provider.upper()} API"
+                # None if the catalog row exists but no fetch has stored bundles yet
+                "last_updated": catalog.fetched_at.isoformat() if catalog.fetched_at else None,
+                "source": f"{credential.cloud_provider.upper()} API (cached catalog)",
+                "stale": catalog.is_stale(settings.BUNDLE_CATALOG_TTL)
             }
         })
         
@@ -626,11 +740,11 @@ def refresh_workspace_status_view(request, pk):
 
 
 # Workspace lifecycle management endpoints
-@api_view(['POST'])
+@async_api_view(['POST'])
 @permission_classes([IsAuthenticated, IsJobProvider])
-def terminate_workspace(request, pk):
+async def terminate_workspace(request, pk):
     """Terminate a workspace permanently and delete from AWS"""
-    workspace = get_object_or_404(Workspace, pk=pk, created_by=request.user)
+    workspace = await run_db(_get_provider_workspace, request.user, pk)
     
     if workspace.state in ['TERMINATED']:
         return Response(
@@ -641,7 +755,7 @@ def terminate_workspace(request, pk):
     # If no cloud credential, just mark as terminated in database
     if not workspace.cloud_credential:
         workspace.state = 'TERMINATED'
-        workspace.save()
+        await run_db(workspace.save)
         return Response({
             "message": "Workspace marked as terminated (no cloud credential assigned, cannot delete from cloud)",
             "state": workspace.state
@@ -653,14 +767,10 @@ def terminate_workspace(request, pk):
         error_message = None
         
         if credential.cloud_provider == 'aws':
-            service = AWSWorkSpacesService(
-                access_key=credential.get_access_key(),
-                secret_key=credential.get_secret_key(),
-                region=credential.region
-            )
-            
             # Terminate the workspace in AWS
-            response = service.terminate_workspace(workspace.workspace_id)
+            response = await run_service_call(
+                AWSWorkSpacesService, credential, 'terminate_workspace', workspace.workspace_id
+            )
             
             # Check if termination was successful
             if response.get('FailedRequests'):
@@ -681,7 +791,7 @@ def terminate_workspace(request, pk):
         # Update workspace state if termination was successful
         if termination_success:
             workspace.state = 'TERMINATED'
-            workspace.save()
+            await run_db(workspace.save)
             return Response({
                 "message": "Workspace terminated successfully in cloud provider", 
                 "state": workspace.state
@@ -872,3 +982,16 @@ def workspace_troubleshooting(request, pk):
     
     return Response(troubleshooting_info)
 
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsAdminUser])
+def client_pool_stats(request):
+    """Hit/miss and client construction metrics of this process's cloud client pool"""
+    return Response(workspace_clients.get_stats())
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsAdminUser])
+def rate_limit_stats(request):
+    """Current API rate and throttling counters per credential and operation in this process"""
+    return Response({'buckets': ratelimit.get_stats()})
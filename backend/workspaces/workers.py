@@ -0,0 +1,124 @@
+"""
+Bounded worker pool for workspace tasks
+
+A fixed number of threads claim tasks from the durable queue (see
+``workspaces.queue``), so a bulk onboarding cannot spawn unbounded threads and
+in-flight work is picked up again after a restart.
+"""
+
+import logging
+import os
+import socket
+import threading
+import time
+from django.db import close_old_connections, connection
+from .models import WorkspaceTask
+from .queue import (
+    claim_next_task,
+    complete_task,
+    fail_task,
+    reschedule_task,
+    requeue_stale_tasks,
+    RescheduleTask,
+)
+from .tasks import WorkspaceManager
+from .bundles import refresh_bundles_task
+
+logger = logging.getLogger(__name__)
+
+
+def _retry_count(task: WorkspaceTask) -> int:
+    # attempts is incremented on claim, so the first run is retry 0
+    return max(task.attempts - 1, 0)
+
+
+def _create_workspace(task: WorkspaceTask) -> None:
+    WorkspaceManager._create_workspace_background(task.workspace_id, _retry_count(task))
+
+
+def _create_workspace_batch(task: WorkspaceTask) -> None:
+    WorkspaceManager.create_workspaces_batch(task.payload['workspace_ids'], _retry_count(task))
+
+
+TASK_HANDLERS = {
+    'create_workspace': _create_workspace,
+    'create_workspace_batch': _create_workspace_batch,
+    'refresh_bundles': refresh_bundles_task,
+}
+
+
+def run_task(task: WorkspaceTask) -> None:
+    """Run a claimed task and record its outcome"""
+    handler = TASK_HANDLERS.get(task.task_type)
+    if handler is None:
+        fail_task(task, f"No handler for task type '{task.task_type}'")
+        return
+
+    try:
+        handler(task)
+    except RescheduleTask as e:
+        reschedule_task(task, e.delay, str(e))
+    except Exception as e:
+        logger.exception(f"Workspace task {task.id} ({task.task_type}) failed")
+        fail_task(task, str(e))
+    else:
+        complete_task(task)
+
+
+class WorkspaceWorkerPool:
+    """Fixed-size pool of threads processing the workspace task queue"""
+
+    def __init__(self, concurrency: int = 4, poll_interval: float = 2.0, lease_seconds: float = 900):
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self._stop = threading.Event()
+        self._threads = []
+        self._name = f"{socket.gethostname()}:{os.getpid()}"
+
+    def start(self) -> None:
+        requeue_stale_tasks(self.lease_seconds)
+        for index in range(self.concurrency):
+            thread = threading.Thread(
+                target=self._run,
+                args=(f"{self._name}:{index}",),
+                name=f"workspace-worker-{index}",
+                daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"Started {self.concurrency} workspace workers")
+
+    def stop(self, timeout: float = None) -> None:
+        """Stop claiming new tasks and wait for in-flight tasks to finish"""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def is_running(self) -> bool:
+        return any(thread.is_alive() for thread in self._threads)
+
+    def _run(self, worker_id: str) -> None:
+        last_housekeeping = time.monotonic()
+        try:
+            while not self._stop.is_set():
+                close_old_connections()
+                try:
+                    if time.monotonic() - last_housekeeping > self.lease_seconds / 2:
+                        requeue_stale_tasks(self.lease_seconds)
+                        last_housekeeping = time.monotonic()
+
+                    task = claim_next_task(worker_id)
+                except Exception as e:
+                    logger.error(f"Worker {worker_id} could not claim a task: {str(e)}")
+                    task = None
+
+                if task is None:
+                    # Do not sit on a pooled connection while idle
+                    close_old_connections()
+                    self._stop.wait(self.poll_interval)
+                    continue
+
+                run_task(task)
+        finally:
+            connection.close()
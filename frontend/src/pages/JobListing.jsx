@@ -90,7 +90,7 @@ export default function JobListing() {
       const jobsToSearch = allJobs.length > 0 ? allJobs : jobs;
       const allSearchableText = jobsToSearch.flatMap(job => [
         job.title,
-        job.description,
+        job.summary,
         job.location,
         ...(job.skills_required || [])
       ]);
@@ -385,7 +385,7 @@ export default function JobListing() {
                 </div>
               </CardHeader>
               <CardContent>
-                <p className="text-gray-600 mb-4 line-clamp-2">{job.description}</p>
+                <p className="text-gray-600 mb-4 line-clamp-2">{job.summary}</p>
                 
                 <div className="flex flex-wrap gap-4 mb-4">
                   <div className="flex items-center text-sm text-gray-600">
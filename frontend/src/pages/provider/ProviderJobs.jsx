@@ -1,6 +1,7 @@
 import { useEffect, useState } from 'react';
 import { Link } from 'react-router-dom';
 import { useJobStore } from '../../store/jobStore';
+import { jobService } from '../../services/jobService';
 import { Button } from '../../components/ui/button';
 import { Input } from '../../components/ui/input';
 import { Textarea } from '../../components/ui/textarea';
@@ -110,7 +111,15 @@ export default function ProviderJobs() {
     }
   };
 
-  const openEditDialog = (job) => {
+  const openEditDialog = async (listedJob) => {
+    // The job list only carries a summary, so load the full text before editing
+    let job;
+    try {
+      job = await jobService.getJob(listedJob.id);
+    } catch (error) {
+      toast.error('Failed to load job');
+      return;
+    }
     setSelectedJob(job);
     setJobForm({
       title: job.title,
@@ -353,7 +362,7 @@ export default function ProviderJobs() {
               </CardHeader>
 
               <CardContent>
-                <p className="text-gray-700 mb-4 line-clamp-2">{job.description}</p>
+                <p className="text-gray-700 mb-4 line-clamp-2">{job.summary}</p>
 
                 <div className="flex flex-wrap gap-3 mb-4 text-sm text-gray-600">
                   <span>{job.location}</span>
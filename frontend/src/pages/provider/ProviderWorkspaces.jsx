@@ -2,6 +2,7 @@ import { useEffect, useState } from 'react';
 import { useSearchParams } from 'react-router-dom';
 import { useWorkspaceStore } from '../../store/workspaceStore';
 import { useJobStore } from '../../store/jobStore';
+import { workspaceService } from '../../services/workspaceService';
 import { Button } from '../../components/ui/button';
 import { Input } from '../../components/ui/input';
 import { Label } from '../../components/ui/label';
@@ -193,8 +194,8 @@ export default function ProviderWorkspaces() {
         });
         setCredentialsDialogOpen(true);
         
-        // Poll for updated credentials (registration code and password may be available later)
-        const pollInterval = setInterval(async () => {
+        // Refetch on each state change pushed by the server (registration code and password may be available later)
+        const unsubscribe = workspaceService.subscribeToWorkspaceEvents(async () => {
           try {
             await fetchWorkspace(createdWorkspace.id);
             await fetchWorkspaces();
@@ -223,18 +224,18 @@ export default function ProviderWorkspaces() {
                 });
               }
               
-              // Stop polling if workspace is AVAILABLE or ERROR
+              // Stop listening once the workspace is AVAILABLE or ERROR
               if (updatedWorkspace.state === 'AVAILABLE' || updatedWorkspace.state === 'ERROR') {
-                clearInterval(pollInterval);
+                unsubscribe();
               }
             }
           } catch (error) {
             console.error('Failed to fetch workspace details:', error);
           }
-        }, 5000); // Poll every 5 seconds
+        }, { workspaceId: createdWorkspace.id });
         
-        // Stop polling after 5 minutes
-        setTimeout(() => clearInterval(pollInterval), 300000);
+        // Stop listening after 15 minutes
+        setTimeout(unsubscribe, 900000);
       }
       
       fetchWorkspaces();
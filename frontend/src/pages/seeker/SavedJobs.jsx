@@ -89,7 +89,7 @@ export default function SavedJobs() {
 
               <CardContent className="space-y-4">
                 <p className="text-sm text-gray-600 line-clamp-3">
-                  {savedJob.job.description}
+                  {savedJob.job.summary}
                 </p>
 
                 <div className="space-y-2 text-sm">
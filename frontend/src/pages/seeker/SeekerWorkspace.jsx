@@ -14,6 +14,16 @@ export default function SeekerWorkspace() {
 
   useEffect(() => {
     loadWorkspaces();
+
+    // Reload quietly whenever one of the workspaces changes state
+    return workspaceService.subscribeToWorkspaceEvents(async () => {
+      try {
+        const data = await workspaceService.getSeekerWorkspaces();
+        setWorkspaces(Array.isArray(data) ? data : data.results || []);
+      } catch (error) {
+        console.error('Failed to reload workspaces:', error);
+      }
+    });
   }, []);
 
   const loadWorkspaces = async () => {
@@ -303,7 +313,7 @@ export default function SeekerWorkspace() {
                   <div className="bg-yellow-50 border border-yellow-200 rounded p-4">
                     <p className="text-sm text-yellow-800">
                       ⏳ Workspace is being provisioned. This may take 5-10 minutes.
-                      Please refresh this page periodically to check the status.
+                      This page updates automatically when the status changes.
                     </p>
                   </div>
                 )}
@@ -1,4 +1,4 @@
-import api from './api';
+import api, { API_URL } from './api';
 
 export const workspaceService = {
   // Cloud Credentials
@@ -98,6 +98,53 @@ export const workspaceService = {
     return response.data;
   },
 
+  // Live workspace state changes (Server-Sent Events). Returns a function that closes the stream.
+  subscribeToWorkspaceEvents(onEvent, { workspaceId } = {}) {
+    let source;
+    let closed = false;
+    let lastEventId;
+
+    const reconnect = (delay) => {
+      setTimeout(() => !closed && connect(), delay);
+    };
+
+    const connect = async () => {
+      // EventSource cannot send headers; a single-use ticket keeps the access token out of the URL
+      let ticket;
+      try {
+        ({ ticket } = (await api.post('/api/workspaces/events/ticket/')).data);
+      } catch (error) {
+        reconnect(5000);
+        return;
+      }
+      if (closed) return;
+
+      const params = new URLSearchParams({ ticket });
+      if (workspaceId) params.set('workspace', workspaceId);
+      if (lastEventId) params.set('last_event_id', lastEventId);
+
+      source = new EventSource(`${API_URL}/api/workspaces/events/?${params}`);
+      source.addEventListener('position', (event) => {
+        lastEventId = event.lastEventId;
+      });
+      source.addEventListener('workspace_state', (event) => {
+        lastEventId = event.lastEventId;
+        onEvent(JSON.parse(event.data));
+      });
+      source.onerror = () => {
+        // The ticket is used up, so reconnect with a new one instead of letting the browser retry
+        source.close();
+        if (!closed) reconnect(3000);
+      };
+    };
+
+    connect();
+    return () => {
+      closed = true;
+      if (source) source.close();
+    };
+  },
+
   // Bundles
   async getBundles(credentialId) {
     const response = await api.get(`/api/bundles/${credentialId}/`);